@@ -1,4 +1,37 @@
-"""Generic Conan recipes for CMake and Python projects."""
+"""Generic Conan recipes for CMake and Python projects.
 
-from autorecipes.cmake import CMakeConanFile
-from autorecipes.python import PythonConanFile
+Conan loads this package for every recipe that requires it,
+but each recipe uses only one of the base classes,
+so each is imported on first access.
+"""
+
+import importlib
+import sys
+import typing as t
+
+# The modules that define each lazy attribute.
+_LAZY = {
+    'CMakeConanFile': 'autorecipes.cmake',
+    'PythonConanFile': 'autorecipes.python',
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name: str) -> t.Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> t.List[str]:
+    return sorted({*globals(), *_LAZY})
+
+
+# Modules cannot define ``__getattr__`` before Python 3.7.
+if t.TYPE_CHECKING or sys.version_info < (3, 7):
+    from autorecipes.cmake import CMakeConanFile
+    from autorecipes.python import PythonConanFile
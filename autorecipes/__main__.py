@@ -0,0 +1,7 @@
+"""Run the command line interface with ``python -m autorecipes``."""
+
+import sys
+
+from autorecipes.cli import main
+
+sys.exit(main())
@@ -0,0 +1,197 @@
+"""Resolve recipe metadata from asyncio code.
+
+Attribute access on a recipe class blocks on subprocesses
+(``conan install``, ``cmake``, ``git``).
+The coroutines here run the same code (see :mod:`autorecipes.commands`)
+with asyncio subprocesses instead, so that one event loop can resolve
+many projects at once::
+
+    attrs = await aio.attributes(Recipe, source_dir)
+    files = await aio.exports(source_dir)
+    await aio.package_info(conanfile)
+
+At most :func:`concurrency` subprocesses run at once per event loop.
+``AUTORECIPES_CONCURRENCY`` sets the default, the number of CPUs.
+
+The code between commands, which may walk, hash and lock files,
+runs on the default executor of the event loop, so that it does not block.
+When a coroutine is cancelled, its subprocess is killed.
+
+On Unix before Python 3.8, asyncio subprocesses work only when the event
+loop runs in the main thread.
+"""
+
+import asyncio
+import contextlib
+import os
+from pathlib import Path
+import subprocess as sp
+import typing as t
+import weakref
+
+from autorecipes import build, commands, context, gitindex, trace
+from autorecipes.cmake import CMakeListsTxtAttributes
+from autorecipes.stamps import Tracked
+
+T = t.TypeVar('T')
+
+ENVIRONMENT_VARIABLE = 'AUTORECIPES_CONCURRENCY'
+
+_concurrency: t.Optional[int] = None
+# Semaphores belong to one event loop.
+_limits: t.MutableMapping[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def concurrency() -> int:
+    """Return the most subprocesses to run at once."""
+    if _concurrency is not None:
+        return _concurrency
+    value = os.environ.get(ENVIRONMENT_VARIABLE)
+    if value:
+        return max(1, int(value))
+    return build.cpu_count()
+
+
+def set_concurrency(limit: t.Optional[int]) -> None:
+    """Change the most subprocesses to run at once, or restore the default.
+
+    Subprocesses already waiting keep the old limit.
+    """
+    global _concurrency  # pylint: disable=global-statement
+    _concurrency = None if limit is None else max(1, limit)
+    _limits.clear()
+
+
+def _limit() -> asyncio.Semaphore:
+    loop = asyncio.get_event_loop()
+    limit = _limits.get(loop)
+    if limit is None:
+        limit = _limits[loop] = asyncio.Semaphore(concurrency())
+    return limit
+
+
+async def execute(command: commands.Command) -> sp.CompletedProcess:
+    """Run a command in an asyncio subprocess."""
+    args = list(command.args)
+    async with _limit():
+        with trace.span(args[0], 'subprocess', args=args,
+                        cwd=command.cwd) as span:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=command.cwd,
+                stdout=command.stdout,
+                stderr=command.stderr,
+            )
+            try:
+                stdout, stderr = await process.communicate()
+            except BaseException:
+                # Do not leave the process running, e.g. when cancelled.
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+                raise
+            returncode = t.cast(int, process.returncode)
+            span['returncode'] = returncode
+    if command.check and returncode:
+        raise sp.CalledProcessError(returncode, args, stdout, stderr)
+    return sp.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def _advance(
+    steps: commands.Steps[T],
+    result: t.Any,
+    error: t.Optional[BaseException],
+) -> t.Tuple[bool, t.Any]:
+    """Run steps up to their next command.
+
+    Return whether they are done, and either their value or the command.
+    """
+    try:
+        if error is None:
+            return False, steps.send(result)
+        return False, steps.throw(error)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def drive(steps: commands.Steps[T]) -> T:
+    """Drive steps to completion with asyncio subprocesses.
+
+    Compare with :func:`autorecipes.commands.run`.
+    If cancelled, the steps are closed, to let them clean up,
+    e.g. release their locks.
+    """
+    loop = asyncio.get_event_loop()
+    result: t.Any = None
+    error: t.Optional[BaseException] = None
+    advance: t.Optional[asyncio.Future] = None
+    try:
+        while True:
+            advance = loop.run_in_executor(
+                None, context.bind(_advance), steps, result, error
+            )
+            # Cancellation cannot stop a thread, so we do not pass it on.
+            done, value = await asyncio.shield(advance)
+            advance = None
+            if done:
+                return value
+            try:
+                result, error = await execute(value), None
+            except (OSError, sp.CalledProcessError) as cause:
+                result, error = None, cause
+    finally:
+        if advance is None or advance.done():
+            steps.close()
+        else:
+            # The steps are still running in the executor,
+            # and cannot be closed until they yield.
+            advance.add_done_callback(lambda future: _close(steps, future))
+
+
+def _close(steps: commands.Steps[t.Any], future: asyncio.Future) -> None:
+    """Close steps after the future that advanced them."""
+    if not future.cancelled():
+        # Retrieve any exception, so that asyncio does not report it.
+        future.exception()
+    steps.close()
+
+
+async def attributes(
+    typ: type,
+    source_dir: t.Optional[Path] = None,
+) -> t.Dict[str, t.Any]:
+    """Resolve the attributes that a CMake recipe reads from its project.
+
+    ``source_dir`` defaults to the source directory of the current context
+    (see :mod:`autorecipes.context`).
+    The result is cached on disk like that of the class attributes,
+    but not on the class.
+    """
+    source_dir = context.source_dir() if source_dir is None else source_dir
+    descriptor = None
+    for klass in typ.__mro__:
+        descriptor = vars(klass).get('cmakeliststxt')
+        if descriptor is not None:
+            break
+    if not isinstance(descriptor, CMakeListsTxtAttributes):
+        raise TypeError(f'not a CMake recipe: {typ}')
+    # Other attributes of the recipe, e.g. its requirements,
+    # come from the same source directory.
+    with context.using(source_dir):
+        tracked: Tracked = await drive(
+            descriptor.load_steps(typ, source_dir)
+        )
+    return dict(vars(tracked.value))
+
+
+async def exports(source_dir: t.Optional[Path] = None,
+                  prefix: str = '') -> t.List[str]:
+    """List the files that a CMake recipe exports: those tracked by Git."""
+    return await drive(gitindex.ls_files_steps(source_dir, prefix))
+
+
+async def package_info(conanfile: t.Any) -> None:
+    """Fill the ``cpp_info`` of a CMake recipe instance."""
+    await drive(conanfile.package_info_steps())
@@ -0,0 +1,134 @@
+"""Choices that make builds faster: generator, parallelism and launcher.
+
+Each choice can be overridden from the environment:
+
+- ``CONAN_CMAKE_GENERATOR`` (Conan's own) chooses the generator.
+- ``AUTORECIPES_JOBS`` chooses the number of parallel jobs.
+- ``AUTORECIPES_COMPILER_LAUNCHER`` chooses the compiler launcher,
+  or disables it when empty.
+"""
+
+import os
+import shutil
+import typing as t
+
+# A rough upper bound on the memory that one C++ compiler process needs.
+MEMORY_PER_JOB = 1 << 30
+
+# Compiler launchers, in order of preference.
+LAUNCHERS = ('ccache', 'sccache')
+
+# Compilers that need their own generators (or environment) on Windows.
+_VISUAL_STUDIO = ('Visual Studio', 'msvc')
+
+
+def generator(compiler: t.Optional[str] = None) -> t.Optional[str]:
+    """Return the generator to prefer, or ``None`` to let Conan choose."""
+    if os.environ.get('CONAN_CMAKE_GENERATOR'):
+        return None
+    if compiler in _VISUAL_STUDIO:
+        return None
+    if shutil.which('ninja') is None:
+        return None
+    return 'Ninja'
+
+
+def cpu_count() -> int:
+    """Return the number of CPUs that this process may use."""
+    try:
+        return len(os.sched_getaffinity(0))  # type: ignore
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def memory_available() -> t.Optional[int]:
+    """Return the bytes of memory available for new processes, if known."""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def jobs() -> int:
+    """Return the number of parallel build jobs.
+
+    We run one job per CPU,
+    but no more than available memory can hold.
+    ``AUTORECIPES_JOBS`` overrides that with a positive integer.
+    Any other value is ignored.
+    """
+    try:
+        count = int(os.environ.get('AUTORECIPES_JOBS', ''))
+    except ValueError:
+        count = 0
+    if count > 0:
+        return count
+    count = cpu_count()
+    memory = memory_available()
+    if memory is not None:
+        count = min(count, memory // MEMORY_PER_JOB)
+    return max(1, count)
+
+
+def parallel_args(generator_name: t.Optional[str], count: int) -> t.List[str]:
+    """Return the arguments for ``cmake --build`` to run jobs in parallel.
+
+    Return nothing for generators that do not take ``-j``.
+    """
+    if not generator_name or 'NMake' in generator_name:
+        return []
+    if 'Ninja' in generator_name or 'Makefiles' in generator_name:
+        return ['--', f'-j{count}']
+    return []
+
+
+def launcher() -> t.Optional[str]:
+    """Return the path to a compiler launcher, if one is available."""
+    value = os.environ.get('AUTORECIPES_COMPILER_LAUNCHER')
+    if value is not None:
+        return value or None
+    for name in LAUNCHERS:
+        path = shutil.which(name)
+        if path is not None:
+            return path
+    return None
+
+
+def launcher_definitions(path: t.Optional[str]) -> t.Dict[str, str]:
+    """Return the CMake definitions that use a compiler launcher.
+
+    Languages with a launcher already chosen in the environment are skipped.
+    """
+    if path is None:
+        return {}
+    definitions = {}
+    for lang in ('C', 'CXX'):
+        name = f'CMAKE_{lang}_COMPILER_LAUNCHER'
+        if not os.environ.get(name):
+            definitions[name] = path
+    return definitions
+
+
+def launcher_environment(path: t.Optional[str], *folders: str
+                        ) -> t.Dict[str, str]:
+    """Return the environment for a compiler launcher.
+
+    With ``ccache``, paths under the common parent of the source and build
+    folders are hashed relative to it, so that configurations built in
+    different folders share results.
+    """
+    if path is None or 'ccache' not in os.path.basename(path):
+        return {}
+    if 'sccache' in os.path.basename(path):
+        return {}
+    if os.environ.get('CCACHE_BASEDIR') or not folders:
+        return {}
+    basedir = os.path.commonpath(folders)
+    if os.path.dirname(basedir) == basedir:
+        # The root directory.
+        return {}
+    return {'CCACHE_BASEDIR': basedir}
@@ -0,0 +1,101 @@
+"""A persistent, on-disk cache for values that are expensive to compute.
+
+Values are JSON documents stored under a namespace and a key.
+Keys are meant to be content hashes (see :class:`Digest`),
+so that entries never need to be invalidated; they just stop being found.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import typing as t
+
+# Bump this whenever the shape of a cached value changes.
+FORMAT_VERSION = 1
+
+
+def default_directory() -> t.Optional[Path]:
+    """Return the cache directory chosen by the environment.
+
+    ``AUTORECIPES_CACHE_DIR`` overrides the default location.
+    Setting it to the empty string disables the cache.
+    """
+    value = os.environ.get('AUTORECIPES_CACHE_DIR')
+    if value is not None:
+        return Path(value) if value else None
+    xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+    base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / '.cache'
+    return base / 'autorecipes'
+
+
+class Digest:
+    """An incremental content hash for cache keys."""
+
+    def __init__(self, *parts: str):
+        self.hash = hashlib.sha256(f'v{FORMAT_VERSION}'.encode())
+        for part in parts:
+            self.add(part)
+
+    def add(self, part: str) -> 'Digest':
+        # Length-prefix every part so that concatenations cannot collide.
+        data = part.encode()
+        self.hash.update(f'{len(data)}:'.encode())
+        self.hash.update(data)
+        return self
+
+    def add_file(self, path: Path, name: t.Optional[str] = None) -> 'Digest':
+        """Add the name and contents of a file, or its absence."""
+        self.add(str(path) if name is None else name)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return self.add('-')
+        self.hash.update(f'{len(data)}:'.encode())
+        self.hash.update(data)
+        return self
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
+
+
+class Cache:
+    """A directory of JSON documents, grouped by namespace."""
+
+    def __init__(self, directory: t.Optional[Path]):
+        self.directory = directory
+
+    def path(self, namespace: str, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / namespace / key[:2] / f'{key}.json'
+
+    def get(self, namespace: str, key: str) -> t.Optional[t.Any]:
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(namespace, key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A missing or corrupt entry is just a miss.
+            return None
+
+    def put(self, namespace: str, key: str, value: t.Any) -> None:
+        if self.directory is None:
+            return
+        path = self.path(namespace, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it into place,
+            # so that concurrent readers never see a partial entry.
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp, str(path))
+        except OSError:
+            # The cache is an optimization. Failing to fill it is not fatal.
+            pass
+
+
+def default_cache() -> Cache:
+    return Cache(default_directory())
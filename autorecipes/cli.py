@@ -0,0 +1,141 @@
+"""Inspect the metadata of many projects at once.
+
+Usage::
+
+    autorecipes [--jobs N] DIRECTORY...
+
+Each directory is detected as a Poetry project (a ``pyproject.toml`` with
+a ``[tool.poetry]`` table) or a CMake project (a ``CMakeLists.txt``).
+Projects are evaluated in parallel on a pool of processes,
+and one JSON object per project is written to standard output
+as soon as it is ready, in the order that they finish.
+Each object has the ``path`` of the project and the ``seconds`` it took,
+and either its ``kind``, attributes and ``exports``, or an ``error``.
+The command fails if any project fails.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+from pathlib import Path
+import sys
+import time
+import traceback
+import typing as t
+
+from autorecipes import context
+
+ATTRIBUTES = (
+    'name',
+    'version',
+    'description',
+    'homepage',
+    'url',
+    'license',
+    'author',
+)
+
+
+def detect(source_dir: Path) -> t.Optional[str]:
+    """Return the kind of project in a directory, or ``None``."""
+    pyproject = source_dir / 'pyproject.toml'
+    if pyproject.is_file() and '[tool.poetry' in pyproject.read_text():
+        return 'python'
+    if (source_dir / 'CMakeLists.txt').is_file():
+        return 'cmake'
+    return None
+
+
+def _recipe(kind: str) -> t.Any:
+    # Define a fresh recipe class for each project,
+    # so that nothing cached for one project is seen by another.
+    if kind == 'cmake':
+        from autorecipes.cmake import CMakeConanFile
+        return type('Recipe', (CMakeConanFile,), {})
+    from autorecipes.python import PythonConanFile
+    return type('Recipe', (PythonConanFile,), {})
+
+
+def inspect(path: str, cwd: t.Optional[str] = None) -> t.Dict[str, t.Any]:
+    """Return the metadata of one project, or the error that stopped us.
+
+    A relative path is relative to ``cwd``, if given.
+    """
+    start = time.perf_counter()
+    result: t.Dict[str, t.Any] = {'path': path}
+    try:
+        source_dir = Path(cwd or os.getcwd(), path).resolve()
+        kind = detect(source_dir)
+        if kind is None:
+            raise ValueError('no CMake or Poetry project')
+        result['kind'] = kind
+        recipe = _recipe(kind)
+        with context.using(source_dir):
+            for name in ATTRIBUTES:
+                try:
+                    result[name] = getattr(recipe, name)
+                except KeyError:
+                    # Poetry makes most fields optional.
+                    result[name] = None
+            result['exports'] = list(recipe.exports)
+    except Exception as error:  # pylint: disable=broad-except
+        result['error'] = ''.join(
+            traceback.format_exception_only(type(error), error)
+        ).strip()
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+_redirected = False
+
+
+def _work(path: str, cwd: str) -> t.Dict[str, t.Any]:
+    global _redirected  # pylint: disable=global-statement
+    if not _redirected:
+        # Tools that we run write to standard output,
+        # which, in the parent, is reserved for results.
+        sys.stdout.flush()
+        os.dup2(2, 1)
+        _redirected = True
+    return inspect(path, cwd)
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog='autorecipes',
+        description='Print the metadata of projects as JSON Lines.',
+    )
+    parser.add_argument(
+        'directories',
+        nargs='+',
+        metavar='DIRECTORY',
+        help='a project directory, or - to read directories from stdin',
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='the number of processes (default: the number of CPUs)',
+    )
+    args = parser.parse_args(argv)
+
+    paths: t.List[str] = []
+    for directory in args.directories:
+        if directory == '-':
+            paths.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            paths.append(directory)
+
+    failed = False
+    jobs = max(1, min(args.jobs, len(paths)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        cwd = os.getcwd()
+        futures = [executor.submit(_work, path, cwd) for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            failed = failed or 'error' in result
+            print(json.dumps(result), flush=True)
+    return 1 if failed else 0
@@ -1,19 +1,32 @@
 """A generic Conan recipe for CMake projects."""
 
-import importlib.util
+from concurrent.futures import Executor
+import json
 import os
 from pathlib import Path
+import re
+import shutil
 import subprocess as sp
 import tempfile
 import typing as t
 
-from conans import CMake, ConanFile
+from conans import CMake, ConanFile, tools
 
+# Modules needed only to build or package are imported where they are used,
+# because Conan loads this module for every recipe, even to read its name.
+from autorecipes import (
+    cmakecache, cmakelists, commands, context, gitindex, step1, trace
+)
+from autorecipes.cache import Digest, default_cache, default_directory
+from autorecipes.cmakelists import EXTRA_VARIABLES, cmake_inputs
 from autorecipes.descriptors import (
+    ClassCache,
     cached_classproperty,
     cached_property,
     classproperty,
 )
+from autorecipes.prefetch import Prefetching
+from autorecipes.stamps import Stamps, Tracked, fresh, stamp
 from autorecipes.stdlib import Object, named, zero_or_more
 
 
@@ -32,78 +45,423 @@ def generate_conanfile_txt(requires, build_requires, generators) -> str:
     return text
 
 
+# The version of the ``attributes.json`` written by ``data/configure``
+# and ``data/metadata``.
+ATTRIBUTES_VERSION = 2
+
+def metadata_key(typ: t.Type[ConanFile], source_dir: Path) -> str:
+    """Return a content hash of every input to the CMake metadata.
+
+    Listfiles outside the source tree are not known until we configure.
+    They are checked against the cached value instead
+    (see :func:`digests`).
+    """
+    digest = Digest('cmakeliststxt', str(ATTRIBUTES_VERSION))
+    for path in cmake_inputs(source_dir):
+        digest.add_file(path, str(path.relative_to(source_dir)))
+    digest.add_file(source_dir / 'conanfile.txt', 'conanfile.txt')
+    for name in ('requires', 'build_requires', 'generators'):
+        digest.add(name)
+        for value in zero_or_more(getattr(typ, name)):
+            digest.add(str(value))
+    return digest.hexdigest()
+
+
+def digests(paths: t.Iterable[Path]) -> t.Dict[str, t.Optional[str]]:
+    """Return the content hash of each of some files, or ``None`` if absent."""
+    result: t.Dict[str, t.Optional[str]] = {}
+    for path in paths:
+        value = stamp(path)
+        result[str(path)] = None if value is None else value.digest
+    return result
+
+
+def _outside(path: Path, directories: t.Iterable[Path]) -> bool:
+    return not any(d == path or d in path.parents for d in directories)
+
+
+def traced_listfiles(trace_file: Path,
+                     excluded: t.Sequence[Path]) -> t.List[Path]:
+    """Return the files in a JSON trace of CMake (``--trace-format=json-v1``).
+
+    Files under any of the ``excluded`` directories are left out.
+    """
+    found: t.List[Path] = []
+    try:
+        with open(trace_file, 'r') as f:
+            lines = list(f)
+    except OSError:
+        return found
+    for line in lines:
+        try:
+            name = json.loads(line).get('file')
+        except (ValueError, AttributeError):
+            continue
+        if not name:
+            continue
+        path = Path(os.path.normpath(name))
+        if path not in found and _outside(path, excluded):
+            found.append(path)
+    return found
+
+
+# Asks the CMake file API for the listfiles of a configuration.
+CMAKE_FILES_QUERY = Path('.cmake') / 'api' / 'v1' / 'query' / 'cmakeFiles-v1'
+
+def configured_listfiles(build_dir: Path) -> t.Optional[t.List[Path]]:
+    """Return the listfiles that the last configuration of a tree read.
+
+    These come from the reply to :data:`CMAKE_FILES_QUERY`.
+    Files that come with CMake or that sit in the build directory
+    are left out.
+    Return ``None`` if there is no reply.
+    """
+    reply_dir = build_dir / '.cmake' / 'api' / 'v1' / 'reply'
+    try:
+        index = max(reply_dir.glob('index-*.json'))
+        with open(index, 'r') as f:
+            reply = json.load(f)['reply']['cmakeFiles-v1']
+        with open(reply_dir / reply['jsonFile'], 'r') as f:
+            document = json.load(f)
+        source_dir = Path(document['paths']['source'])
+        return [
+            Path(os.path.normpath(source_dir / i['path']))
+            for i in document['inputs']
+            if not i.get('isCMake') and not i.get('isGenerated')
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def attributes_from_cache(variables: t.Mapping[str, str]
+                         ) -> t.Optional[t.Dict[str, t.Any]]:
+    """Translate ``CMAKE_PROJECT_*`` cache variables into recipe attributes.
+
+    Return ``None`` if the cache is missing the project name.
+    The variables come from the ``attributes.json`` that
+    ``data/configure/CMakeLists.txt`` or ``data/metadata/project.cmake``
+    write (see ``data/json.cmake``), or from a ``CMakeCache.txt``.
+    """
+    name = variables.get('CMAKE_PROJECT_NAME')
+    if not name:
+        return None
+
+    def get(suffix):
+        return variables.get(f'CMAKE_PROJECT_{suffix}') or None
+
+    return {
+        'name': name,
+        'version': variables.get('CMAKE_PROJECT_VERSION', ''),
+        'description': get('DESCRIPTION'),
+        'homepage': get('HOMEPAGE_URL'),
+        'url': get('REPOSITORY_URL') or get('HOMEPAGE_URL'),
+        'license': get('LICENSE'),
+        # Conan makes us collapse all the authors into one string.
+        'author': get('AUTHORS'),
+    }
+
+
+# The oldest version of CMake with ``CMAKE_PROJECT_INCLUDE``
+# and a JSON trace.
+METADATA_CMAKE_VERSION = (3, 17)
+
+def configure_mode() -> str:
+    """Return how to configure a project for its attributes.
+
+    ``'metadata'`` (the default) stops right after ``project()``,
+    and ``'full'`` configures and generates the whole project.
+    ``AUTORECIPES_CONFIGURE`` chooses.
+    """
+    mode = os.environ.get('AUTORECIPES_CONFIGURE') or 'metadata'
+    if mode not in ('metadata', 'full'):
+        raise ValueError(f'unknown configure mode: {mode}')
+    return mode
+
+
+# Maps the path of each ``cmake`` to its version.
+_cmake_versions: t.Dict[str, t.Optional[t.Tuple[int, ...]]] = {}
+
+
+def cmake_version_steps() -> commands.Steps[t.Optional[t.Tuple[int, ...]]]:
+    """Return the version of the ``cmake`` on the path, if it runs."""
+    path = shutil.which('cmake')
+    if path is None:
+        return None
+    if path not in _cmake_versions:
+        version = None
+        try:
+            output = yield from commands.check_output(['cmake', '--version'])
+        except (OSError, sp.CalledProcessError):
+            output = b''
+        match = re.search(rb'cmake version (\d+)\.(\d+)', output)
+        if match is not None:
+            version = tuple(int(part) for part in match.groups())
+        _cmake_versions[path] = version
+    return _cmake_versions[path]
+
+
+def cmake_version() -> t.Optional[t.Tuple[int, ...]]:
+    """Return the version of the ``cmake`` on the path, if it runs."""
+    return commands.run(cmake_version_steps())
+
+
+def configure_metadata_steps(
+    source_dir: Path,
+    stamps: t.Optional[Stamps] = None,
+) -> commands.Steps[t.Optional[t.Dict[str, t.Any]]]:
+    """Evaluate only the top-level ``project()`` to read the attributes.
+
+    A stub toolchain skips compiler identification and checks,
+    and a script included after ``project()`` writes the project variables
+    and stops the configuration, before any probes, dependencies or
+    generation. Without dependencies, we need not install them first.
+
+    Return ``None`` if this is not enough,
+    e.g. if the project sets other variables after ``project()``.
+    Otherwise, add the listfiles that CMake read to ``stamps``.
+    """
+    version = yield from cmake_version_steps()
+    if version is None or version < METADATA_CMAKE_VERSION:
+        return None
+    data_dir = Path(__file__) / '..' / 'data' / 'metadata'
+    data_dir = data_dir.resolve(strict=False)
+    with tempfile.TemporaryDirectory() as build_dir:
+        # The configuration fails on purpose, and its output would only
+        # confuse, so we look for the file that it writes instead.
+        process = yield commands.Command(
+            [
+                'cmake',
+                f'-DCMAKE_TOOLCHAIN_FILE={data_dir / "toolchain.cmake"}',
+                f'-DCMAKE_PROJECT_INCLUDE={data_dir / "project.cmake"}',
+                f'-DAUTORECIPES_FORMAT_VERSION={ATTRIBUTES_VERSION}',
+                '--trace',
+                '--trace-format=json-v1',
+                f'--trace-redirect={Path(build_dir) / "trace.json"}',
+                str(source_dir),
+            ],
+            cwd=build_dir,
+            stdout=sp.DEVNULL,
+            stderr=sp.PIPE,
+        )
+        # CMake continues after most errors.
+        # Any but our own means that the project needed something more,
+        # e.g. files generated by ``conan install``.
+        if process.stderr.count(b'CMake Error') > 1:
+            return None
+        try:
+            with open(Path(build_dir) / 'attributes.json', 'r') as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if document.get('version') != ATTRIBUTES_VERSION:
+            return None
+        paths = traced_listfiles(
+            Path(build_dir) / 'trace.json',
+            [Path(document['root']), data_dir.parent, Path(build_dir)],
+        )
+    variables = document['variables']
+    missing = [name for name in EXTRA_VARIABLES if not variables.get(name)]
+    try:
+        if cmakelists.mentioned(cmakelists.listfiles(source_dir), missing):
+            return None
+    except cmakelists.Unresolvable:
+        return None
+    if stamps is not None:
+        stamps.add(*paths)
+    return attributes_from_cache(variables)
+
+
+def configure_metadata(source_dir: Path) -> t.Optional[t.Dict[str, t.Any]]:
+    """Run :func:`configure_metadata_steps`."""
+    return commands.run(configure_metadata_steps(source_dir))
+
+
+def configure_attributes_steps(
+    typ: t.Type[ConanFile],
+    source_dir: Path,
+    stamps: t.Optional[Stamps] = None,
+) -> commands.Steps[t.Dict[str, t.Any]]:
+    """Configure the project to read its attributes.
+
+    Add the listfiles that CMake read to ``stamps``.
+    """
+    if configure_mode() == 'metadata':
+        with trace.span('configure_metadata'):
+            attrs = yield from configure_metadata_steps(source_dir, stamps)
+        if attrs is not None:
+            return attrs
+    # Configure the project in one directory,
+    # then configure our "project" in a separate directory.
+    # The first directory persists, to make the next configuration
+    # incremental and to seed builds (see :mod:`autorecipes.step1`).
+    key = step1.sources_key(source_dir, cmake_inputs(source_dir))
+    with step1.acquire(source_dir) as step1_dir:
+        conanfile: t.Any = source_dir / 'conanfile.txt'
+        # Generate a ``conanfile.txt`` if the requirements are given
+        # in this recipe, to avoid (infinite) recursion.
+        generators = zero_or_more(typ.generators)
+        if not conanfile.exists():
+            text = generate_conanfile_txt(
+                zero_or_more(typ.requires),
+                zero_or_more(typ.build_requires),
+                generators,
+            )
+            if text:
+                conanfile = Path(step1_dir) / 'conanfile.txt'
+                conanfile.write_text(text)
+            else:
+                conanfile = None
+        if conanfile is not None:
+            yield commands.Command(
+                ['conan', 'install', str(conanfile)], cwd=step1_dir
+            )
+        query = Path(step1_dir) / CMAKE_FILES_QUERY
+        query.parent.mkdir(parents=True, exist_ok=True)
+        query.touch()
+        toolchain_args = (
+            ['-DCMAKE_TOOLCHAIN_FILE=conan_paths.cmake']
+            if 'cmake_paths' in generators else []
+        )
+        yield commands.Command(
+            [
+                'cmake',
+                *toolchain_args,
+                # The tree may keep the cache of an earlier configuration,
+                # where a ``set(CMAKE_PROJECT_* ... CACHE ...)``
+                # would not replace the old value.
+                '-U',
+                'CMAKE_PROJECT_*',
+                str(source_dir),
+            ],
+            cwd=step1_dir,
+        )
+        step1.record(step1_dir, key)
+        if stamps is not None:
+            paths = configured_listfiles(Path(step1_dir))
+            # Without a reply, every listfile in the tree is stamped already.
+            stamps.add(*(paths or ()))
+
+        # Most of the time, we can read the attributes straight from the
+        # cache. Otherwise, we let CMake read its own cache.
+        try:
+            variables = cmakecache.read(Path(step1_dir) / 'CMakeCache.txt')
+        except FileNotFoundError:
+            variables = {}
+        attrs = attributes_from_cache(variables)
+        if attrs is not None:
+            return attrs
+
+        with tempfile.TemporaryDirectory() as step2_dir:
+            # ``pkg_resources`` doesn't work through
+            # ``python_requires``, so we must use a hack.
+            data_dir = Path(__file__) / '..' / 'data'
+            data_dir = data_dir.resolve(strict=False)
+            yield commands.Command(
+                [
+                    'cmake',
+                    f'-DSTEP1_DIR={step1_dir}',
+                    f'-DFORMAT_VERSION={ATTRIBUTES_VERSION}',
+                    str(data_dir / 'configure'),
+                ],
+                cwd=step2_dir,
+            )
+
+            with open(Path(step2_dir) / 'attributes.json', 'r') as f:
+                document = json.load(f)
+            if document.get('version') != ATTRIBUTES_VERSION:
+                raise ValueError(f'unexpected attributes: {document}')
+            attrs = attributes_from_cache(document['variables'])
+            if attrs is None:
+                raise ValueError(f'no project name in {step1_dir}')
+            return attrs
+
+
+def configure_attributes(typ: t.Type[ConanFile],
+                         source_dir: Path) -> t.Dict[str, t.Any]:
+    """Run :func:`configure_attributes_steps`."""
+    return commands.run(configure_attributes_steps(typ, source_dir))
+
+
 class CMakeListsTxtAttributes:
-    """A descriptor that lazily loads attributes from the CMake configuration."""
+    """A descriptor that lazily loads attributes from the CMake configuration.
+
+    When the top-level ``CMakeLists.txt`` passes literal arguments to
+    ``project()``, we read them statically (see :mod:`autorecipes.cmakelists`).
+    Otherwise, attributes are cached on disk (see :mod:`autorecipes.cache`),
+    keyed by a hash of every input to the configuration,
+    so that only the first evaluation for a given set of inputs
+    has to run ``conan`` and ``cmake``.
+    Attributes are loaded again when those inputs change
+    (see :mod:`autorecipes.stamps`).
+    """
 
     def __init__(self):
-        self.module = None
+        self.cache: ClassCache[Tracked] = ClassCache()
+
+    def prefetch(self, typ: t.Type[ConanFile], executor: Executor) -> None:
+        """Start loading attributes on an executor."""
+        self.cache.submit(typ, lambda: self._load(typ), executor)
 
     def __get__(
         self,
         obj: object,
         typ: t.Type[ConanFile] = None,
-    ) -> t.Mapping[str, t.Any]:
+    ) -> t.Any:
         if typ is None:
             raise ValueError(f'expected class type: {typ}')
-        if self.module is None:
-            source_dir = Path(os.getcwd())
-            # TODO: Try to cache the ``step1_dir`` within the ``source_dir``.
-            # Configure the project in one directory,
-            # then configure our "project" in a separate directory.
-            with tempfile.TemporaryDirectory() as step1_dir:
-                conanfile: t.Any = source_dir / 'conanfile.txt'
-                # Generate a ``conanfile.txt`` if the requirements are given
-                # in this recipe, to avoid (infinite) recursion.
-                generators = zero_or_more(typ.generators)
-                if not conanfile.exists():
-                    text = generate_conanfile_txt(
-                        zero_or_more(typ.requires),
-                        zero_or_more(typ.build_requires),
-                        generators,
-                    )
-                    if text:
-                        conanfile = Path(step1_dir) / 'conanfile.txt'
-                        conanfile.write_text(text)
-                    else:
-                        conanfile = None
-                if conanfile is not None:
-                    sp.run(['conan', 'install', str(conanfile)], cwd=step1_dir)
-                # It would save us some time if the CMake CLI could configure
-                # without generating.
-                toolchain_args = (
-                    ['-DCMAKE_TOOLCHAIN_FILE=conan_paths.cmake']
-                    if 'cmake_paths' in generators else []
-                )
-                sp.run(
-                    [
-                        'cmake',
-                        *toolchain_args,
-                        str(source_dir),
-                    ],
-                    cwd=step1_dir,
-                )
-
-                with tempfile.TemporaryDirectory() as step2_dir:
-                    # ``pkg_resources`` doesn't work through
-                    # ``python_requires``, so we must use a hack.
-                    data_dir = Path(__file__) / '..' / 'data'
-                    data_dir = data_dir.resolve(strict=False)
-                    sp.run(
-                        [
-                            'cmake',
-                            f'-DSTEP1_DIR={step1_dir}',
-                            str(data_dir / 'configure'),
-                        ],
-                        cwd=step2_dir,
-                    )
-
-                    spec = importlib.util.spec_from_file_location(
-                        'attributes', f'{step2_dir}/attributes.py'
-                    )
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)  # type: ignore
-                    self.module = module
-        return self.module
+        return self.cache.get(typ, lambda: self._load(typ), fresh).value
+
+    def _load(self, typ: t.Type[ConanFile]) -> Tracked:
+        return commands.run(self.load_steps(typ, context.source_dir()))
+
+    def load_steps(self, typ: t.Type[ConanFile],
+                   source_dir: Path) -> commands.Steps[Tracked]:
+        """Load the attributes of a project, without caching them here."""
+        stamps = Stamps()
+        with trace.span('cmakeliststxt', cls=typ.__qualname__) as span:
+            attrs = yield from self._resolve(typ, source_dir, span, stamps)
+        return Tracked(Object(**attrs), stamps)
+
+    @staticmethod
+    def _resolve(typ: t.Type[ConanFile], source_dir: Path,
+                 span: t.Dict[str, t.Any],
+                 stamps: Stamps) -> commands.Steps[t.Dict[str, t.Any]]:
+        # First, try to read the attributes without running anything.
+        span['source'] = 'static'
+        with trace.span('cmakelists.project_variables'):
+            # Only the files that we read can change the answer.
+            try:
+                paths = cmakelists.listfiles(source_dir)
+            except cmakelists.Unresolvable:
+                variables = None
+            else:
+                stamps.add(*paths)
+                variables = cmakelists.project_variables(source_dir, paths)
+        if variables is not None:
+            attrs = attributes_from_cache(variables)
+            if attrs is not None:
+                return attrs
+        span['source'] = 'cache'
+        stamps.add(*cmake_inputs(source_dir), source_dir / 'conanfile.txt')
+        # The key covers these. Any other listfile must be checked.
+        known = set(stamps.paths)
+        cache = default_cache()
+        with trace.span('metadata_key'):
+            key = metadata_key(typ, source_dir)
+        entry = cache.get('cmakeliststxt', key)
+        if entry is not None and digests(
+            Path(name) for name in entry['listfiles']
+        ) == entry['listfiles']:
+            stamps.add(*(Path(name) for name in entry['listfiles']))
+            return entry['attributes']
+        span['source'] = 'configure'
+        attrs = yield from configure_attributes_steps(typ, source_dir, stamps)
+        others = [path for path in stamps.paths if path not in known]
+        cache.put('cmakeliststxt', key, {
+            'attributes': attrs,
+            'listfiles': digests(others),
+        })
+        return attrs
 
     def __matmul__(self, key):
         """Create a descriptor that lazily returns one attribute."""
@@ -113,37 +471,50 @@ class CMakeListsTxtAttributes:
         def f(cls):
             # We are assuming that the :class:`CMakeListsTxtAttributes`
             # descriptor will be named ``cmakeliststxt``.
-            return getattr(cls.cmakeliststxt, key)
+            with trace.span(key, 'attribute'):
+                return getattr(cls.cmakeliststxt, key)
 
         return f
 
 
-_UNDEFINED = object()
-
-
 class ConanFileTxtAttributes:
-    """A descriptor that lazily loads attributes from ``conanfile.txt``."""
+    """A descriptor that lazily loads attributes from ``conanfile.txt``.
+
+    Attributes are loaded again when the file changes.
+    """
 
     def __init__(self):
-        self.loader = _UNDEFINED
+        self.cache: ClassCache[Tracked] = ClassCache()
+
+    def prefetch(self, typ: t.Type[ConanFile], executor: Executor) -> None:
+        """Start loading attributes on an executor."""
+        self.cache.submit(typ, self._load, executor)
 
     def __get__(
         self,
         obj: object,
         typ: t.Type[ConanFile] = None,
     ) -> t.Mapping[str, t.Any]:
-        if self.loader is _UNDEFINED:
+        if typ is None:
+            typ = type(obj)
+        return self.cache.get(typ, self._load, fresh).value
+
+    @staticmethod
+    def _load() -> Tracked:
+        with trace.span('conanfiletxt'):
             from conans.client.loader_txt import ConanFileTextLoader  # type: ignore
+            path = context.source_dir() / 'conanfile.txt'
+            stamps = Stamps(path)
             try:
-                with open('conanfile.txt', 'r') as f:
-                    self.loader = ConanFileTextLoader(f.read())
+                with open(path, 'r') as f:
+                    return Tracked(ConanFileTextLoader(f.read()), stamps)
             except FileNotFoundError:
-                self.loader = Object(
+                loader = Object(
                     build_requirements=[],
                     generators=[],
                     requirements=[],
                 )
-        return self.loader
+                return Tracked(loader, stamps)
 
     def __matmul__(self, key):
 
@@ -152,13 +523,30 @@ class ConanFileTxtAttributes:
         def f(cls):
             # We are assuming that the :class:`ConanFileTxtAttributes`
             # descriptor will be named ``conanfiletxt``.
-            return getattr(cls.conanfiletxt, key)
+            with trace.span(key, 'attribute'):
+                return getattr(cls.conanfiletxt, key)
 
         return f
 
 
-class CMakeConanFile(ConanFile):
-    """A base class for Conan recipes for CMake projects."""
+def export_mode(typ: t.Type['CMakeConanFile']) -> str:
+    """Return the export mode of a recipe: ``'copy'`` or ``'link'``."""
+    mode = typ.export_mode or os.environ.get('AUTORECIPES_EXPORT_MODE')
+    if mode not in (None, '', 'copy', 'link'):
+        raise ValueError(f'unknown export mode: {mode}')
+    return mode or 'copy'
+
+
+# Where, within the package folder, we store the result of introspection.
+MANIFEST_PATH = Path('.autorecipes') / 'cpp_info.json'
+
+
+class CMakeConanFile(Prefetching, ConanFile):
+    """A base class for Conan recipes for CMake projects.
+
+    Pass ``prefetch=True`` in the class definition of a recipe to resolve its
+    metadata concurrently (see :mod:`autorecipes.prefetch`).
+    """
 
     cmakeliststxt = CMakeListsTxtAttributes()
 
@@ -172,8 +560,51 @@ class CMakeConanFile(ConanFile):
 
     # Because the recipe depends on the sources, we must export the sources.
     @cached_classproperty
+    def exported_files(cls):  # pylint: disable=no-self-argument,no-self-use
+        with trace.span('exports', cls=cls.__qualname__):
+            return gitindex.ls_files()
+
+    # How to place the sources in the export folder:
+    # ``'copy'`` lets Conan copy them (through :attr:`exports`),
+    # and ``'link'`` links them (in :meth:`export`; see :mod:`autorecipes.links`).
+    # ``AUTORECIPES_EXPORT_MODE`` sets the default.
+    export_mode: t.Optional[str] = None
+
+    @classproperty
     def exports(cls):  # pylint: disable=no-self-argument,no-self-use
-        return sp.check_output(['git', 'ls-files']).decode().strip().split()
+        """List the files for Conan to copy: none in link mode."""
+        if export_mode(cls) == 'link':
+            return []
+        return cls.exported_files
+
+    @trace.traced('export')
+    def export(self):
+        """Link the sources into the export folder, in link mode."""
+        if export_mode(type(self)) != 'link':
+            return
+        from autorecipes import files, links
+        source_dir = Path(self.recipe_folder)  # pylint: disable=no-member
+        with context.using(source_dir):
+            exported_files = type(self).exported_files
+        names = [
+            name for name in exported_files
+            # Conan copies these itself, and would write through a link.
+            if name not in ('conanfile.py', 'conandata.yml')
+        ]
+        stamps = files.update_manifest(
+            files.manifest_path(source_dir),
+            source_dir,
+            names,
+        )
+        directory = default_directory()
+        counts = links.place(
+            source_dir,
+            Path(self.export_folder),  # pylint: disable=no-member
+            {name: s.digest for name, s in stamps.items()},
+            None if directory is None else links.Store(directory / 'objects'),
+        )
+        summary = ', '.join(f'{n} {how}' for how, n in sorted(counts.items()))
+        self.output.info(f'exported {len(stamps)} files: {summary}')  # pylint: disable=no-member
 
     # Do not copy the sources to the build directory.
     # This reflects the recommended CMake workflow for an out-of-source build.
@@ -193,53 +624,208 @@ class CMakeConanFile(ConanFile):
         'revision': 'auto',
     }
 
-    settings = 'arch', 'os', 'compiler', 'build_type'
-    options = {'shared': [True, False]}
+    # Conan replaces these with objects on the instances that it constructs.
+    settings: t.Any = 'arch', 'os', 'compiler', 'build_type'
+    options: t.Any = {'shared': [True, False]}
     default_options = {'shared': False}
 
     @cached_property
     def cmake(self) -> CMake:  # pylint: disable=missing-docstring
-        cmake = CMake(self)
+        from autorecipes import build
+        # Prefer Ninja (see :mod:`autorecipes.build`).
+        generator = build.generator(self._setting('compiler'))
+        cmake = CMake(self, generator=generator) if generator else CMake(self)
         # TODO: Shouldn't :class:`CMake` be smart enough for this?
         toolchain_file = Path(self.build_folder) / 'conan_paths.cmake'  # pylint: disable=no-member
         if toolchain_file.is_file():
             print(f'adding CMAKE_TOOLCHAIN_FILE = {toolchain_file}')
             cmake.definitions['CMAKE_TOOLCHAIN_FILE'] = str(toolchain_file)
-        cmake.configure()
+        cmake.definitions.update(build.launcher_definitions(self._launcher))
+        # Seed a new build folder with the probe results of an earlier
+        # configuration with the same toolchain (see :mod:`autorecipes.probes`).
+        seed = self._probe_seed(cmake)
+        cache_file = Path(self.build_folder) / 'CMakeCache.txt'  # pylint: disable=no-member
+        args = []
+        if seed is not None and not seed.is_file():
+            self._seed_from_step1(seed)
+        if seed is not None and seed.is_file() and not cache_file.is_file():
+            args = ['-C', str(seed)]
+        cmake.configure(args=args)
+        if seed is not None:
+            self._harvest_probes(cache_file, seed)
         return cmake
 
-    def build(self):
-        self.cmake.build()  # pylint: disable=no-member
+    def _probe_key(self, cmake: CMake) -> str:
+        """Return a hash of everything that can change a probe result.
+
+        That is the source folder, generator, settings and options
+        (except ``build_type`` and ``shared``), dependencies,
+        and compiler variables in the environment.
+        """
+        digest = Digest('probes', str(self.source_folder), cmake.generator or '')  # pylint: disable=no-member
+        for name, value in self.settings.values_list:  # pylint: disable=no-member
+            if name != 'build_type':
+                digest.add(f'{name}={value}')
+        for name, value in self.options.values.as_list():  # pylint: disable=no-member
+            if name != 'shared':
+                digest.add(f'{name}={value}')
+        deps = self.deps_cpp_info  # pylint: disable=no-member
+        for name in sorted(deps.deps):
+            digest.add(f'{name}/{deps[name].version}')
+        for name in ('CC', 'CXX', 'CFLAGS', 'CXXFLAGS', 'CPPFLAGS', 'LDFLAGS'):
+            digest.add(f'{name}={os.environ.get(name, "")}')
+        return digest.hexdigest()
+
+    def _probe_seed(self, cmake: CMake) -> t.Optional[Path]:
+        directory = default_directory()
+        if directory is None:
+            return None
+        try:
+            key = self._probe_key(cmake)
+        except Exception:  # pylint: disable=broad-except
+            # Without a trustworthy key, we do not share results.
+            return None
+        return directory / 'probes' / key[:2] / f'{key}.cmake'
+
+    def _seed_from_step1(self, seed: Path) -> None:
+        """Harvest the probes of the configuration that read our attributes.
+
+        Only if it had the same settings and dependencies,
+        which we know only if it installed dependencies with Conan
+        (see :func:`autorecipes.step1.configuration`).
+        """
+        try:
+            for name, _ in self.options.values.as_list():  # pylint: disable=no-member
+                if name != 'shared':
+                    # That configuration used the default options.
+                    return
+            source_dir = Path(self.source_folder)  # pylint: disable=no-member
+            tree = step1.find(
+                step1.sources_key(source_dir, cmake_inputs(source_dir))
+            )
+            if tree is None:
+                return
+            settings = {
+                name: str(value)
+                for name, value in self.settings.values_list  # pylint: disable=no-member
+                if name != 'build_type'
+            }
+            deps = self.deps_cpp_info  # pylint: disable=no-member
+            requires = {f'{name}/{deps[name].version}' for name in deps.deps}
+        except Exception:  # pylint: disable=broad-except
+            return
+        if step1.configuration(tree) != (settings, requires):
+            return
+        self._harvest_probes(tree / 'CMakeCache.txt', seed)
+
+    @staticmethod
+    def _harvest_probes(cache_file: Path, seed: Path) -> None:
+        from autorecipes import probes
+        try:
+            with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
+                entries = list(cmakecache.parse(f))
+        except OSError:
+            return
+        version = probes.cmake_version(entries)
+        results = probes.harvest(entries)
+        if version is not None and results:
+            probes.save(seed, probes.render(results, version))
 
+    @cached_property
+    def _launcher(self) -> t.Optional[str]:
+        from autorecipes import build
+        return build.launcher()
+
+    def _setting(self, name: str) -> t.Optional[str]:
+        try:
+            value = getattr(self.settings, name)  # pylint: disable=no-member
+        except Exception:  # pylint: disable=broad-except
+            return None
+        return None if value is None else str(value)
+
+    @trace.traced('build')
+    def build(self):
+        from autorecipes import build
+        environment = build.launcher_environment(
+            self._launcher,
+            self.source_folder,  # pylint: disable=no-member
+            self.build_folder,  # pylint: disable=no-member
+        )
+        with tools.environment_append(environment):
+            cmake = self.cmake  # pylint: disable=no-member
+            args = build.parallel_args(cmake.generator, build.jobs())
+            if args:
+                # We choose the number of jobs instead of Conan.
+                cmake.parallel = False
+            cmake.build(args=args)
+
+    @trace.traced('package')
     def package(self):
         self.cmake.install()  # pylint: disable=no-member
+        # Introspect the installed package once, here,
+        # instead of every time a consumer asks for ``cpp_info``.
+        manifest = Path(self.package_folder) / MANIFEST_PATH  # pylint: disable=no-member
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as build_dir:
+            generated = self._introspect(Path(build_dir))
+            shutil.copyfile(str(generated), str(manifest))
 
-    def package_info(self):
+    def _introspect(self, build_dir: Path) -> Path:
+        return commands.run(self.introspect_steps(build_dir))
+
+    def introspect_steps(self, build_dir: Path) -> commands.Steps[Path]:
+        """Generate a ``cpp_info.json`` manifest for the installed package.
+
+        The result covers every configuration installed in the package,
+        and is independent of the ``build_type`` setting.
+        """
+        from autorecipes import cpp_info
         source_dir = Path(__file__) / '..' / 'data' / 'install'
         source_dir = source_dir.resolve(strict=False)
-        with tempfile.TemporaryDirectory() as build_dir:
-            try:
-                build_type_args = [
-                    f'-DCMAKE_BUILD_TYPE={self.settings.build_type}'
-                ]
-            except:
-                build_type_args = []
-            sp.run(
+        with trace.span('introspect'):
+            # No ``CMAKE_BUILD_TYPE``: we record every installed configuration.
+            yield commands.Command(
                 [
                     'cmake',
-                    *build_type_args,
                     f'-DCMAKE_PREFIX_PATH={self.package_folder}',  # pylint: disable=no-member
                     f'-DPACKAGE_NAME={self.name}',
+                    f'-DFORMAT_VERSION={cpp_info.MANIFEST_VERSION}',
                     str(source_dir),
                 ],
-                cwd=build_dir,
+                cwd=str(build_dir),
             )
+        return build_dir / 'cpp_info.json'
 
-            spec = importlib.util.spec_from_file_location(
-                'cpp_info', f'{build_dir}/cpp_info.py'
+    def package_info(self):
+        commands.run(self.package_info_steps())
+
+    def package_info_steps(self) -> commands.Steps[None]:
+        """Fill ``cpp_info`` from the manifest stored in the package."""
+        from autorecipes import cpp_info
+        with trace.span('package_info'):
+            manifest_path = Path(self.package_folder) / MANIFEST_PATH  # pylint: disable=no-member
+            manifest = cpp_info.read_manifest(manifest_path)
+            if manifest is None:
+                # The package was built by an older version of this recipe.
+                with tempfile.TemporaryDirectory() as build_dir:
+                    manifest_path = yield from self.introspect_steps(Path(build_dir))
+                    manifest = cpp_info.read_manifest(manifest_path)
+                if manifest is None:
+                    raise ValueError(f'failed to introspect {self.package_folder}')  # pylint: disable=no-member
+            try:
+                build_type = str(self.settings.build_type)
+            except:
+                build_type = None
+            requirements = [
+                name for name, requirement in self.requires.items()  # pylint: disable=no-member
+                if not requirement.private and not requirement.override
+            ]
+            cpp_info.fill(
+                self.cpp_info,
+                manifest,
+                build_type,
+                self.package_folder,  # pylint: disable=no-member
+                requirements,
             )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            module.fill(self.cpp_info)
 
         # TODO: Can we set dependency options from ``conanfile.txt``?
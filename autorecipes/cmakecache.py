@@ -0,0 +1,61 @@
+"""A reader for ``CMakeCache.txt``.
+
+Each entry in the cache is one line of the form ``KEY:TYPE=VALUE``,
+preceded by zero or more lines of help text starting with ``//``.
+Lines starting with ``#`` are comments.
+"""
+
+from pathlib import Path
+import re
+import typing as t
+
+
+class CacheEntry(t.NamedTuple):
+    """One entry in a ``CMakeCache.txt``."""
+
+    name: str
+    type: str
+    value: str
+    help: str
+
+
+# The key may be quoted, and the type may be missing.
+_ENTRY = re.compile(r'^(?:"(?P<quoted>[^"]*)"|(?P<name>[^:=]+))'
+                    r'(?::(?P<type>[^=]*))?=(?P<value>.*)$')
+
+
+def parse(lines: t.Iterable[str]) -> t.Iterator[CacheEntry]:
+    """Parse the lines of a ``CMakeCache.txt``."""
+    help_lines: t.List[str] = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.startswith('//'):
+            help_lines.append(line[2:])
+            continue
+        if not line.strip() or line.startswith('#'):
+            help_lines = []
+            continue
+        match = _ENTRY.match(line)
+        if match is None:
+            help_lines = []
+            continue
+        value = match.group('value')
+        # CMake quotes values that end in whitespace.
+        if len(value) >= 2 and value[0] == value[-1] == "'":
+            value = value[1:-1]
+        yield CacheEntry(
+            name=match.group('quoted') or match.group('name'),
+            type=match.group('type') or 'UNINITIALIZED',
+            value=value,
+            help='\n'.join(help_lines),
+        )
+        help_lines = []
+
+
+def read(path: Path) -> t.Dict[str, str]:
+    """Return a mapping of names to values from a ``CMakeCache.txt``.
+
+    Raise :class:`FileNotFoundError` if there is no such file.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return {entry.name: entry.value for entry in parse(f)}
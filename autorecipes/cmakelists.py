@@ -0,0 +1,533 @@
+"""A static reader for the ``project()`` call in a ``CMakeLists.txt``.
+
+Most projects pass literal arguments (or simple variable references) to
+``project()``, and for them we can answer metadata queries without starting
+CMake, which would otherwise detect compilers just to tell us the name of the
+project. We are conservative: whenever we cannot be sure what CMake would
+compute, we return ``None`` and the caller should ask CMake.
+
+The lexer follows the `CMake language`__ closely enough for
+the commands that appear before ``project()`` in practice.
+
+.. __: https://cmake.org/cmake/help/latest/manual/cmake-language.7.html
+"""
+
+import os
+from pathlib import Path
+import re
+import typing as t
+
+
+class Unresolvable(Exception):
+    """Raised when we cannot know statically what CMake would compute."""
+
+
+class Argument(t.NamedTuple):
+    """One argument to a command, before evaluation."""
+
+    kind: str  # One of 'bracket', 'quoted', or 'unquoted'.
+    text: str
+
+
+class Command(t.NamedTuple):
+    """One command invocation."""
+
+    name: str
+    arguments: t.List[Argument]
+
+
+_SPACE = re.compile(r'[ \t\r\n]*')
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_BRACKET_OPEN = re.compile(r'\[(=*)\[')
+_LINE_COMMENT = re.compile(r'[^\n]*')
+_UNQUOTED = re.compile(r'(?:[^ \t\r\n()#"\\]|\\.)+', re.DOTALL)
+_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"', re.DOTALL)
+
+
+def _skip(pattern: t.Pattern, text: str, pos: int) -> int:
+    """Return the end of a pattern that matches even nothing."""
+    match = pattern.match(text, pos)
+    assert match is not None
+    return match.end()
+
+
+def _skip_comment(text: str, pos: int) -> int:
+    """Skip a comment starting at ``text[pos] == '#'``."""
+    bracket = _BRACKET_OPEN.match(text, pos + 1)
+    if bracket:
+        close = ']' + bracket.group(1) + ']'
+        end = text.find(close, bracket.end())
+        if end < 0:
+            raise Unresolvable('unterminated bracket comment')
+        return end + len(close)
+    return _skip(_LINE_COMMENT, text, pos)
+
+
+def _bracket_argument(text: str, pos: int) -> t.Optional[t.Tuple[str, int]]:
+    bracket = _BRACKET_OPEN.match(text, pos)
+    if not bracket:
+        return None
+    close = ']' + bracket.group(1) + ']'
+    end = text.find(close, bracket.end())
+    if end < 0:
+        raise Unresolvable('unterminated bracket argument')
+    start = bracket.end()
+    # A newline immediately after the opening bracket is ignored.
+    if text.startswith('\n', start):
+        start += 1
+    elif text.startswith('\r\n', start):
+        start += 2
+    return text[start:end], end + len(close)
+
+
+def lex(text: str) -> t.Iterator[Command]:
+    """Yield the command invocations in a CMake listfile."""
+    pos = 0
+    while True:
+        pos = _skip(_SPACE, text, pos)
+        if pos >= len(text):
+            return
+        if text[pos] == '#':
+            pos = _skip_comment(text, pos)
+            continue
+        identifier = _IDENTIFIER.match(text, pos)
+        if not identifier:
+            raise Unresolvable(f'unexpected character at offset {pos}')
+        pos = _skip(_SPACE, text, identifier.end())
+        if not text.startswith('(', pos):
+            raise Unresolvable(f'expected "(" at offset {pos}')
+        arguments, pos = _arguments(text, pos + 1)
+        yield Command(identifier.group().lower(), arguments)
+
+
+def _arguments(text: str, pos: int) -> t.Tuple[t.List[Argument], int]:
+    arguments = []
+    depth = 0
+    while True:
+        pos = _skip(_SPACE, text, pos)
+        if pos >= len(text):
+            raise Unresolvable('unterminated command invocation')
+        char = text[pos]
+        if char == '#':
+            pos = _skip_comment(text, pos)
+        elif char == '(':
+            # Nested parentheses are kept as unquoted arguments.
+            depth += 1
+            arguments.append(Argument('unquoted', '('))
+            pos += 1
+        elif char == ')':
+            if depth == 0:
+                return arguments, pos + 1
+            depth -= 1
+            arguments.append(Argument('unquoted', ')'))
+            pos += 1
+        elif char == '"':
+            quoted = _QUOTED.match(text, pos)
+            if not quoted:
+                raise Unresolvable('unterminated quoted argument')
+            arguments.append(Argument('quoted', quoted.group(1)))
+            pos = quoted.end()
+        else:
+            bracket = _bracket_argument(text, pos)
+            if bracket is not None:
+                arguments.append(Argument('bracket', bracket[0]))
+                pos = bracket[1]
+                continue
+            unquoted = _UNQUOTED.match(text, pos)
+            if not unquoted:
+                raise Unresolvable(f'unexpected character at offset {pos}')
+            arguments.append(Argument('unquoted', unquoted.group()))
+            pos = unquoted.end()
+
+
+# Stands in for an escaped semicolon, which does not separate list elements.
+_SEMICOLON = '\0'
+_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', ';': _SEMICOLON}
+
+
+def _expand(text: str, variables: t.Mapping[str, str]) -> str:
+    """Evaluate escape sequences and variable references."""
+    value, pos = _expand_until(text, 0, variables, terminator=None)
+    assert pos == len(text)
+    return value
+
+
+def _expand_until(
+    text: str,
+    pos: int,
+    variables: t.Mapping[str, str],
+    terminator: t.Optional[str],
+) -> t.Tuple[str, int]:
+    chunks: t.List[str] = []
+    while pos < len(text):
+        char = text[pos]
+        if char == terminator:
+            return ''.join(chunks), pos
+        if char == '\\':
+            if pos + 1 >= len(text):
+                raise Unresolvable('dangling escape')
+            escaped = text[pos + 1]
+            if escaped == '\n':
+                # A line continuation in a quoted argument.
+                pass
+            elif escaped.isalnum() and escaped not in _ESCAPES:
+                raise Unresolvable(f'invalid escape: \\{escaped}')
+            else:
+                chunks.append(_ESCAPES.get(escaped, escaped))
+            pos += 2
+        elif text.startswith('${', pos):
+            name, pos = _expand_until(text, pos + 2, variables, '}')
+            if pos >= len(text):
+                raise Unresolvable('unterminated variable reference')
+            if name not in variables:
+                raise Unresolvable(f'unknown variable: {name}')
+            chunks.append(variables[name])
+            pos += 1
+        elif re.match(r'\$[A-Za-z]+\{', text[pos:pos + 8]):
+            # ``$ENV{...}`` and ``$CACHE{...}`` depend on the environment.
+            raise Unresolvable('environment or cache variable reference')
+        else:
+            chunks.append(char)
+            pos += 1
+    if terminator is not None:
+        raise Unresolvable(f'expected "{terminator}"')
+    return ''.join(chunks), pos
+
+
+def evaluate(
+    arguments: t.Iterable[Argument],
+    variables: t.Mapping[str, str],
+) -> t.List[str]:
+    """Evaluate arguments the way CMake does before calling a command."""
+    values = []
+    for argument in arguments:
+        if argument.kind == 'bracket':
+            values.append(argument.text)
+        elif argument.kind == 'quoted':
+            values.append(
+                _expand(argument.text, variables).replace(_SEMICOLON, '\\;')
+            )
+        else:
+            # Unquoted arguments are split into list elements,
+            # and empty elements are dropped.
+            expanded = _expand(argument.text, variables)
+            values.extend(
+                element.replace(_SEMICOLON, '\\;')
+                for element in expanded.split(';')
+                if element
+            )
+    return values
+
+
+# Commands that cannot change any variable we care about.
+_INERT_COMMANDS = frozenset([
+    'cmake_minimum_required',
+    'cmake_policy',
+    'include_guard',
+    'message',
+])
+_BLOCK_BEGIN = {
+    'if': 'endif',
+    'foreach': 'endforeach',
+    'while': 'endwhile',
+    'block': 'endblock',
+}
+_DEFINITION_BEGIN = {'function': 'endfunction', 'macro': 'endmacro'}
+_PROJECT_KEYWORDS = frozenset(
+    ['VERSION', 'DESCRIPTION', 'HOMEPAGE_URL', 'LANGUAGES']
+)
+# Cache variables that this package reads but ``project()`` does not set.
+# A project may set them after ``project()``.
+EXTRA_VARIABLES = (
+    'CMAKE_PROJECT_REPOSITORY_URL',
+    'CMAKE_PROJECT_LICENSE',
+    'CMAKE_PROJECT_AUTHORS',
+)
+_VERSION = re.compile(r'^[0-9]+(\.[0-9]+){0,3}$')
+
+
+def _project(arguments: t.List[str]) -> t.Dict[str, str]:
+    """Translate the arguments of ``project()`` into cache variables."""
+    if not arguments:
+        raise Unresolvable('project() without a name')
+    name, *rest = arguments
+    values: t.Dict[str, t.List[str]] = {}
+    keyword = 'LANGUAGES'
+    for argument in rest:
+        if argument in _PROJECT_KEYWORDS:
+            keyword = argument
+            if keyword in values:
+                raise Unresolvable(f'repeated keyword: {keyword}')
+            values[keyword] = []
+        else:
+            values.setdefault(keyword, []).append(argument)
+    variables = {'CMAKE_PROJECT_NAME': name}
+    for keyword, suffix in (
+        ('VERSION', 'VERSION'),
+        ('DESCRIPTION', 'DESCRIPTION'),
+        ('HOMEPAGE_URL', 'HOMEPAGE_URL'),
+    ):
+        given = values.get(keyword, [])
+        if len(given) > 1:
+            raise Unresolvable(f'too many values for {keyword}')
+        variables[f'CMAKE_PROJECT_{suffix}'] = given[0] if given else ''
+    version = variables['CMAKE_PROJECT_VERSION']
+    if version:
+        if not _VERSION.match(version):
+            raise Unresolvable(f'invalid version: {version}')
+        # CMake normalizes each component as an integer.
+        version = '.'.join(str(int(c)) for c in version.split('.'))
+        variables['CMAKE_PROJECT_VERSION'] = version
+    return variables
+
+
+def interpret(commands: t.Iterable[Command]) -> t.Dict[str, str]:
+    """Statically interpret the commands of a top-level ``CMakeLists.txt``.
+
+    Return the ``CMAKE_PROJECT_*`` cache variables that CMake would set.
+    Raise :class:`Unresolvable` if they cannot be known without CMake.
+    """
+    # Variables whose values we know for certain.
+    variables: t.Dict[str, str] = {}
+    # The stack of blocks we are in.
+    # Commands in conditional blocks might not execute,
+    # and commands in definitions execute only when called.
+    blocks: t.List[str] = []
+    project = None
+    extras: t.Dict[str, str] = {}
+    for command in commands:
+        name = command.name
+        if blocks and blocks[-1] in ('endfunction', 'endmacro'):
+            if name == blocks[-1]:
+                blocks.pop()
+            elif name in _DEFINITION_BEGIN:
+                blocks.append(_DEFINITION_BEGIN[name])
+            elif name == 'project':
+                raise Unresolvable('project() inside a definition')
+            continue
+        if name in _DEFINITION_BEGIN:
+            blocks.append(_DEFINITION_BEGIN[name])
+            continue
+        if name in _BLOCK_BEGIN:
+            blocks.append(_BLOCK_BEGIN[name])
+            continue
+        if blocks and name == blocks[-1]:
+            blocks.pop()
+            continue
+        if name in ('elseif', 'else'):
+            continue
+        if name == 'project':
+            if blocks or project is not None:
+                raise Unresolvable('project() is conditional or repeated')
+            project = _project(evaluate(command.arguments, variables))
+            # ``project()`` sets normal variables too.
+            for suffix in ('NAME', 'VERSION', 'DESCRIPTION', 'HOMEPAGE_URL'):
+                value = project[f'CMAKE_PROJECT_{suffix}']
+                variables[f'CMAKE_PROJECT_{suffix}'] = value
+                variables[f'PROJECT_{suffix}'] = value
+            continue
+        if name == 'return':
+            raise Unresolvable('return() at the top level')
+        if 'project' in name:
+            # Likely a wrapper that adds metadata of its own.
+            raise Unresolvable(f'project-like command: {name}()')
+        if name in ('set', 'unset'):
+            _set(command, variables, extras, conditional=bool(blocks))
+            continue
+        if name in _INERT_COMMANDS:
+            continue
+        if any('CMAKE_PROJECT_' in a.text for a in command.arguments):
+            raise Unresolvable(f'{name}() mentions CMAKE_PROJECT_*')
+        # Any other command might change any variable.
+        variables.clear()
+    if project is None:
+        raise Unresolvable('no project()')
+    project.update(extras)
+    return project
+
+
+def _set(
+    command: Command,
+    variables: t.Dict[str, str],
+    extras: t.Dict[str, str],
+    conditional: bool,
+) -> None:
+    try:
+        names = evaluate(command.arguments[:1], variables)
+    except Unresolvable:
+        names = []
+    if len(names) != 1:
+        # We cannot even tell which variable is set.
+        if any('CMAKE_PROJECT_' in a.text for a in command.arguments):
+            raise Unresolvable('unknown assignment to CMAKE_PROJECT_*')
+        variables.clear()
+        return
+    name = names[0]
+    if conditional or command.name == 'unset':
+        if name in EXTRA_VARIABLES:
+            raise Unresolvable(f'conditional assignment to {name}')
+        variables.pop(name, None)
+        return
+    try:
+        values = evaluate(command.arguments[1:], variables)
+    except Unresolvable:
+        if name in EXTRA_VARIABLES:
+            raise
+        variables.pop(name, None)
+        return
+    if 'CACHE' in values:
+        values = values[:values.index('CACHE')]
+        if name in EXTRA_VARIABLES:
+            # On a fresh configure, the first cache assignment wins.
+            extras.setdefault(name, ';'.join(values))
+    elif values and values[-1] == 'PARENT_SCOPE':
+        # There is no parent scope at the top level.
+        return
+    variables[name] = ';'.join(values)
+
+
+def cmake_inputs(source_dir: Path) -> t.Iterator[Path]:
+    """Yield every file that can influence the CMake configuration.
+
+    Paths are yielded in a deterministic order.
+    Hidden directories and build directories (those with a
+    ``CMakeCache.txt``) are skipped.
+    """
+    for root, dirs, files in os.walk(str(source_dir)):
+        dirs[:] = sorted(
+            d for d in dirs if not d.startswith('.') and
+            not os.path.exists(os.path.join(root, d, 'CMakeCache.txt'))
+        )
+        for name in sorted(files):
+            if name == 'CMakeLists.txt' or name.endswith('.cmake'):
+                yield Path(root) / name
+
+
+def _module(
+    source_dir: Path,
+    module_path: t.Sequence[Path],
+    name: str,
+) -> t.Optional[Path]:
+    """Find the file that ``include(name)`` reads, if it is in the source tree."""
+    if name.endswith('.cmake') or '/' in name:
+        candidates = [source_dir / name]
+    else:
+        candidates = [directory / f'{name}.cmake' for directory in module_path]
+    for candidate in candidates:
+        path = Path(os.path.normpath(candidate))
+        if source_dir in path.parents and path.is_file():
+            return path
+    return None
+
+
+def listfiles(source_dir: Path) -> t.List[Path]:
+    """Return the top-level ``CMakeLists.txt`` and the files it pulls in.
+
+    Those are the files named by its ``include()`` and ``add_subdirectory()``
+    commands, and the files that those files pull in in turn.
+    Modules outside the source tree, e.g. those that come with CMake,
+    are skipped.
+    Raise :class:`Unresolvable` if we cannot tell which files those are,
+    e.g. if an argument names a variable that we do not track.
+    """
+    # Each listfile with the source directory that CMake reads it in.
+    found = [(source_dir / 'CMakeLists.txt', source_dir)]
+    module_path: t.List[Path] = []
+    index = 0
+    while index < len(found):
+        listfile, current_dir = found[index]
+        index += 1
+        try:
+            text = listfile.read_text()
+        except OSError:
+            continue
+        except UnicodeDecodeError as error:
+            raise Unresolvable(f'cannot read {listfile}') from error
+        variables = {
+            'CMAKE_SOURCE_DIR': str(source_dir),
+            'PROJECT_SOURCE_DIR': str(source_dir),
+            'CMAKE_CURRENT_SOURCE_DIR': str(current_dir),
+            'CMAKE_CURRENT_LIST_DIR': str(listfile.parent),
+            'CMAKE_MODULE_PATH': ';'.join(str(d) for d in module_path),
+        }
+        for command in lex(text):
+            if command.name in ('set', 'list'):
+                # ``set(NAME ...)`` and ``list(APPEND NAME ...)``
+                position = 0 if command.name == 'set' else 1
+                names = [a.text for a in command.arguments[position:][:1]]
+                if names != ['CMAKE_MODULE_PATH']:
+                    continue
+            elif command.name not in ('include', 'add_subdirectory'):
+                continue
+            arguments = evaluate(command.arguments, variables)
+            if not arguments:
+                continue
+            if command.name == 'include':
+                path = _module(source_dir, module_path, arguments[0])
+                if path is not None:
+                    entry = (path, current_dir)
+                    if entry not in found:
+                        found.append(entry)
+            elif command.name == 'add_subdirectory':
+                subdir = Path(os.path.normpath(current_dir / arguments[0]))
+                entry = (subdir / 'CMakeLists.txt', subdir)
+                if entry[0].is_file() and entry not in found:
+                    found.append(entry)
+            else:
+                directories = [
+                    current_dir / a for a in arguments if a not in
+                    ('CMAKE_MODULE_PATH', 'APPEND', 'PREPEND', 'CACHE')
+                ]
+                if command.name == 'set':
+                    module_path[:] = directories
+                else:
+                    module_path.extend(directories)
+                variables['CMAKE_MODULE_PATH'] = ';'.join(
+                    str(d) for d in module_path
+                )
+    paths: t.List[Path] = []
+    for path, _ in found:
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def mentioned(paths: t.Iterable[Path], names: t.Sequence[str]) -> t.List[str]:
+    """Return those of some names that any of some files mentions."""
+    found: t.List[str] = []
+    if not names:
+        return found
+    for path in paths:
+        try:
+            text = path.read_text(errors='replace')
+        except OSError:
+            continue
+        found.extend(name for name in names
+                     if name not in found and name in text)
+    return found
+
+
+def project_variables(
+    source_dir: Path,
+    paths: t.Optional[t.Sequence[Path]] = None,
+) -> t.Optional[t.Dict[str, str]]:
+    """Return the ``CMAKE_PROJECT_*`` cache variables for a project.
+
+    Return ``None`` if they cannot be known without running CMake.
+    ``paths`` are the :func:`listfiles` of the project,
+    if the caller has them already.
+    """
+    try:
+        text = (source_dir / 'CMakeLists.txt').read_text()
+        variables = interpret(lex(text))
+        # Commands after ``project()``, e.g. ``include()``,
+        # may set the variables that ``project()`` does not.
+        missing = [n for n in EXTRA_VARIABLES if not variables.get(n)]
+        if missing:
+            if paths is None:
+                paths = listfiles(source_dir)
+            if mentioned(paths, missing):
+                raise Unresolvable(f'{missing} may be set elsewhere')
+        return variables
+    except (OSError, UnicodeDecodeError, Unresolvable):
+        return None
@@ -0,0 +1,70 @@
+"""Code that runs commands, independent of how they are run.
+
+Functions that need to run commands are written as generators of *steps*:
+they yield each :class:`Command` that they need to run,
+and receive its :class:`subprocess.CompletedProcess` in return.
+A failure to run a command (:class:`OSError`), or a nonzero exit status
+of a command that is checked (:class:`subprocess.CalledProcessError`),
+is raised at the ``yield``.
+
+:func:`run` drives steps with blocking subprocesses,
+and :func:`autorecipes.aio.drive` with asyncio subprocesses,
+so that the same code serves both.
+"""
+
+import subprocess as sp
+import typing as t
+
+from autorecipes import trace
+
+T = t.TypeVar('T')
+
+
+class Command(t.NamedTuple):
+    """A command to run, with the options of :func:`subprocess.run`."""
+
+    args: t.Sequence[str]
+    cwd: t.Optional[str] = None
+    # ``None``, :data:`subprocess.PIPE` or :data:`subprocess.DEVNULL`.
+    stdout: t.Optional[int] = None
+    stderr: t.Optional[int] = None
+    check: bool = False
+
+
+# A generator that yields commands and returns a ``T``.
+Steps = t.Generator[Command, sp.CompletedProcess, T]
+
+
+def execute(command: Command) -> sp.CompletedProcess:
+    """Run a command in a blocking subprocess."""
+    return trace.run(
+        list(command.args),
+        cwd=command.cwd,
+        stdout=command.stdout,
+        stderr=command.stderr,
+        check=command.check,
+    )
+
+
+def run(steps: Steps[T]) -> T:
+    """Drive steps to completion with blocking subprocesses."""
+    result: t.Any = None
+    error: t.Optional[BaseException] = None
+    while True:
+        try:
+            if error is None:
+                command = steps.send(result)
+            else:
+                command = steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = execute(command), None
+        except (OSError, sp.CalledProcessError) as cause:
+            result, error = None, cause
+
+
+def check_output(args: t.Sequence[str], cwd: t.Optional[str] = None) -> Steps[bytes]:
+    """Run a checked command and return its output."""
+    process = yield Command(args, cwd=cwd, stdout=sp.PIPE, check=True)
+    return process.stdout
@@ -0,0 +1,96 @@
+"""The source directory of the recipes being evaluated.
+
+Recipes read their sources (``CMakeLists.txt``, ``conanfile.txt``,
+``pyproject.toml``, the Git index) from the source directory of the current
+context, which defaults to the working directory.
+Each thread has its own context, and so does each asyncio task
+(except on Python 3.6, where tasks in one thread share a context),
+so that one process can evaluate recipes for many projects at once,
+without racing to change its working directory::
+
+    with context.using(source_dir):
+        name = Recipe.name
+
+Cached class attributes are kept per source directory
+(see :class:`autorecipes.descriptors.ClassCache`).
+"""
+
+import contextlib
+import functools
+import os
+from pathlib import Path
+import threading
+import typing as t
+
+T = t.TypeVar('T')
+
+try:
+    import contextvars
+except ImportError:  # Python 3.6
+    contextvars = None  # type: ignore
+
+
+class _ThreadLocalVar:
+    """The subset of :class:`contextvars.ContextVar` that we need.
+
+    This is for Python 3.6, where each thread is a context.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self) -> t.Any:
+        return getattr(self._local, 'value', None)
+
+    def set(self, value: t.Any) -> t.Any:
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token: t.Any) -> None:
+        self._local.value = token
+
+
+_source_dir: t.Any = (
+    _ThreadLocalVar() if contextvars is None else
+    contextvars.ContextVar('autorecipes.source_dir', default=None)
+)
+
+
+def source_dir() -> Path:
+    """Return the source directory of the current context.
+
+    It is always resolved, so that it can identify a project.
+    """
+    value = _source_dir.get()
+    return Path(os.getcwd()).resolve() if value is None else value
+
+
+@contextlib.contextmanager
+def using(path: t.Optional[Path]) -> t.Iterator[Path]:
+    """Change the source directory of the current context, temporarily.
+
+    ``None`` restores the default, the working directory.
+    """
+    value = None if path is None else Path(path).resolve()
+    token = _source_dir.set(value)
+    try:
+        yield source_dir()
+    finally:
+        _source_dir.reset(token)
+
+
+def bind(function: t.Callable[..., T]) -> t.Callable[..., T]:
+    """Bind a function to the source directory of the current context.
+
+    The function returned calls the other in that source directory,
+    even on another thread.
+    """
+    value = _source_dir.get()
+
+    @functools.wraps(function)
+    def bound(*args: t.Any, **kwargs: t.Any) -> T:
+        with using(value):
+            return function(*args, **kwargs)
+
+    return bound
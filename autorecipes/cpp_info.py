@@ -0,0 +1,365 @@
+"""Fill a ``cpp_info`` from the manifest written by introspection.
+
+The CMake project in ``data/install`` queries the installed package's targets
+and writes their properties to a JSON manifest.
+This module reads that manifest and translates it into Conan's ``cpp_info``.
+"""
+
+import abc
+import json
+from pathlib import Path
+import posixpath
+import re
+import typing as t
+
+from autorecipes.stdlib import OrderedSet, closures
+
+# Bump this whenever the format of the manifest changes.
+MANIFEST_VERSION = 5
+
+# Manifest fields that map directly to ``cpp_info`` attributes.
+# Every value just happens to be a list.
+ATTRIBUTES = (
+    'includedirs',
+    'defines',
+    'cxxflags',
+    'libdirs',
+    'exelinkflags',
+)
+
+
+def read_manifest(path: Path) -> t.Optional[t.Mapping[str, t.Any]]:
+    """Read a manifest.
+
+    Return ``None`` if it is missing, corrupt, or has the wrong version.
+    """
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+class Dependencies(t.NamedTuple):
+    """The link dependencies of one component, in link order."""
+
+    # Components of the same package, transitively.
+    internal: t.List[str]
+    # Targets of other packages, e.g. ``other::lib``.
+    external: t.List[str]
+    # Libraries linked by name, e.g. ``pthread``.
+    system: t.List[str]
+    # Library files of this package, relative to it.
+    libraries: t.List[str]
+    # Other library files linked by path, e.g. ``/usr/lib/libz.so``.
+    files: t.List[str]
+    # Linker flags, e.g. ``-Wl,--as-needed``.
+    flags: t.List[str]
+
+
+_LINK_ONLY = re.compile(r'\$<LINK_ONLY:(.*)>')
+
+# The manifest writes paths inside the package after this prefix.
+_INSTALL_PREFIX = '$<INSTALL_PREFIX>/'
+
+_LIBRARY_FILE = re.compile(r'.*\.(a|lib|dylib|so(\.[0-9]+)*)$')
+
+
+def _classify(
+    package: str,
+    components: t.Container[str],
+    dependency: str,
+) -> t.Optional[t.Tuple[str, str]]:
+    """Return the kind of a link dependency, and its name for that kind.
+
+    Return ``None`` for a generator expression,
+    which we cannot evaluate without CMake.
+    """
+    match = _LINK_ONLY.fullmatch(dependency)
+    if match:
+        dependency = match.group(1)
+    if dependency.startswith(_INSTALL_PREFIX):
+        return 'libraries', dependency[len(_INSTALL_PREFIX):]
+    if '$<' in dependency:
+        return None
+    if dependency.startswith(f'{package}::'):
+        component = dependency[len(package) + 2:]
+        if component in components:
+            return 'internal', component
+    if dependency.startswith('-l'):
+        return 'system', dependency[2:]
+    if dependency.startswith('-'):
+        return 'flags', dependency
+    if '::' in dependency:
+        return 'external', dependency
+    if '/' in dependency or '\\' in dependency or (
+        _LIBRARY_FILE.match(dependency)
+    ):
+        return 'files', dependency
+    return 'system', dependency
+
+
+def index(manifest: t.Mapping[str, t.Any]) -> t.Dict[str, Dependencies]:
+    """Return the dependencies of each component, in link order.
+
+    Components come in link order too:
+    each precedes the components that it depends on.
+    Every list includes the dependencies of internal dependencies,
+    and has no duplicates.
+    """
+    package = manifest['package']
+    components = manifest['components']
+    graph: t.Dict[str, t.List[str]] = {}
+    direct: t.Dict[str, t.Dict[str, OrderedSet[str]]] = {}
+    for component, fields in components.items():
+        kinds: t.Dict[str, OrderedSet[str]] = {
+            kind: OrderedSet() for kind in Dependencies._fields
+        }
+        for dependency in fields.get('dependencies', ()):
+            classified = _classify(package, components, dependency)
+            if classified is not None:
+                kind, name = classified
+                kinds[kind].add(name)
+        graph[component] = list(kinds['internal'])
+        direct[component] = kinds
+    result = {}
+    for component, internal in closures(graph).items():
+        kinds = {kind: OrderedSet() for kind in Dependencies._fields}
+        kinds['internal'].update(internal)
+        for node in (component, *internal):
+            for kind in Dependencies._fields[1:]:
+                kinds[kind].update(direct[node][kind])
+        result[component] = Dependencies(
+            **{kind: list(values) for kind, values in kinds.items()}
+        )
+    return result
+
+
+class CppInfoBuilder(abc.ABC):
+    """The parts common to every kind of builder.
+
+    Values are collected per target and attribute in ordered sets,
+    and assigned to the ``cpp_info`` once, in :meth:`finish`,
+    so that building takes time linear in the number of values.
+    """
+
+    def __init__(self):
+        # Maps each target to a map from configuration to location.
+        self.locations = {}
+        # Maps each target to a map from attribute to values.
+        self.values: t.Dict[str, t.Dict[str, OrderedSet[str]]] = {}
+
+    def extend(self, target, attribute, values):
+        """Add values to an attribute of a target, skipping duplicates."""
+        attributes = self.values.setdefault(target, {})
+        if attribute not in attributes:
+            attributes[attribute] = OrderedSet()
+        attributes[attribute].update(values)
+
+    def add(self, target, attribute, value):
+        """Add one value to an attribute of a target."""
+        self.extend(target, attribute, (value,))
+
+    def locate(self, target, kind, config, directory, filename):
+        """Record where a library or executable is in one configuration."""
+        configs = self.locations.setdefault(target, {})
+        configs[config] = (kind, directory, filename)
+
+    def finish(self, build_type):
+        """Add the library or executable for each target, then assign."""
+        config = (build_type or '').upper()
+        for target, configs in self.locations.items():
+            # Follow CMake: prefer the matching configuration,
+            # then the configuration-less location,
+            # then whichever configuration was installed first.
+            location = (
+                configs.get(config) or configs.get('') or
+                next(iter(configs.values()))
+            )
+            kind, directory, filename = location
+            if kind == 'library':
+                self.add(target, 'libdirs', directory)
+                self.add_library(target, filename)
+            else:
+                self.add(target, 'bindirs', directory)
+                self.add_executable(target, filename)
+        self.assign()
+
+    @abc.abstractmethod
+    def add_library(self, target, library):
+        ...
+
+    @abc.abstractmethod
+    def add_executable(self, target, executable):
+        ...
+
+    @abc.abstractmethod
+    def add_dependencies(self, target, dependencies: Dependencies):
+        ...
+
+    @abc.abstractmethod
+    def assign(self):
+        """Assign the collected values to the ``cpp_info``."""
+
+
+# https://docs.conan.io/en/latest/reference/conanfile/attributes.html#cpp-info
+class SingleTargetCppInfo(CppInfoBuilder):
+    """A builder that folds every target into one ``cpp_info``.
+
+    This is for versions of Conan without components,
+    and for packages with a target that has the name of the package.
+    """
+
+    def __init__(self, cpp_info, package):  # pylint: disable=unused-argument
+        super().__init__()
+        self.cpp_info = cpp_info
+        # Since we know exactly the values to set, we can set empty defaults.
+        self.cpp_info.includedirs = []
+        self.cpp_info.libdirs = []
+        # TODO: Is CMake aware of resource directories?
+        self.cpp_info.resdirs = []
+        self.cpp_info.bindirs = []
+
+    def add_library(self, target, library):
+        self.add(target, 'libs', library)
+
+    def add_executable(self, target, executable):
+        # TODO: Add to .exes attribute conditional on the version of Conan.
+        # See 'New fields to cpp_info':
+        # https://github.com/conan-io/conan/issues/5090#issue-439973044
+        pass
+
+    def add_dependencies(self, target, dependencies):
+        # All targets are folded into one, which has no internal
+        # dependencies. Conan links external packages through requirements.
+        self.extend(target, 'system_libs', dependencies.system)
+        # Conan's CMake generators link system libraries as given,
+        # and after the libraries of the package, so a path works there.
+        # Other generators expect names, and cannot link library files.
+        # Paths outside the package name files on the machine that built it.
+        self.extend(target, 'system_libs', dependencies.libraries)
+        self.extend(target, 'system_libs', dependencies.files)
+        self.extend(target, 'exelinkflags', dependencies.flags)
+
+    def assign(self):
+        # Fold every target into one, in order.
+        merged: t.Dict[str, OrderedSet[str]] = {}
+        for attributes in self.values.values():
+            for attribute, values in attributes.items():
+                if attribute not in merged:
+                    merged[attribute] = OrderedSet()
+                merged[attribute].update(values)
+        for attribute, values in merged.items():
+            setattr(self.cpp_info, attribute, list(values))
+
+
+def requirement(target: str, requirements: t.Iterable[str]) -> t.Optional[str]:
+    """Name the component of a requirement that a CMake target stands for.
+
+    ``fmt::fmt`` stands for ``fmt::fmt`` if ``fmt`` is a requirement.
+    Return ``None`` if the target comes from no requirement,
+    e.g. ``Threads::Threads``.
+    """
+    namespace, separator, name = target.partition('::')
+    if not separator:
+        return None
+    for package in requirements:
+        if package.lower() == namespace.lower():
+            # A package without components is its own component.
+            component = package if name.lower() == namespace.lower() else name
+            return f'{package}::{component}'
+    return None
+
+
+# https://docs.conan.io/1/creating_packages/package_information.html#using-components
+class MultiTargetCppInfo(CppInfoBuilder):
+    """A builder that fills one component of a ``cpp_info`` per target.
+
+    Conan lets components require only the components of the same package
+    and of the public requirements of the recipe.
+    Targets of any other package are left out.
+    """
+
+    def __init__(self, cpp_info, package, requirements=()):
+        super().__init__()
+        # Conan forbids touching the general attributes
+        # when there are components.
+        self.components = cpp_info.components
+        self.package = package
+        self.requirements = list(requirements)
+
+    def add_library(self, target, library):
+        self.add(target, 'libs', library)
+
+    def add_executable(self, target, executable):
+        # Components have no executables. :meth:`finish` adds the directory.
+        pass
+
+    def add_dependencies(self, target, dependencies):
+        # Internal dependencies are already transitive,
+        # so consumers need not walk the graph again.
+        self.extend(target, 'requires', dependencies.internal)
+        self.extend(target, 'requires', filter(None, (
+            requirement(name, self.requirements)
+            for name in dependencies.external
+        )))
+        self.extend(target, 'system_libs', dependencies.system)
+        # See :meth:`SingleTargetCppInfo.add_dependencies`.
+        self.extend(target, 'system_libs', dependencies.libraries)
+        self.extend(target, 'system_libs', dependencies.files)
+        self.extend(target, 'exelinkflags', dependencies.flags)
+
+    def assign(self):
+        for target, attributes in self.values.items():
+            component = self.components[target]
+            # See :class:`SingleTargetCppInfo`.
+            component.includedirs = []
+            component.libdirs = []
+            component.resdirs = []
+            component.bindirs = []
+            for attribute, values in attributes.items():
+                setattr(component, attribute, list(values))
+
+
+def fill(
+    cpp_info: t.Any,
+    manifest: t.Mapping[str, t.Any],
+    build_type: t.Optional[str] = None,
+    package_folder: t.Optional[str] = None,
+    requirements: t.Sequence[str] = (),
+) -> None:
+    """Fill a ``cpp_info`` from a manifest, for one build type.
+
+    Library files of the package are linked by their path in
+    ``package_folder``, if it is given.
+    Each target becomes a component if Conan has components
+    and no target has the name of the package, which Conan forbids.
+    ``requirements`` are the public requirements of the recipe.
+    """
+    package = manifest['package']
+    components = manifest['components']
+    builder: CppInfoBuilder
+    if hasattr(cpp_info, 'components') and package not in components:
+        builder = MultiTargetCppInfo(cpp_info, package, requirements)
+    else:
+        builder = SingleTargetCppInfo(cpp_info, package)
+    # Visit components in link order, so that a single target lists
+    # each library before the libraries that it depends on.
+    for component, dependencies in index(manifest).items():
+        fields = components[component]
+        for attribute in ATTRIBUTES:
+            builder.extend(component, attribute, fields.get(attribute, ()))
+        if package_folder is not None:
+            dependencies = dependencies._replace(libraries=[
+                posixpath.join(package_folder, path)
+                for path in dependencies.libraries
+            ])
+        builder.add_dependencies(component, dependencies)
+        kind = 'library' if fields['type'] == 'STATIC_LIBRARY' else 'executable'
+        for config, path in fields.get('locations', {}).items():
+            directory, filename = posixpath.split(path)
+            builder.locate(component, kind, config, directory, filename)
+    builder.finish(build_type)
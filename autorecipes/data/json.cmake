@@ -0,0 +1,36 @@
+# Helpers to write JSON from CMake.
+# String values are escaped, so they may contain any character,
+# including quotes, semicolons and control characters.
+
+# Set `out` to `value` as a JSON string literal.
+function(json_string out value)
+  string(REPLACE "\\" "\\\\" value "${value}")
+  string(REPLACE "\"" "\\\"" value "${value}")
+  string(REPLACE "\n" "\\n" value "${value}")
+  string(REPLACE "\r" "\\r" value "${value}")
+  string(REPLACE "\t" "\\t" value "${value}")
+  # JSON forbids every other control character too.
+  # (A CMake string cannot hold NUL.)
+  if(value MATCHES "[^ -~]")
+    foreach(code RANGE 1 31)
+      string(ASCII ${code} character)
+      math(EXPR high "${code} / 16")
+      math(EXPR low "${code} % 16")
+      string(SUBSTRING "0123456789abcdef" ${low} 1 low)
+      string(REPLACE "${character}" "\\u00${high}${low}" value "${value}")
+    endforeach()
+  endif()
+  set(${out} "\"${value}\"" PARENT_SCOPE)
+endfunction()
+
+# Set `out` to the remaining arguments as a JSON array of strings.
+function(json_array out)
+  set(json "")
+  set(separator "")
+  foreach(item IN LISTS ARGN)
+    json_string(item "${item}")
+    string(APPEND json "${separator}${item}")
+    set(separator ", ")
+  endforeach()
+  set(${out} "[${json}]" PARENT_SCOPE)
+endfunction()
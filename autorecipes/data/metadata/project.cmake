@@ -0,0 +1,35 @@
+# Included after every call to `project()` (through `CMAKE_PROJECT_INCLUDE`).
+# After the top-level call, write the project variables
+# and stop the configuration before it does anything else.
+if(NOT CMAKE_CURRENT_SOURCE_DIR STREQUAL CMAKE_SOURCE_DIR)
+  return()
+endif()
+
+include("${CMAKE_CURRENT_LIST_DIR}/../json.cmake")
+
+set(json "")
+set(separator "")
+foreach(variable
+  CMAKE_PROJECT_NAME
+  CMAKE_PROJECT_VERSION
+  CMAKE_PROJECT_DESCRIPTION
+  CMAKE_PROJECT_HOMEPAGE_URL
+  CMAKE_PROJECT_REPOSITORY_URL
+  CMAKE_PROJECT_LICENSE
+  CMAKE_PROJECT_AUTHORS
+)
+  if(DEFINED ${variable})
+    json_string(value "${${variable}}")
+    string(APPEND json "${separator}\n    \"${variable}\": ${value}")
+    set(separator ",")
+  endif()
+endforeach()
+# The recipe ignores the listfiles that come with CMake.
+json_string(root "${CMAKE_ROOT}")
+file(WRITE "${CMAKE_BINARY_DIR}/attributes.json"
+  "{\n  \"version\": ${AUTORECIPES_FORMAT_VERSION},\n  \"root\": ${root},\n  \"variables\": {${json}\n  }\n}\n"
+)
+
+# There is no way to stop early without an error.
+# The recipe looks for the file above instead of the exit status.
+message(FATAL_ERROR "autorecipes: stopped after project()")
@@ -0,0 +1,10 @@
+# A toolchain that skips the expensive parts of enabling a language:
+# identifying the compiler, checking that it works,
+# and detecting its ABI.
+# The compiler is still found, but never run.
+foreach(lang C CXX OBJC OBJCXX Fortran ASM)
+  set(CMAKE_${lang}_COMPILER_ID_RUN TRUE)
+  set(CMAKE_${lang}_COMPILER_FORCED TRUE)
+  set(CMAKE_${lang}_COMPILER_WORKS TRUE)
+  set(CMAKE_${lang}_ABI_COMPILED TRUE)
+endforeach()
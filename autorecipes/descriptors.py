@@ -1,5 +1,11 @@
 """Types and class property descriptors."""
 
+from concurrent.futures import Future
+import threading
+import weakref
+
+from autorecipes import context
+
 
 class MappedDescriptor:
     """A descriptor that maps a function over another descriptor."""
@@ -63,25 +69,144 @@ def classproperty(fget):
 
 classproperty.__doc__ = ClassPropertyDescriptor.__doc__
 
-_UNDEFINED = object()
+
+class _Entry:  # pylint: disable=too-few-public-methods
+    """The value, or pending value, of a :class:`ClassCache` entry.
+
+    There is one entry per class and source directory.
+    """
+
+    def __init__(self):
+        self.future = Future()
+        # The identity of the thread computing the value.
+        self.owner = None
+
+
+class ClassCache:
+    """A thread-safe cache of one value per class and source directory.
+
+    The source directory is that of the current context
+    (see :mod:`autorecipes.context`).
+    Classes are held weakly, so that caching a value never keeps a class
+    alive. Each value is computed at most once, even when many threads ask
+    for it at the same time: the first computes, and the rest wait for it.
+    A thread that asks for a value that it is still computing gets
+    a :class:`RecursionError` instead of a deadlock.
+    If the computation fails, every waiting thread gets the exception,
+    and the next request computes it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = weakref.WeakKeyDictionary()
+
+    def get(self, typ, compute, fresh=None):
+        """Return the value for a class, computing it if necessary.
+
+        If given, ``fresh`` is called with a value computed earlier,
+        and if it returns false, the value is computed again.
+        """
+        source_dir = context.source_dir()
+        while True:
+            with self._lock:
+                entries = self._entries.setdefault(typ, {})
+                entry = entries.get(source_dir)
+                owner = entry is None
+                if owner:
+                    entry = entries[source_dir] = _Entry()
+            if owner:
+                return self._run(typ, source_dir, entry, compute)
+            if not entry.future.done() and entry.owner == threading.get_ident():
+                raise RecursionError(f'recursive evaluation for {typ}')
+            value = entry.future.result()
+            if fresh is None or fresh(value):
+                return value
+            self._discard(typ, source_dir, entry)
+
+    def submit(self, typ, compute, executor):
+        """Start computing the value for a class on an executor.
+
+        The value is for the source directory of the current context.
+        Do nothing if the value is already computed or being computed.
+        """
+        source_dir = context.source_dir()
+        with self._lock:
+            entries = self._entries.setdefault(typ, {})
+            if source_dir in entries:
+                return
+            entry = entries[source_dir] = _Entry()
+        try:
+            executor.submit(
+                context.bind(self._run), typ, source_dir, entry, compute
+            )
+        except BaseException as error:
+            # E.g. the executor is shut down. Nothing will compute the value,
+            # so the next request must, and waiting threads must not wait.
+            self._discard(typ, source_dir, entry)
+            entry.future.set_exception(error)
+            raise
+
+    def invalidate(self, typ):
+        """Forget the values for a class, in every source directory.
+
+        A computation in progress is not interrupted,
+        but its value is not kept.
+        """
+        with self._lock:
+            self._entries.pop(typ, None)
+
+    def clear(self):
+        """Forget the values for every class."""
+        with self._lock:
+            self._entries.clear()
+
+    def _discard(self, typ, source_dir, entry):
+        with self._lock:
+            # Another thread may have replaced the entry already.
+            entries = self._entries.get(typ, {})
+            if entries.get(source_dir) is entry:
+                del entries[source_dir]
+
+    def _run(self, typ, source_dir, entry, compute):
+        entry.owner = threading.get_ident()
+        try:
+            value = compute()
+        except BaseException as error:
+            self._discard(typ, source_dir, entry)
+            entry.future.set_exception(error)
+            raise
+        entry.future.set_result(value)
+        return value
+
+
+def invalidate(typ):
+    """Forget the values of every cached class attribute of a class."""
+    for klass in typ.__mro__:
+        for value in vars(klass).values():
+            cache = getattr(value, 'cache', None)
+            if isinstance(cache, ClassCache):
+                cache.invalidate(typ)
 
 
 class CachedClassPropertyDescriptor:
     """A caching descriptor for a class attribute.
 
     Compare with :class:`ClassPropertyDescriptor`, which does not cache.
+    Each class has its own value (see :class:`ClassCache`).
     """
 
     def __init__(self, fget):
         self.fget = fget
-        self.value = _UNDEFINED
+        self.cache = ClassCache()
+
+    def prefetch(self, typ, executor):
+        """Start computing the value on an executor."""
+        self.cache.submit(typ, self.fget.__get__(None, typ), executor)
 
     def __get__(self, obj, typ=None):
-        if self.value is _UNDEFINED:
-            if typ is None:
-                typ = type(obj)
-            self.value = self.fget.__get__(obj, typ)()
-        return self.value
+        if typ is None:
+            typ = type(obj)
+        return self.cache.get(typ, self.fget.__get__(obj, typ))
 
 
 def cached_classproperty(fget):
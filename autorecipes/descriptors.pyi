@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 import typing as t
 import typing_extensions as tex
 
@@ -70,11 +71,45 @@ def classproperty(fget: ClassGetter) -> ClassPropertyDescriptor:
     ...
 
 
+class ClassCache(t.Generic[T]):
+
+    def get(
+        self,
+        typ: type,
+        compute: t.Callable[[], T],
+        fresh: t.Optional[t.Callable[[T], bool]] = None,
+    ) -> T:
+        ...
+
+    def submit(
+        self,
+        typ: type,
+        compute: t.Callable[[], T],
+        executor: Executor,
+    ) -> None:
+        ...
+
+    def invalidate(self, typ: type) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+def invalidate(typ: type) -> None:
+    ...
+
+
 class CachedClassPropertyDescriptor(Descriptor[O, T]):
 
+    cache: ClassCache[T]
+
     def __init__(self, fget: ClassGetter):
         ...
 
+    def prefetch(self, typ: t.Type[O], executor: Executor) -> None:
+        ...
+
 
 def cached_classproperty(fget: ClassGetter) -> CachedClassPropertyDescriptor:
     ...
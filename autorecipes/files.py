@@ -0,0 +1,189 @@
+"""Selecting, hashing and recording the files of a project."""
+
+import fnmatch
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import tempfile
+import typing as t
+
+from autorecipes.cache import Digest, default_directory
+from autorecipes.stamps import Stamp, stamp
+
+# Bump this whenever the shape of a manifest changes.
+MANIFEST_VERSION = 1
+
+# Directories that never hold files worth exporting.
+IGNORED_DIRECTORIES = ('__pycache__', 'node_modules')
+
+IGNORED_SUFFIXES = ('.pyc', '.pyo')
+
+
+def glob_regex(pattern: str) -> t.Pattern:
+    """Translate a glob pattern into a regular expression for paths.
+
+    ``**`` matches any number of directories, ``*`` and ``?`` match within
+    one component, and a pattern naming a directory matches everything in it.
+    """
+    i = 0
+    regex = ''
+    pattern = pattern.strip('/')
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(f'{regex}(?:/.*)?$')
+
+
+def _could_contain(pattern: t.Sequence[str], directory: t.Sequence[str]) -> bool:
+    """Return whether a pattern could match a path under a directory."""
+    for i, part in enumerate(directory):
+        if i >= len(pattern) or pattern[i] == '**':
+            return True
+        if not fnmatch.fnmatchcase(part, pattern[i]):
+            return False
+    return True
+
+
+def scan(root: Path, include: t.Optional[t.Iterable[str]] = None) -> t.List[str]:
+    """Return the relative paths of every file under a directory.
+
+    Paths use forward slashes and are sorted.
+    Hidden directories and caches are skipped,
+    and so are directories that no ``include`` pattern could reach.
+    """
+    patterns = (
+        None if include is None else
+        [p.strip('/').split('/') for p in include]
+    )
+    paths: t.List[str] = []
+    for dirpath, dirs, names in os.walk(str(root)):
+        prefix = os.path.relpath(dirpath, str(root)).replace(os.sep, '/')
+        prefix = '' if prefix == '.' else prefix + '/'
+        dirs[:] = [
+            d for d in dirs
+            if not d.startswith('.') and d not in IGNORED_DIRECTORIES and (
+                patterns is None or any(
+                    _could_contain(p, (prefix + d).split('/'))
+                    for p in patterns
+                )
+            )
+        ]
+        paths.extend(
+            prefix + name for name in names
+            if not name.endswith(IGNORED_SUFFIXES)
+        )
+    paths.sort()
+    return paths
+
+
+def select(
+    paths: t.Iterable[str],
+    include: t.Iterable[str],
+    exclude: t.Iterable[str] = (),
+) -> t.List[str]:
+    """Return the paths matching any include pattern and no exclude pattern."""
+    includes = [glob_regex(p) for p in include]
+    excludes = [glob_regex(p) for p in exclude]
+    return [
+        path for path in paths if any(r.match(path) for r in includes) and
+        not any(r.match(path) for r in excludes)
+    ]
+
+
+def manifest_path(root: Path) -> t.Optional[Path]:
+    """Return where to keep the manifest of the files under a directory.
+
+    It is in the cache directory, never in the directory itself,
+    so that recording a manifest never changes a project.
+    Return ``None`` if the cache is disabled.
+    """
+    directory = default_directory()
+    if directory is None:
+        return None
+    key = Digest('manifest', str(root.resolve())).hexdigest()
+    return directory / 'manifests' / key[:2] / f'{key}.json'
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(tmp, str(path))
+
+
+def read_manifest(path: t.Optional[Path]) -> t.Dict[str, Stamp]:
+    """Return the stamps in a manifest, or nothing if it is missing or stale."""
+    if path is None:
+        return {}
+    try:
+        with open(path, 'r') as f:
+            document = json.load(f)
+        if document.get('version') != MANIFEST_VERSION:
+            return {}
+        return {
+            name: Stamp(*value) for name, value in document['files'].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def digest(stamps: t.Mapping[str, Stamp]) -> str:
+    """Return a hash of the names and contents of a set of files."""
+    h = hashlib.sha256()
+    for name in sorted(stamps):
+        h.update(f'{name}\0{stamps[name].digest}\n'.encode())
+    return h.hexdigest()
+
+
+def update_manifest(
+    path: t.Optional[Path],
+    root: Path,
+    names: t.Iterable[str],
+) -> t.Dict[str, Stamp]:
+    """Record the content hash of each file in a manifest, and return them.
+
+    A file whose modification time and size match the old manifest is not
+    hashed again. The manifest is written only if something changed,
+    but its ``digest`` changes only with the names and contents of the files.
+    Without a manifest (``None``), every file is hashed.
+    """
+    old = read_manifest(path)
+    new = {}
+    for name in names:
+        previous = old.get(name)
+        if previous is not None:
+            try:
+                st = os.stat(root / name)
+            except OSError:
+                continue
+            if (st.st_mtime_ns, st.st_size) == previous[:2]:
+                new[name] = previous
+                continue
+        current = stamp(root / name)
+        if current is not None:
+            new[name] = current
+    if path is not None and new != old:
+        document = {
+            'version': MANIFEST_VERSION,
+            'digest': digest(new),
+            'files': {name: list(value) for name, value in new.items()},
+        }
+        _write(path, json.dumps(document, indent=1, sort_keys=True))
+    return new
+
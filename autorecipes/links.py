@@ -0,0 +1,177 @@
+"""Placing files without copying them.
+
+Exported files go through a content-addressed store (see :class:`Store`):
+each distinct content is copied into the store once,
+with a reflink (a copy-on-write clone) when the file system supports it,
+and then hard linked into each destination.
+Editing a source file cannot change what was exported.
+
+Files in the store, and thus their links, stay writable,
+because Conan and recipes modify and remove what was exported,
+e.g. to patch it, or on Windows, where a read-only file cannot be removed.
+A link shares its content with the store, though:
+writing *into* a destination, instead of replacing it,
+changes the store entry and every other destination linked to it.
+Conan copies exported files into the source folder,
+so only writes into the export folder itself can do that.
+When a link is impossible, e.g. across file systems, we fall back to
+a reflink and then to a plain copy.
+"""
+
+import collections
+import os
+from pathlib import Path
+import shutil
+import stat
+import sys
+import tempfile
+import typing as t
+
+from autorecipes.stamps import stamp
+
+# From ``<linux/fs.h>``: ``_IOW(0x94, 9, int)``.
+FICLONE = 0x40049409
+
+
+def reflink(source: Path, destination: Path) -> bool:
+    """Clone a file with copy-on-write, if the file system can.
+
+    Return whether it did.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(source, 'rb') as s, open(destination, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        try:
+            os.unlink(destination)
+        except OSError:
+            pass
+        return False
+    shutil.copymode(str(source), str(destination))
+    return True
+
+
+def copy(source: Path, destination: Path) -> str:
+    """Copy a file as cheaply as possible, and return how."""
+    if reflink(source, destination):
+        return 'reflink'
+    shutil.copy2(str(source), str(destination))
+    return 'copy'
+
+
+def link(source: Path, destination: Path) -> str:
+    """Hard link a file, or else copy it, and return how."""
+    try:
+        os.link(str(source), str(destination))
+        return 'hardlink'
+    except OSError:
+        return copy(source, destination)
+
+
+class Store:
+    """A directory of files named by their content hash."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def path(self, digest: str, executable: bool) -> Path:
+        # Links share permissions, so the mode is part of the name.
+        name = f'{digest}.x' if executable else digest
+        return self.directory / digest[:2] / name
+
+    def add(self, source: Path, digest: str) -> t.Tuple[Path, bool]:
+        """Add a file with a known hash to the store.
+
+        Return its path in the store,
+        and whether it was already there (and thus not copied).
+        """
+        executable = bool(os.stat(source).st_mode & stat.S_IXUSR)
+        path = self.path(digest, executable)
+        # Like Git, we keep only the executable bit of the source.
+        mode = 0o755 if executable else 0o644
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            pass
+        else:
+            # Older stores kept their files read-only.
+            if stat.S_IMODE(st.st_mode) != mode:
+                os.chmod(str(path), mode)
+            return path, True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        os.close(fd)
+        copy(source, Path(tmp))
+        os.chmod(tmp, mode)
+        os.replace(tmp, str(path))
+        return path, False
+
+
+def _unchanged(
+    source: Path,
+    target: Path,
+    digest: str,
+    store: t.Optional[Store],
+) -> bool:
+    """Return whether a target already has the content of its source."""
+    try:
+        if source.is_symlink() or target.is_symlink():
+            return (
+                source.is_symlink() and target.is_symlink() and
+                os.readlink(str(source)) == os.readlink(str(target))
+            )
+        executable = bool(os.stat(source).st_mode & stat.S_IXUSR)
+        st = os.stat(target)
+    except OSError:
+        return False
+    if bool(st.st_mode & stat.S_IXUSR) != executable:
+        return False
+    if store is not None:
+        # A link into the store needs no hash.
+        path = store.path(digest, executable)
+        try:
+            if os.path.samefile(str(path), str(target)):
+                return True
+        except OSError:
+            pass
+    current = stamp(target)
+    return current is not None and current.digest == digest
+
+
+def place(
+    origin: Path,
+    destination: Path,
+    digests: t.Mapping[str, str],
+    store: t.Optional[Store] = None,
+) -> t.Counter[str]:
+    """Place files from one directory into another.
+
+    ``digests`` maps relative paths to content hashes.
+    A file already in the destination with the same content is left alone.
+    Without a store, files are reflinked or copied directly.
+    Return a count of the ways that files were placed.
+    """
+    counts: t.Counter[str] = collections.Counter()
+    for name, digest in digests.items():
+        source = origin / name
+        target = destination / name
+        if os.path.lexists(str(target)):
+            if _unchanged(source, target, digest, store):
+                counts['unchanged'] += 1
+                continue
+            os.unlink(str(target))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source.is_symlink():
+            os.symlink(os.readlink(str(source)), str(target))
+            counts['symlink'] += 1
+        elif store is None:
+            counts[copy(source, target)] += 1
+        else:
+            path, cached = store.add(source, digest)
+            if cached:
+                counts['cached'] += 1
+            counts[link(path, target)] += 1
+    return counts
@@ -0,0 +1,89 @@
+"""Concurrent prefetch of recipe metadata.
+
+The sources of a recipe's metadata (``CMakeLists.txt``, ``conanfile.txt``,
+``pyproject.toml``, the Git index) are independent,
+but each is resolved lazily, on first access, one after another.
+When prefetch is enabled, every source starts resolving on a thread pool
+as soon as the recipe class is defined,
+and an attribute access waits only for the source it needs.
+
+Enable it for one recipe with a class keyword::
+
+    class Recipe(CMakeConanFile, prefetch=True):
+        ...
+
+or for every recipe by setting the environment variable
+``AUTORECIPES_PREFETCH=1``.
+"""
+
+from concurrent.futures import Executor
+import os
+import threading
+import typing as t
+
+ENVIRONMENT_VARIABLE = 'AUTORECIPES_PREFETCH'
+
+# Sources can wait on each other (the CMake configuration needs the
+# requirements from ``conanfile.txt``), so each source has its own pool:
+# a task must never wait for a task queued behind it in the same pool.
+# This is the most workers in each.
+MAX_WORKERS = 8
+
+_executors: t.Dict[str, Executor] = {}
+_lock = threading.Lock()
+
+
+def enabled(requested: t.Optional[bool] = None) -> bool:
+    """Return whether to prefetch, given an explicit request or not."""
+    if requested is not None:
+        return requested
+    value = os.environ.get(ENVIRONMENT_VARIABLE, '')
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def executor(source: str) -> Executor:
+    """Return the thread pool for one source, starting it if necessary."""
+    with _lock:
+        pool = _executors.get(source)
+        if pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            pool = _executors[source] = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS,
+                thread_name_prefix=f'autorecipes-{source}',
+            )
+        return pool
+
+
+def start(typ: type) -> None:
+    """Start prefetching every source of metadata for a class.
+
+    A source is any class attribute with a ``prefetch(typ, executor)``
+    method, and runs on the pool for its name.
+    A source may wait for other sources, but not for itself in another class.
+    Attributes are looked up the way Python does,
+    so a source overridden in a subclass is not prefetched.
+    """
+    seen = set()
+    for klass in typ.__mro__:
+        for name, value in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            prefetch = getattr(value, 'prefetch', None)
+            if callable(prefetch):
+                prefetch(typ, executor(name))
+
+
+class Prefetching:  # pylint: disable=too-few-public-methods
+    """A mixin that prefetches metadata when a subclass is defined.
+
+    Classes that derive directly from this mixin are generic base recipes,
+    not recipes for a project, and are never prefetched.
+    """
+
+    def __init_subclass__(cls, prefetch: t.Optional[bool] = None, **kwargs):
+        super().__init_subclass__(**kwargs)  # type: ignore
+        if Prefetching in cls.__bases__:
+            return
+        if enabled(prefetch):
+            start(cls)
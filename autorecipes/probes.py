@@ -0,0 +1,96 @@
+"""A cache of configure-time probe results, shared across build folders.
+
+Modules like ``CheckIncludeFile``, ``CheckTypeSize`` and
+``CheckCSourceCompiles`` store their results as ``INTERNAL`` cache entries,
+and skip their probe when the entry is already defined.
+After a configuration, we harvest those entries,
+and before the next configuration with the same toolchain,
+we seed its new build folder with them through an initial cache
+(``cmake -C``). The seed is ignored by any other version of CMake.
+
+The caller is responsible for choosing a key that captures everything
+that can change the result of a probe
+(see :meth:`autorecipes.cmake.CMakeConanFile._probe_key`).
+"""
+
+import os
+from pathlib import Path
+import re
+import tempfile
+import typing as t
+
+from autorecipes.cmakecache import CacheEntry
+
+# The beginnings of the help strings of probe results.
+HELP_PREFIXES = (
+    'Have ',
+    'Test ',
+    'Result of TRY_COMPILE',
+    'Result of TRY_RUN',
+    'CHECK_TYPE_SIZE',
+)
+
+
+def harvest(entries: t.Iterable[CacheEntry]) -> t.List[CacheEntry]:
+    """Return the probe results among some cache entries."""
+    return [
+        e for e in entries
+        if e.type == 'INTERNAL' and e.help.startswith(HELP_PREFIXES)
+    ]
+
+
+def cmake_version(entries: t.Iterable[CacheEntry]) -> t.Optional[str]:
+    """Return the version of CMake that wrote some cache entries."""
+    parts = {
+        e.name: e.value for e in entries if e.name.startswith('CMAKE_CACHE_')
+    }
+    try:
+        return '.'.join(
+            parts[f'CMAKE_CACHE_{part}_VERSION']
+            for part in ('MAJOR', 'MINOR', 'PATCH')
+        )
+    except KeyError:
+        return None
+
+
+def _bracket(value: str) -> str:
+    """Quote a string as a CMake bracket argument."""
+    equals = ''
+    while f']{equals}]' in value:
+        equals += '='
+    return f'[{equals}[{value}]{equals}]'
+
+
+def render(entries: t.Iterable[CacheEntry], version: str) -> str:
+    """Return an initial cache script that defines some entries."""
+    lines = [
+        '# Generated by autorecipes. Probe results for one toolchain.\n',
+        f'if(CMAKE_VERSION VERSION_EQUAL {_bracket(version)})\n',
+    ]
+    for e in entries:
+        if not re.fullmatch(r'[A-Za-z0-9_.+-]+', e.name):
+            continue
+        lines.append(
+            f'  set({e.name} {_bracket(e.value)} '
+            f'CACHE INTERNAL {_bracket(e.help)})\n'
+        )
+    lines.append('endif()\n')
+    return ''.join(lines)
+
+
+def save(path: Path, text: str) -> None:
+    """Write a seed atomically, unless it already has that text."""
+    try:
+        if path.read_text() == text:
+            return
+    except OSError:
+        pass
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp, str(path))
+    except OSError:
+        # The seed is only an optimization.
+        pass
@@ -0,0 +1,128 @@
+"""A fast reader for the Poetry tables of ``pyproject.toml``.
+
+We only need ``[tool.poetry]`` and its subtables,
+so we parse only those sections of the document,
+with the standard library's :mod:`tomllib` when it is available
+(Python 3.11 and later) or the third-party :mod:`toml` otherwise.
+When the document is too unusual for us to split safely
+(it has multi-line strings, or defines Poetry keys outside of
+``[tool.poetry...]`` headers), or the sections do not parse on their own,
+we parse the whole document.
+
+Results are cached per file, and read again when the file changes.
+"""
+
+from pathlib import Path
+import re
+import threading
+import typing as t
+
+from autorecipes.stamps import Stamps, Tracked, fresh
+
+# A table or array-of-tables header with a dotted name of bare keys.
+_HEADER = re.compile(
+    r'^[ \t]*\[\[?[ \t]*'
+    r'([A-Za-z0-9_-]+(?:[ \t]*\.[ \t]*[A-Za-z0-9_-]+)*)'
+    r'[ \t]*\]\]?[ \t]*(?:#.*)?$'
+)
+
+# A key in the root table that could define ``tool.poetry``.
+_TOP_LEVEL_TOOL = re.compile(r'^[ \t]*["\']?tool["\']?[ \t]*[.=]')
+
+_cache: t.Dict[Path, Tracked] = {}
+_lock = threading.Lock()
+
+
+def _loads(text: str) -> t.Dict[str, t.Any]:
+    try:
+        import tomllib  # type: ignore
+    except ImportError:
+        import toml
+        return toml.loads(text)
+    return tomllib.loads(text)
+
+
+def _depth(line: str) -> int:
+    """Return the change in bracket depth over a line of keys and values."""
+    depth = 0
+    quote = None
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if quote is not None:
+            if c == '\\' and quote == '"':
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == '#':
+            break
+        elif c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+        i += 1
+    return depth
+
+
+def poetry_sections(text: str) -> t.Optional[str]:
+    """Return only the ``[tool.poetry...]`` sections of a TOML document.
+
+    Return ``None`` if the document cannot be split safely.
+    """
+    if '"""' in text or "'''" in text:
+        return None
+    sections: t.List[str] = []
+    root = True
+    keep = False
+    found = False
+    depth = 0
+    for line in text.splitlines(keepends=True):
+        match = _HEADER.match(line) if depth == 0 else None
+        if match:
+            root = False
+            name = re.sub(r'[ \t]*\.[ \t]*', '.', match.group(1))
+            if name in ('tool', ''):
+                # Poetry keys may be dotted keys in this table.
+                return None
+            keep = name == 'tool.poetry' or name.startswith('tool.poetry.')
+            found = found or keep
+        elif depth == 0 and line.lstrip().startswith('['):
+            # A header that we do not understand, e.g. with quoted keys.
+            return None
+        elif depth == 0 and root and _TOP_LEVEL_TOOL.match(line):
+            # Poetry keys may be dotted keys in the root table.
+            return None
+        else:
+            depth += _depth(line)
+        if keep:
+            sections.append(line)
+    if not found:
+        return None
+    return ''.join(sections)
+
+
+def parse_poetry(text: str) -> t.Mapping[str, t.Any]:
+    """Return the ``[tool.poetry]`` table of a TOML document."""
+    sections = poetry_sections(text)
+    if sections is not None:
+        try:
+            return _loads(sections)['tool']['poetry']
+        except Exception:  # pylint: disable=broad-except
+            pass
+    return _loads(text)['tool']['poetry']
+
+
+def load(source_dir: Path) -> Tracked:
+    """Return the ``[tool.poetry]`` table of a project, with its stamps."""
+    path = Path(source_dir).resolve() / 'pyproject.toml'
+    with _lock:
+        tracked = _cache.get(path)
+    if tracked is not None and fresh(tracked):
+        return tracked
+    stamps = Stamps(path)
+    tracked = Tracked(parse_poetry(path.read_text()), stamps)
+    with _lock:
+        _cache[path] = tracked
+    return tracked
@@ -4,30 +4,40 @@ I considered using ``Pyproject`` in the names instead of ``Python``,
 but once it has become a certified standard, no one will tell the difference.
 """
 
-import os
+from concurrent.futures import Executor
 from pathlib import Path
 import typing as t
 
 from conans import ConanFile
 
-from autorecipes.descriptors import classproperty, fmap
+from autorecipes import context, files, gitindex, pyproject, trace
+from autorecipes.descriptors import ClassCache, classproperty, fmap
+from autorecipes.prefetch import Prefetching
+from autorecipes.stamps import Tracked, fresh
 
 
 class PythonAttributes:
-    """A descriptor that lazily loads attributes from ``pyproject.toml``."""
+    """A descriptor that lazily loads attributes from ``pyproject.toml``.
+
+    Attributes are loaded again when the file changes.
+    """
 
     def __init__(self):
-        self.attrs = None
+        self.cache: ClassCache[Tracked] = ClassCache()
+
+    def prefetch(self, typ: type, executor: Executor) -> None:
+        """Start loading attributes on an executor."""
+        self.cache.submit(typ, self._load, executor)
 
     def __get__(self, obj: object, typ: type = None) -> t.Mapping[str, t.Any]:
-        if self.attrs is None:
-            # TODO: There is no avoiding this import...
-            import toml
+        if typ is None:
+            typ = type(obj)
+        return self.cache.get(typ, self._load, fresh).value
 
-            source_dir = Path(os.getcwd())
-            pyproject = toml.load(open(source_dir / 'pyproject.toml', 'r'))
-            self.attrs = pyproject['tool']['poetry']
-        return self.attrs
+    @staticmethod
+    def _load() -> Tracked:
+        with trace.span('pyproject'):
+            return pyproject.load(context.source_dir())
 
     def __matmul__(self, key):  # pylint: disable=no-self-use
         """Create a descriptor that lazily returns one attribute."""
@@ -36,14 +46,79 @@ class PythonAttributes:
         def f(cls):
             # We are assuming that the :class:`CMakeAttributes` descriptor
             # will be named ``attrs``.
-            return cls.attrs[key]
+            with trace.span(key, 'attribute'):
+                return cls.attrs[key]
 
         f.__name__ = key
         return f
 
 
-class PythonConanFile(ConanFile):
-    """A base class for Conan recipes for Python projects."""
+def _paths(value: t.Any) -> t.List[str]:
+    """Return the paths in a Poetry setting that takes one or more paths."""
+    if value is None:
+        return []
+    if isinstance(value, (str, dict)):
+        value = [value]
+    return [v['path'] if isinstance(v, dict) else v for v in value]
+
+
+def package_patterns(attrs: t.Mapping[str, t.Any]) -> t.List[str]:
+    """Return the patterns for the packages of a Poetry project."""
+    packages = attrs.get('packages')
+    if packages is None:
+        # Poetry looks for a package or module named after the project.
+        name = attrs['name'].replace('-', '_').replace('.', '_').lower()
+        packages = [
+            {'include': name},
+            {'include': f'{name}.py'},
+            {'include': name, 'from': 'src'},
+            {'include': f'{name}.py', 'from': 'src'},
+        ]
+    patterns = []
+    for package in packages:
+        base = package.get('from')
+        pattern = package['include']
+        patterns.append(f'{base.rstrip("/")}/{pattern}' if base else pattern)
+    return patterns
+
+
+def export_patterns(
+    attrs: t.Mapping[str, t.Any]
+) -> t.Tuple[t.List[str], t.List[str]]:
+    """Return the include and exclude patterns for a Poetry project.
+
+    They follow the ``packages``, ``include`` and ``exclude`` settings,
+    and add the files that Poetry always packages.
+    """
+    include = ['pyproject.toml', 'LICENSE*', 'COPYING*']
+    include.extend(_paths(attrs.get('readme')))
+    build = attrs.get('build')
+    if isinstance(build, dict):
+        build = build.get('script')
+    include.extend(_paths(build))
+    include.extend(package_patterns(attrs))
+    include.extend(_paths(attrs.get('include')))
+    return include, _paths(attrs.get('exclude'))
+
+
+def _untracked(source_dir: Path, paths: t.Iterable[str]) -> t.Set[str]:
+    """Return those of some paths that Git does not track.
+
+    Return nothing if the directory is not in a Git worktree.
+    """
+    try:
+        gitindex.find_git_dir(source_dir.resolve())
+    except (OSError, gitindex.Unsupported):
+        return set()
+    return set(paths).difference(gitindex.ls_files(source_dir))
+
+
+class PythonConanFile(Prefetching, ConanFile):
+    """A base class for Conan recipes for Python projects.
+
+    Pass ``prefetch=True`` in the class definition of a recipe to resolve its
+    metadata concurrently (see :mod:`autorecipes.prefetch`).
+    """
 
     attrs = PythonAttributes()
 
@@ -56,9 +131,25 @@ class PythonConanFile(ConanFile):
     author = fmap(', '.join, attrs @ 'authors')
 
     @classproperty
-    def exports(cls):  # pylint: disable=missing-docstring,no-self-argument
-        yield 'pyproject.toml'
-        for package in cls.attrs.get('packages', []):
-            if 'include' in package:
-                # TODO: Choose files better to include data.
-                yield f"{package['include']}/**.py"
+    def exports(cls):  # pylint: disable=no-self-argument
+        """List every file that Poetry would package."""
+        with trace.span('exports', cls=cls.__qualname__):
+            source_dir = context.source_dir()
+            include, exclude = export_patterns(cls.attrs)
+            paths = files.select(
+                files.scan(source_dir, include),
+                include,
+                exclude,
+            )
+            # Like Poetry, leave out the files in packages that Git ignores,
+            # unless they are included explicitly.
+            # We cannot tell ignored files from untracked ones without Git,
+            # so we leave out both.
+            untracked = _untracked(source_dir, paths)
+            if untracked:
+                packages = package_patterns(cls.attrs)
+                explicit = [p for p in include if p not in packages]
+                left_out = set(files.select(untracked, packages))
+                left_out.difference_update(files.select(untracked, explicit))
+                paths = [p for p in paths if p not in left_out]
+            return paths
@@ -0,0 +1,121 @@
+"""Change detection for the input files of a cached value.
+
+A :class:`Stamps` records the modification time, size and content hash of
+a set of files. Asking whether any of them :meth:`~Stamps.changed`
+costs one :func:`os.stat` per file when nothing changed.
+Only a file whose time or size changed is hashed again,
+so touching a file without editing it does not count as a change.
+
+Like Git, we do not trust the modification time of a file that was
+modified too recently (within the granularity of some file systems):
+such a file is hashed on every check until its time is old enough.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+import threading
+import time
+import typing as t
+
+# Modification times closer than this to the time of a stamp are "racy".
+RACY_NS = 2 * 10**9
+
+
+class Stamp(t.NamedTuple):
+    """The state of one file. An absent file has no stamp."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+def _hash(path: Path) -> t.Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def _stat(path: Path) -> t.Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def stamp(path: Path) -> t.Optional[Stamp]:
+    """Return the current state of a file, or ``None`` if it is absent."""
+    st = _stat(path)
+    if st is None:
+        return None
+    digest = _hash(path)
+    if digest is None:
+        return None
+    mtime_ns = st.st_mtime_ns
+    if int(time.time() * 1e9) - mtime_ns < RACY_NS:
+        # Force a hash on the next check.
+        mtime_ns = -1
+    return Stamp(mtime_ns, st.st_size, digest)
+
+
+class Stamps:
+    """The states of a set of files, to tell whether any of them changed.
+
+    Stamp the inputs *before* reading them,
+    so that an edit made while they are being read is seen as a change.
+    """
+
+    def __init__(self, *paths: Path):
+        self._lock = threading.Lock()
+        self._stamps: t.Dict[Path, t.Optional[Stamp]] = {}
+        self.add(*paths)
+
+    def add(self, *paths: Path) -> None:
+        """Record the current state of some files."""
+        for path in paths:
+            path = Path(os.path.abspath(path))
+            value = stamp(path)
+            with self._lock:
+                self._stamps[path] = value
+
+    @property
+    def paths(self) -> t.List[Path]:
+        with self._lock:
+            return list(self._stamps)
+
+    def changed(self) -> bool:
+        """Return whether the content of any file changed since it was added.
+
+        A file that was added or removed counts as changed.
+        """
+        with self._lock:
+            items = list(self._stamps.items())
+        for path, old in items:
+            st = _stat(path)
+            if old is None or st is None:
+                if old is None and st is None:
+                    continue
+                return True
+            if st.st_mtime_ns == old.mtime_ns and st.st_size == old.size:
+                continue
+            new = stamp(path)
+            if new is None or new.digest != old.digest:
+                return True
+            # Only the time changed. Remember it to skip the hash next time.
+            with self._lock:
+                self._stamps[path] = new
+        return False
+
+
+class Tracked(t.NamedTuple):
+    """A value with the stamps of the files it was computed from."""
+
+    value: t.Any
+    stamps: Stamps
+
+
+def fresh(tracked: Tracked) -> bool:
+    """Return whether none of the inputs of a tracked value changed."""
+    return not tracked.stamps.changed()
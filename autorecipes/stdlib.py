@@ -8,6 +8,8 @@ import typing as t
 
 _StringLike = t.Union[str, bytes]
 
+T = t.TypeVar('T')
+
 
 def named(name):
     """Change the name of something (via a decorator)."""
@@ -56,3 +58,96 @@ class Object:
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
+
+
+class OrderedSet(t.MutableSet[T]):
+    """A set that remembers the order in which values were first added.
+
+    Membership, insertion and removal take constant time.
+    """
+
+    def __init__(self, values: t.Iterable[T] = ()):
+        # Dictionaries preserve insertion order.
+        self._values: t.Dict[T, None] = dict.fromkeys(values)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._values
+
+    def __iter__(self) -> t.Iterator[T]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self._values)!r})'
+
+    def add(self, value: T) -> None:
+        self._values[value] = None
+
+    def discard(self, value: T) -> None:
+        self._values.pop(value, None)
+
+    def update(self, values: t.Iterable[T]) -> None:
+        """Add many values, in order."""
+        for value in values:
+            self._values[value] = None
+
+
+def toposort(graph: t.Mapping[T, t.Iterable[T]]) -> t.List[T]:
+    """Order the nodes of a graph so that each precedes its successors.
+
+    ``graph`` maps each node to its successors.
+    Ties are broken by the order of the nodes in ``graph``
+    and of their successors, and cycles are broken arbitrarily.
+    """
+    visited: t.Set[T] = set()
+    postorder: t.List[T] = []
+    # We reverse the postorder at the end,
+    # so we visit everything in reverse to keep ties in order.
+    for root in reversed(list(graph)):
+        if root in visited:
+            continue
+        visited.add(root)
+        # An explicit stack, because graphs can be deeper than the
+        # recursion limit.
+        stack = [(root, reversed(list(graph.get(root, ()))))]
+        while stack:
+            node, successors = stack[-1]
+            for successor in successors:
+                if successor not in visited:
+                    visited.add(successor)
+                    stack.append(
+                        (successor, reversed(list(graph.get(successor, ()))))
+                    )
+                    break
+            else:
+                stack.pop()
+                postorder.append(node)
+    postorder.reverse()
+    return postorder
+
+
+def closures(graph: t.Mapping[T, t.Iterable[T]]) -> t.Dict[T, t.List[T]]:
+    """Return the nodes reachable from each node of a graph.
+
+    Each list is deduplicated and follows :func:`toposort`.
+    A node reaches itself only through a cycle.
+    """
+    order = toposort(graph)
+    position = {node: i for i, node in enumerate(order)}
+    reachable: t.Dict[T, t.Set[int]] = {node: set() for node in order}
+    # Successors come later in the order, so one pass from the end is enough
+    # for a graph without cycles. Repeat until nothing changes for the rest.
+    changed = True
+    while changed:
+        changed = False
+        for node in reversed(order):
+            before = len(reachable[node])
+            for successor in graph.get(node, ()):
+                reachable[node].add(position[successor])
+                reachable[node] |= reachable[successor]
+            changed = changed or len(reachable[node]) != before
+    return {
+        node: [order[i] for i in sorted(reachable[node])] for node in order
+    }
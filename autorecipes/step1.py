@@ -0,0 +1,189 @@
+"""Persistent directories for the first step of a full configuration.
+
+When attributes need a full configuration of a project
+(see :func:`autorecipes.cmake.configure_attributes_steps`),
+it runs in a directory kept under the cache directory,
+one per source directory and compiler environment,
+so that the next full configuration of that project is incremental.
+
+A CMake build tree cannot move, so a build cannot adopt this tree.
+Instead, a build of the same sources, with the same settings and
+dependencies, seeds its configuration with the probe results of this tree
+(see :mod:`autorecipes.probes`).
+An index maps a hash of the sources to the tree that last configured them.
+"""
+
+import contextlib
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import typing as t
+
+from autorecipes.cache import Digest, default_directory
+
+# Bump this whenever the shape of a record changes.
+RECORD_VERSION = 1
+
+# The name of the file in each tree that records what it configured.
+RECORD = 'autorecipes.json'
+
+# Environment variables that choose the compiler or generator.
+# A tree configured with other values cannot be reused.
+ENVIRONMENT = (
+    'CC',
+    'CXX',
+    'CFLAGS',
+    'CXXFLAGS',
+    'CPPFLAGS',
+    'LDFLAGS',
+    'CONAN_CMAKE_GENERATOR',
+)
+
+
+def _environment(digest: Digest) -> Digest:
+    for name in ENVIRONMENT:
+        digest.add(f'{name}={os.environ.get(name, "")}')
+    return digest
+
+
+def sources_key(source_dir: Path, inputs: t.Iterable[Path]) -> str:
+    """Return a hash of the CMake inputs of a project and the environment."""
+    digest = _environment(Digest('step1-sources'))
+    for path in inputs:
+        digest.add_file(path, path.relative_to(source_dir).as_posix())
+    return digest.hexdigest()
+
+
+def tree(source_dir: Path) -> t.Optional[Path]:
+    """Return the persistent tree for a source directory, if caching."""
+    directory = default_directory()
+    if directory is None:
+        return None
+    digest = _environment(Digest('step1-tree', str(source_dir.resolve())))
+    return directory / 'configure' / digest.hexdigest()[:32]
+
+
+def _lock(path: Path) -> t.Optional[t.IO[str]]:
+    """Try to lock a directory exclusively, without waiting.
+
+    Return an open file that holds the lock until it is closed,
+    or ``None`` if the directory is busy or cannot be locked.
+    """
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+        f = open(path / '.lock', 'w')
+    except OSError:
+        return None
+    try:
+        if sys.platform == 'win32':
+            import msvcrt
+            # Lock the first byte, which need not exist.
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+@contextlib.contextmanager
+def acquire(source_dir: Path) -> t.Iterator[str]:
+    """Yield a directory for the first step of a configuration.
+
+    It is the persistent tree for the source directory,
+    or a temporary directory if that tree is unavailable or busy.
+    """
+    path = tree(source_dir)
+    lock = None if path is None else _lock(path)
+    if path is None or lock is None:
+        with tempfile.TemporaryDirectory() as directory:
+            yield directory
+        return
+    try:
+        # Leftovers of an earlier ``conan install`` would lie about
+        # the settings of this configuration.
+        for name in (RECORD, 'conaninfo.txt'):
+            with contextlib.suppress(FileNotFoundError):
+                (path / name).unlink()
+        yield str(path)
+    finally:
+        # Closing the file releases the lock.
+        lock.close()
+
+
+def record(directory: str, key: str) -> None:
+    """Record that a tree configured the sources with some key."""
+    path = Path(directory)
+    cache = default_directory()
+    if cache is None or path.parent != cache / 'configure':
+        # A temporary directory.
+        return
+    index = cache / 'configure' / 'index' / key[:2] / key
+    try:
+        with open(path / RECORD, 'w') as f:
+            json.dump({'version': RECORD_VERSION, 'key': key}, f)
+        index.parent.mkdir(parents=True, exist_ok=True)
+        index.write_text(str(path))
+    except OSError:
+        # The tree is only an optimization.
+        pass
+
+
+def find(key: str) -> t.Optional[Path]:
+    """Return the tree that last configured the sources with some key."""
+    directory = default_directory()
+    if directory is None:
+        return None
+    index = directory / 'configure' / 'index' / key[:2] / key
+    try:
+        path = Path(index.read_text())
+        with open(path / RECORD, 'r') as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # The tree may have configured other sources since.
+    if document.get('version') != RECORD_VERSION or document.get('key') != key:
+        return None
+    return path
+
+
+def read_conaninfo(path: Path) -> t.Dict[str, t.List[str]]:
+    """Return the lines of each section of a ``conaninfo.txt``."""
+    sections: t.Dict[str, t.List[str]] = {}
+    lines: t.List[str] = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('[') and line.endswith(']'):
+                lines = sections.setdefault(line[1:-1], [])
+            elif line:
+                lines.append(line)
+    return sections
+
+
+def configuration(path: Path) -> t.Optional[t.Tuple[t.Dict[str, str], t.Set[str]]]:
+    """Return the settings and requirements that configured a tree.
+
+    Settings exclude ``build_type``, which does not change probe results.
+    Requirements are references without revisions or package IDs,
+    e.g. ``zlib/1.2.11``.
+    Return ``None`` if they are unknown, i.e. Conan did not install anything.
+    """
+    try:
+        sections = read_conaninfo(path / 'conaninfo.txt')
+    except OSError:
+        return None
+    settings = dict(
+        line.split('=', 1) for line in sections.get('settings', [])
+        if '=' in line
+    )
+    settings.pop('build_type', None)
+    requires = {
+        line.split(':', 1)[0].split('@', 1)[0].split('#', 1)[0]
+        for line in sections.get('full_requires', [])
+    }
+    return settings, requires
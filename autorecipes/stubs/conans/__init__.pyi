@@ -6,17 +6,29 @@ class ConanFile:
     build_requires: t.Iterable[str]
     generators: t.Iterable[str]
     requires: t.Iterable[str]
+    # Conan gives these to an instance that it constructs.
+    source_folder: str
+    export_folder: str
+    recipe_folder: str
+    package_folder: str
+    settings: t.Any
+    options: t.Any
+    deps_cpp_info: t.Any
+    cpp_info: t.Any
+    output: t.Any
 
 
 class CMake:
 
-    def __init__(self, recipe: ConanFile):
+    def __init__(self, recipe: ConanFile, generator: t.Optional[str] = None):
         ...
 
     definitions: t.MutableMapping[str, str]
+    generator: str
+    parallel: bool
 
-    def configure(self):
+    def configure(self, args: t.Optional[t.Sequence[str]] = None):
         ...
 
-    def build(self):
+    def build(self, args: t.Optional[t.Sequence[str]] = None):
         ...
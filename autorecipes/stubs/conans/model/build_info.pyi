@@ -0,0 +1,20 @@
+import typing as t
+
+
+class CppInfo:
+
+    def __init__(self, ref_name: str, root_folder: str):
+        ...
+
+    includedirs: t.List[str]
+    libdirs: t.List[str]
+    bindirs: t.List[str]
+    libs: t.List[str]
+    defines: t.List[str]
+    system_libs: t.List[str]
+    components: t.Dict[str, t.Any]
+
+    def _raise_incorrect_components_definition(
+        self, package_name: str, package_requires: t.Any
+    ) -> None:
+        ...
@@ -0,0 +1,13 @@
+import typing as t
+
+
+class Requirement:
+
+    private: bool
+    override: bool
+
+
+class Requirements(t.Dict[str, Requirement]):
+
+    def __init__(self, *args: str):
+        ...
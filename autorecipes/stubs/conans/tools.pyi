@@ -0,0 +1,7 @@
+import typing as t
+
+
+def environment_append(
+    env_vars: t.Mapping[str, t.Union[str, t.List[str], None]]
+) -> t.ContextManager[None]:
+    ...
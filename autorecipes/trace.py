@@ -0,0 +1,132 @@
+"""Timeline tracing of recipe evaluation.
+
+Set the environment variable ``AUTORECIPES_TRACE`` to a file path,
+and every span recorded here, including every subprocess we start,
+is written to that file when the process exits,
+in the `Chrome trace event format`__ that Perfetto_ and
+``chrome://tracing`` understand.
+The string ``{pid}`` in the path is replaced by the process ID,
+so that concurrent processes do not overwrite each other.
+
+When the variable is unset, spans cost one dictionary lookup.
+
+.. __: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU/
+.. _Perfetto: https://ui.perfetto.dev/
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import subprocess as sp
+import threading
+import time
+import typing as t
+
+ENVIRONMENT_VARIABLE = 'AUTORECIPES_TRACE'
+
+# Chrome expects timestamps in microseconds. We want the precision of
+# :func:`time.perf_counter` but timestamps comparable across processes.
+_ORIGIN = time.time() - time.perf_counter()
+
+_events: t.List[t.Dict[str, t.Any]] = []
+_lock = threading.Lock()
+_registered = False
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(ENVIRONMENT_VARIABLE))
+
+
+def _now() -> float:
+    return (_ORIGIN + time.perf_counter()) * 1e6
+
+
+def _record(event: t.Dict[str, t.Any]) -> None:
+    global _registered  # pylint: disable=global-statement
+    with _lock:
+        _events.append(event)
+        if not _registered:
+            atexit.register(write)
+            _registered = True
+
+
+def write(path: t.Optional[str] = None) -> None:
+    """Write every recorded span to a file."""
+    if path is None:
+        path = os.environ.get(ENVIRONMENT_VARIABLE)
+        if not path:
+            return
+    with _lock:
+        events = list(_events)
+    pid = os.getpid()
+    events.append({
+        'name': 'process_name',
+        'ph': 'M',
+        'pid': pid,
+        'args': {'name': f'autorecipes {pid}'},
+    })
+    with open(path.replace('{pid}', str(pid)), 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = 'autorecipes',
+         **args: t.Any) -> t.Iterator[t.Dict[str, t.Any]]:
+    """Record the duration of a block of code.
+
+    The context value is the dictionary of arguments for the span,
+    which the block may extend (for example, with a result).
+    """
+    if not enabled():
+        yield args
+        return
+    start = _now()
+    try:
+        yield args
+    except BaseException as error:
+        args['error'] = repr(error)
+        raise
+    finally:
+        _record({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start,
+            'dur': _now() - start,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': {key: _jsonable(value) for key, value in args.items()},
+        })
+
+
+def _jsonable(value: t.Any) -> t.Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return str(value)
+
+
+def traced(name: t.Optional[str] = None, category: str = 'autorecipes'):
+    """Decorate a function to record a span for each call."""
+
+    def decorator(f):
+
+        @functools.wraps(f)
+        def decorated(*args, **kwargs):
+            with span(name or f.__qualname__, category):
+                return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
+
+
+def run(args: t.Sequence[str], **kwargs: t.Any) -> sp.CompletedProcess:
+    """Trace a call to :func:`subprocess.run`."""
+    with span(args[0], 'subprocess', args=args, cwd=kwargs.get('cwd')) as s:
+        process = sp.run(args, **kwargs)
+        s['returncode'] = process.returncode
+        return process
@@ -0,0 +1,388 @@
+"""Benchmarks for resolving recipe metadata.
+
+Run from the root of the repository::
+
+    python benchmarks/bench.py                  # with stand-in tools
+    python benchmarks/bench.py --mode real      # with cmake, conan and git
+    python benchmarks/bench.py --save-baseline  # remember these results
+    python benchmarks/bench.py --check          # fail if slower than baseline
+
+Each case runs in a fresh interpreter, so that no in-process cache survives.
+A *cold* run starts with an empty on-disk cache (and, for ``package_info``,
+a package without a manifest); a *warm* run follows a cold run and reuses
+whatever it left behind. Only the work after importing :mod:`autorecipes`
+is timed, except in the ``import`` cases, which time only the import.
+We report the median of several repetitions.
+
+Every run is appended to ``.benchmarks/history.jsonl``,
+and a baseline is kept per mode in ``.benchmarks/baseline-<mode>.json``.
+Neither is tracked: timings are comparable only on the machine that took
+them, so save a baseline before changing the code, then ``--check`` after.
+"""
+
+import argparse
+import datetime
+import json
+import os
+from pathlib import Path
+import shutil
+import statistics
+import subprocess as sp
+import sys
+import tempfile
+import time
+import typing as t
+
+ROOT = Path(__file__).resolve().parent.parent
+STANDIN = Path(__file__).resolve().parent / 'standin.py'
+RESULTS = ROOT / '.benchmarks'
+
+CMAKE_ATTRIBUTES = (
+    'name',
+    'version',
+    'description',
+    'homepage',
+    'url',
+    'license',
+    'author',
+    'requires',
+    'build_requires',
+    'generators',
+)
+PYTHON_ATTRIBUTES = (
+    'name',
+    'version',
+    'description',
+    'homepage',
+    'url',
+    'license',
+    'author',
+)
+
+# name: (project, what is measured)
+CASES = {
+    'cmake.attributes.static': ('cmake-static', 'attributes'),
+    'cmake.attributes.configure': ('cmake-computed', 'attributes'),
+    'cmake.exports': ('cmake-computed', 'exports'),
+    'cmake.package_info': ('cmake-computed', 'package_info'),
+    'python.attributes': ('python', 'attributes'),
+    'python.exports': ('python', 'exports'),
+    # Conan has already imported itself when it loads our package.
+    'cmake.import': ('cmake-static', 'import'),
+    'python.import': ('python', 'import'),
+}
+
+# The number of source files in the CMake projects, for ``exports``.
+SOURCE_FILES = 2000
+
+VARIABLES = {
+    'CMAKE_PROJECT_NAME': 'bench',
+    'CMAKE_PROJECT_VERSION': '1.2.3',
+    'CMAKE_PROJECT_DESCRIPTION': 'A benchmark project',
+    'CMAKE_PROJECT_HOMEPAGE_URL': 'https://example.com/',
+}
+
+PACKAGE_CONFIG = '''\
+set(bench_COMPONENTS core util)
+foreach(component ${bench_COMPONENTS})
+  add_library(bench::${component} STATIC IMPORTED)
+  set_target_properties(bench::${component} PROPERTIES
+    IMPORTED_CONFIGURATIONS RELEASE
+    IMPORTED_LOCATION_RELEASE "${CMAKE_CURRENT_LIST_DIR}/../../lib${component}.a"
+    INTERFACE_INCLUDE_DIRECTORIES "${CMAKE_CURRENT_LIST_DIR}/../../../include"
+  )
+endforeach()
+set_target_properties(bench::util PROPERTIES
+  INTERFACE_LINK_LIBRARIES bench::core
+)
+'''
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_projects(root: Path, git: t.Optional[str]) -> None:
+    """Create the projects that the cases measure."""
+    static = root / 'cmake-static'
+    write(
+        static / 'CMakeLists.txt',
+        'cmake_minimum_required(VERSION 3.12)\n'
+        'project(bench VERSION 1.2.3 DESCRIPTION "A benchmark project"\n'
+        '  HOMEPAGE_URL https://example.com/ LANGUAGES CXX)\n'
+    )
+    write(static / 'standin.json', json.dumps(VARIABLES))
+
+    computed = root / 'cmake-computed'
+    write(
+        computed / 'CMakeLists.txt',
+        'cmake_minimum_required(VERSION 3.12)\n'
+        'include(cmake/version.cmake)\n'
+        'project(bench VERSION ${BENCH_VERSION}\n'
+        '  DESCRIPTION "A benchmark project"\n'
+        '  HOMEPAGE_URL https://example.com/ LANGUAGES CXX)\n'
+    )
+    write(computed / 'cmake' / 'version.cmake', 'set(BENCH_VERSION 1.2.3)\n')
+    write(computed / 'conanfile.txt', '[generators]\ncmake_paths\n')
+    write(computed / 'standin.json', json.dumps(VARIABLES))
+    for i in range(SOURCE_FILES):
+        write(computed / 'src' / f'dir{i // 100}' / f'file{i}.cpp', '')
+
+    package = root / 'package'
+    write(package / 'lib' / 'cmake' / 'bench' / 'bench-config.cmake',
+          PACKAGE_CONFIG)
+    write(package / 'lib' / 'libcore.a', '')
+    write(package / 'lib' / 'libutil.a', '')
+    write(package / 'include' / 'bench.hpp', '')
+
+    python = root / 'python'
+    write(
+        python / 'pyproject.toml',
+        '[tool.poetry]\n'
+        'name = "bench"\n'
+        'version = "1.2.3"\n'
+        'description = "A benchmark project"\n'
+        'authors = ["A. Author <author@example.com>"]\n'
+        'documentation = "https://example.com/"\n'
+        'repository = "https://example.com/bench/"\n'
+        'license = "ISC"\n'
+        'packages = [{ include = "bench" }]\n\n'
+        '[tool.poetry.dependencies]\n'
+        'python = "^3.6"\n\n'
+        '[build-system]\n'
+        'requires = ["poetry>=0.12"]\n'
+        'build-backend = "poetry.masonry.api"\n'
+    )
+    for i in range(200):
+        write(python / 'bench' / f'module{i}.py', '')
+    write(python / 'bench' / 'data' / 'table.csv', '')
+
+    if git is not None:
+        for project in (static, computed, python):
+            sp.run([git, 'init', '-q'], cwd=str(project), check=True)
+            sp.run([git, 'add', '.'], cwd=str(project), check=True)
+
+
+def make_standins(bin_dir: Path) -> None:
+    """Write a wrapper for each stand-in tool."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for tool in ('cmake', 'conan', 'git'):
+        if os.name == 'nt':
+            path = bin_dir / f'{tool}.bat'
+            path.write_text(
+                f'@"{sys.executable}" "{STANDIN}" {tool} %*\n'
+            )
+        else:
+            path = bin_dir / tool
+            path.write_text(
+                '#!/bin/sh\n'
+                f'exec "{sys.executable}" "{STANDIN}" {tool} "$@"\n'
+            )
+            path.chmod(0o755)
+
+
+def worker(case: str, package_dir: str, warm: bool) -> None:
+    """Measure one case in this process, and print the result."""
+    sys.path.insert(0, str(ROOT))
+    flavor, what = case.split('.')[:2]
+    if what == 'import':
+        import conans.client.tools, conans.model.build_info  # pylint: disable=import-outside-toplevel,unused-import,multiple-imports
+        name = 'CMakeConanFile' if flavor == 'cmake' else 'PythonConanFile'
+        start = time.perf_counter()
+        import autorecipes  # pylint: disable=import-outside-toplevel
+        getattr(autorecipes, name)
+        seconds = time.perf_counter() - start
+        print(json.dumps({'seconds': seconds}))
+        return
+    # Import outside of the measurement.
+    if flavor == 'cmake':
+        from autorecipes.cmake import CMakeConanFile as Base, MANIFEST_PATH  # pylint: disable=import-outside-toplevel
+        from conans.client.output import ConanOutput  # pylint: disable=import-outside-toplevel
+        from conans.model.build_info import CppInfo  # pylint: disable=import-outside-toplevel
+        attributes = CMAKE_ATTRIBUTES
+    else:
+        from autorecipes.python import PythonConanFile as Base  # pylint: disable=import-outside-toplevel
+        attributes = PYTHON_ATTRIBUTES
+
+    class Recipe(Base):  # pylint: disable=too-few-public-methods
+        pass
+
+    if what == 'package_info':
+        recipe = Recipe(ConanOutput(sys.stderr), None, 'bench')
+        if hasattr(recipe, 'folders'):
+            recipe.folders.set_base_package(package_dir)
+        else:
+            recipe.package_folder = package_dir
+        recipe.cpp_info = CppInfo('bench', package_dir)
+        # Resolve the name outside of the measurement.
+        getattr(Recipe, 'name')
+        manifest = Path(package_dir) / MANIFEST_PATH
+        if manifest.exists():
+            manifest.unlink()
+        if warm:
+            # Leave a manifest as ``package()`` would have.
+            with tempfile.TemporaryDirectory() as build_dir:
+                generated = recipe._introspect(Path(build_dir))  # pylint: disable=protected-access
+                manifest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(str(generated), str(manifest))
+
+    start = time.perf_counter()
+    if what == 'attributes':
+        for attribute in attributes:
+            getattr(Recipe, attribute)
+    elif what == 'exports':
+        list(Recipe.exports)
+    elif what == 'package_info':
+        recipe.package_info()
+    seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds}))
+
+
+def measure(
+    case: str,
+    root: Path,
+    env: t.Mapping[str, str],
+    repeat: int,
+) -> t.Dict[str, float]:
+    project, _ = CASES[case]
+    samples: t.Dict[str, t.List[float]] = {'cold': [], 'warm': []}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for temperature in ('cold', 'warm'):
+                output = sp.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        '--worker',
+                        case,
+                        '--package-dir',
+                        str(root / 'package'),
+                        *(['--warm'] if temperature == 'warm' else []),
+                    ],
+                    cwd=str(root / project),
+                    env={**env, 'AUTORECIPES_CACHE_DIR': cache_dir},
+                    stdout=sp.PIPE,
+                    check=True,
+                ).stdout
+                samples[temperature].append(
+                    json.loads(output.decode().splitlines()[-1])['seconds']
+                )
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def regressions(
+    results: t.Mapping[str, t.Mapping[str, float]],
+    baseline: t.Mapping[str, t.Mapping[str, float]],
+    tolerance: float,
+    slack: float,
+) -> t.List[str]:
+    """Return a description of every result slower than its baseline."""
+    failures = []
+    for case, temperatures in results.items():
+        for temperature, seconds in temperatures.items():
+            expected = baseline.get(case, {}).get(temperature)
+            if expected is None:
+                continue
+            limit = expected * (1 + tolerance) + slack
+            if seconds > limit:
+                failures.append(
+                    f'{case} ({temperature}): {seconds * 1000:.1f} ms > '
+                    f'{limit * 1000:.1f} ms'
+                )
+    return failures
+
+
+def git_revision() -> t.Optional[str]:
+    try:
+        return sp.check_output(['git', 'rev-parse', 'HEAD'],
+                               cwd=str(ROOT)).decode().strip()
+    except (OSError, sp.CalledProcessError):
+        return None
+
+
+def main(argv: t.Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=('standin', 'real'),
+                        default='standin')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=0.25,
+                        help='scale the delays of the stand-in tools')
+    parser.add_argument('--case', action='append', choices=sorted(CASES))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown, as a fraction of the baseline')
+    parser.add_argument('--slack', type=float, default=0.005,
+                        help='allowed slowdown, in seconds')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--package-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--warm', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args.worker, args.package_dir, args.warm)
+        return 0
+
+    real_git = shutil.which('git')
+    env = dict(os.environ)
+    env.pop('AUTORECIPES_TRACE', None)
+    if args.mode == 'real':
+        missing = [
+            tool for tool in ('cmake', 'conan', 'git')
+            if shutil.which(tool) is None
+        ]
+        if missing:
+            print(f'missing tools: {", ".join(missing)}', file=sys.stderr)
+            return 2
+
+    with tempfile.TemporaryDirectory() as root:
+        root_path = Path(root)
+        make_projects(root_path, real_git)
+        if args.mode == 'standin':
+            bin_dir = root_path / 'bin'
+            make_standins(bin_dir)
+            env['PATH'] = str(bin_dir) + os.pathsep + env.get('PATH', '')
+            env['AUTORECIPES_STANDIN_SCALE'] = str(args.scale)
+        results = {}
+        for case in args.case or CASES:
+            results[case] = measure(case, root_path, env, args.repeat)
+            print(
+                f'{case:30}'
+                f'  cold {results[case]["cold"] * 1000:9.1f} ms'
+                f'  warm {results[case]["warm"] * 1000:9.1f} ms'
+            )
+
+    RESULTS.mkdir(exist_ok=True)
+    record = {
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'mode': args.mode,
+        'scale': args.scale if args.mode == 'standin' else None,
+        'python': sys.version.split()[0],
+        'results': results,
+    }
+    with open(RESULTS / 'history.jsonl', 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+    baseline_path = RESULTS / f'baseline-{args.mode}.json'
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + '\n')
+    if args.check:
+        if not baseline_path.exists():
+            print(
+                f'no baseline: {baseline_path} (run with --save-baseline)',
+                file=sys.stderr,
+            )
+            return 2
+        baseline = json.loads(baseline_path.read_text())
+        failures = regressions(results, baseline, args.tolerance, args.slack)
+        for failure in failures:
+            print(f'slower than baseline: {failure}', file=sys.stderr)
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Deterministic stand-ins for ``cmake``, ``conan`` and ``git``.
+
+The benchmark puts wrappers named after each tool on the ``PATH``,
+and they call this script with the name of the tool as the first argument.
+Each stand-in sleeps for a fixed, realistic delay and then writes exactly the
+files that the recipes read, so that the cost of our own code is measured
+against a stable background. ``AUTORECIPES_STANDIN_SCALE`` scales every
+delay.
+
+A project that wants to be configured by the stand-in ``cmake`` must have a
+``standin.json`` with the cache variables that a real configure would write.
+"""
+
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+# In seconds, at a scale of 1.
+DELAYS = {
+    'conan install': 0.8,
+    # Compiler detection and feature probes dominate a real configure.
+    'cmake configure': 1.2,
+    # Stopping after ``project()`` skips all of that.
+    'cmake metadata': 0.05,
+    # Our helper projects enable no languages.
+    'cmake helper': 0.15,
+    'cmake build': 0.1,
+    'git ls-files': 0.05,
+}
+
+CMAKE_VERSION = '3.25.1'
+
+
+def delay(what):
+    scale = float(os.environ.get('AUTORECIPES_STANDIN_SCALE', '1'))
+    time.sleep(DELAYS[what] * scale)
+
+
+def conan(args):
+    if args[:1] != ['install']:
+        print(f'stand-in conan: unsupported: {args}', file=sys.stderr)
+        return 1
+    delay('conan install')
+    Path('conan_paths.cmake').write_text('# stand-in\n')
+    return 0
+
+
+def read_cache(path):
+    variables = {}
+    for line in path.read_text().splitlines():
+        if line.startswith(('#', '//')) or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        variables[key.split(':', 1)[0]] = value
+    return variables
+
+
+def write_cache(path, variables):
+    lines = [f'{key}:STATIC={value}\n' for key, value in variables.items()]
+    path.write_text('# stand-in\n' + ''.join(lines))
+
+
+def cmake(args):
+    if args == ['--version']:
+        print(f'cmake version {CMAKE_VERSION}')
+        return 0
+    if args[:1] in (['--build'], ['--install']):
+        delay('cmake build')
+        return 0
+    defines = {}
+    sources = []
+    operand = False
+    for arg in args:
+        if operand:
+            operand = False
+        elif arg == '-U':
+            operand = True
+        elif arg.startswith('-D'):
+            key, _, value = arg[2:].partition('=')
+            defines[key.split(':', 1)[0]] = value
+        elif not arg.startswith('-'):
+            sources.append(arg)
+    source_dir = Path(sources[-1])
+    standin = source_dir / 'standin.json'
+    if standin.is_file() and 'CMAKE_PROJECT_INCLUDE' in defines:
+        delay('cmake metadata')
+        variables = json.loads(standin.read_text())
+        version = int(defines['AUTORECIPES_FORMAT_VERSION'])
+        document = {'version': version, 'variables': variables}
+        Path('attributes.json').write_text(json.dumps(document))
+        print('CMake Error: stopped after project()', file=sys.stderr)
+        return 1
+    if standin.is_file():
+        delay('cmake configure')
+        variables = json.loads(standin.read_text())
+        write_cache(Path('CMakeCache.txt'), variables)
+        return 0
+    delay('cmake helper')
+    version = int(defines.get('FORMAT_VERSION', '1'))
+    if source_dir.name == 'configure':
+        variables = read_cache(Path(defines['STEP1_DIR']) / 'CMakeCache.txt')
+        document = {'version': version, 'variables': variables}
+        Path('attributes.json').write_text(json.dumps(document))
+        return 0
+    if source_dir.name == 'install':
+        document = {
+            'version': version,
+            'package': defines['PACKAGE_NAME'],
+            'components': {
+                'core': {
+                    'type': 'STATIC_LIBRARY',
+                    'includedirs': ['include'],
+                    'locations': {'RELEASE': 'lib/libcore.a'},
+                },
+                'util': {
+                    'type': 'STATIC_LIBRARY',
+                    'includedirs': ['include'],
+                    'dependencies': [f"{defines['PACKAGE_NAME']}::core"],
+                    'locations': {'RELEASE': 'lib/libutil.a'},
+                },
+            },
+        }
+        Path('cpp_info.json').write_text(json.dumps(document))
+        return 0
+    print(f'stand-in cmake: unknown project: {source_dir}', file=sys.stderr)
+    return 1
+
+
+def git(args):
+    if 'ls-files' not in args:
+        print(f'stand-in git: unsupported: {args}', file=sys.stderr)
+        return 1
+    delay('git ls-files')
+    separator = '\0' if '-z' in args else '\n'
+    for root, dirs, files in os.walk('.'):
+        dirs[:] = sorted(d for d in dirs if d != '.git')
+        for name in sorted(files):
+            path = os.path.relpath(os.path.join(root, name), '.')
+            sys.stdout.write(path.replace(os.sep, '/') + separator)
+    return 0
+
+
+TOOLS = {'cmake': cmake, 'conan': conan, 'git': git}
+
+if __name__ == '__main__':
+    sys.exit(TOOLS[sys.argv[1]](sys.argv[2:]))
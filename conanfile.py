@@ -1,8 +1,7 @@
-import subprocess as sp
-
 from conans import ConanFile
 
 import autorecipes
+from autorecipes import gitindex
 from autorecipes.descriptors import cached_classproperty
 
 
@@ -17,7 +16,7 @@ class Recipe(ConanFile):
 
     @cached_classproperty
     def exports(cls):
-        return sp.check_output(['git', 'ls-files']).decode().strip().split()
+        return gitindex.ls_files()
 
     no_copy_source = True
 
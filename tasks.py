@@ -39,3 +39,9 @@ def serve(c):
     c.run('sphinx-autobuild docs docs/_build/html --host 0.0.0.0 --watch .',
           echo=True,
           pty=pty)
+
+
+@task
+def bench(c, mode='standin', check=False):
+    flags = ' --check' if check else ''
+    c.run(f'python benchmarks/bench.py --mode {mode}{flags}', echo=True, pty=pty)
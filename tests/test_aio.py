@@ -0,0 +1,187 @@
+# pylint: disable=missing-docstring
+
+import asyncio
+import os
+import shutil
+import subprocess as sp
+import sys
+import threading
+
+import pytest
+
+from autorecipes import aio, commands, gitindex
+from autorecipes.cmake import CMakeConanFile
+
+
+def sleeper(seconds):
+    return [sys.executable, '-c', f'import time; time.sleep({seconds})']
+
+
+def steps(seconds):
+    """Run a command that fails, then one that succeeds."""
+    code = None
+    try:
+        yield commands.Command(
+            [sys.executable, '-c', 'raise SystemExit(3)'], check=True
+        )
+    except sp.CalledProcessError as error:
+        code = error.returncode
+    yield commands.Command(sleeper(seconds))
+    output = yield from commands.check_output(
+        [sys.executable, '-c', 'print("done")']
+    )
+    return code, output.strip()
+
+
+def test_drive_matches_run():
+    expected = (3, b'done')
+    assert commands.run(steps(0)) == expected
+    assert asyncio.run(aio.drive(steps(0))) == expected
+
+
+def test_missing_program():
+
+    def missing():
+        try:
+            yield commands.Command(['autorecipes-no-such-program'])
+        except OSError:
+            return 'missing'
+
+    assert commands.run(missing()) == 'missing'
+    assert asyncio.run(aio.drive(missing())) == 'missing'
+
+
+@pytest.mark.parametrize('limit', [1, 3])
+def test_concurrency(monkeypatch, limit):
+    running = 0
+    peak = 0
+    create = asyncio.create_subprocess_exec
+
+    async def counting(*args, **kwargs):
+        nonlocal running, peak
+        process = await create(*args, **kwargs)
+        running += 1
+        peak = max(peak, running)
+        communicate = process.communicate
+
+        async def counted():
+            nonlocal running
+            try:
+                return await communicate()
+            finally:
+                running -= 1
+
+        process.communicate = counted
+        return process
+
+    monkeypatch.setattr(asyncio, 'create_subprocess_exec', counting)
+
+    def sleep():
+        yield commands.Command(sleeper(0.2))
+
+    async def main():
+        await asyncio.gather(*(aio.drive(sleep()) for _ in range(6)))
+
+    aio.set_concurrency(limit)
+    try:
+        asyncio.run(main())
+    finally:
+        aio.set_concurrency(None)
+    assert peak == limit
+    assert running == 0
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='needs POSIX signals')
+def test_cancel_kills_process(tmp_path):
+    pid_path = tmp_path / 'pid'
+    released = []
+
+    def sleep():
+        try:
+            yield commands.Command([
+                sys.executable, '-c',
+                'import os, time\n'
+                f'open({str(pid_path)!r}, "w").write(str(os.getpid()))\n'
+                'time.sleep(30)\n'
+            ])
+        finally:
+            released.append(True)
+
+    async def main():
+        task = asyncio.ensure_future(aio.drive(sleep()))
+        while not pid_path.exists() or not pid_path.read_text():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert released == [True]
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_path.read_text()), 0)
+
+
+
+def test_cancel_while_advancing():
+    started = threading.Event()
+    proceed = threading.Event()
+    released = []
+
+    def work():
+        try:
+            started.set()
+            # Block in the executor, where cancellation cannot reach.
+            proceed.wait(10)
+            yield commands.Command(sleeper(0))
+        finally:
+            released.append(True)
+
+    # Hold the steps, so that only the driver can close them.
+    generator = work()
+
+    async def main():
+        task = asyncio.ensure_future(aio.drive(generator))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        proceed.set()
+        for _ in range(500):
+            if released:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert released == [True]
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='needs Git')
+def test_exports(tmp_path, monkeypatch):
+    sp.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+    (tmp_path / 'a.txt').write_text('a')
+    sp.run(['git', 'add', 'a.txt'], cwd=tmp_path, check=True)
+    assert asyncio.run(aio.exports(tmp_path)) == ['a.txt']
+    # The fallback runs ``git ls-files`` in a subprocess.
+    monkeypatch.setenv('GIT_INDEX_FILE', str(tmp_path / '.git' / 'index'))
+    assert asyncio.run(aio.exports(tmp_path)) == gitindex.ls_files(tmp_path)
+
+
+@pytest.mark.skipif(shutil.which('cmake') is None, reason='needs CMake')
+def test_attributes(tmp_path, monkeypatch):
+    monkeypatch.setenv('AUTORECIPES_CACHE_DIR', str(tmp_path / 'cache'))
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    (source_dir / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'set(version 1.2.3)\n'
+        'project(demo VERSION ${version} LANGUAGES CXX)\n'
+    )
+
+    class Recipe(CMakeConanFile):
+        pass
+
+    attrs = asyncio.run(aio.attributes(Recipe, source_dir))
+    assert attrs['name'] == 'demo'
+    assert attrs['version'] == '1.2.3'
+    with pytest.raises(TypeError):
+        asyncio.run(aio.attributes(object, source_dir))
@@ -0,0 +1,75 @@
+# pylint: disable=missing-docstring
+
+import pytest
+
+from autorecipes import build
+
+
+def test_jobs(monkeypatch):
+    monkeypatch.delenv('AUTORECIPES_JOBS', raising=False)
+    monkeypatch.setattr(build, 'cpu_count', lambda: 16)
+    monkeypatch.setattr(build, 'memory_available', lambda: 4 << 30)
+    assert build.jobs() == 4
+    monkeypatch.setattr(build, 'memory_available', lambda: 100 << 30)
+    assert build.jobs() == 16
+    monkeypatch.setattr(build, 'memory_available', lambda: 0)
+    assert build.jobs() == 1
+    monkeypatch.setattr(build, 'memory_available', lambda: None)
+    assert build.jobs() == 16
+    monkeypatch.setenv('AUTORECIPES_JOBS', '3')
+    assert build.jobs() == 3
+    # Anything but a positive integer falls back to the default.
+    for value in ('', 'four', '0', '-2', '2.5', '²'):
+        monkeypatch.setenv('AUTORECIPES_JOBS', value)
+        assert build.jobs() == 16
+
+
+@pytest.mark.parametrize(
+    'generator,args',
+    [
+        ('Ninja', ['--', '-j4']),
+        ('Unix Makefiles', ['--', '-j4']),
+        ('NMake Makefiles', []),
+        ('Visual Studio 16 2019', []),
+        (None, []),
+    ],
+)
+def test_parallel_args(generator, args):
+    assert build.parallel_args(generator, 4) == args
+
+
+def test_generator(monkeypatch):
+    monkeypatch.delenv('CONAN_CMAKE_GENERATOR', raising=False)
+    monkeypatch.setattr(build.shutil, 'which', lambda name: f'/bin/{name}')
+    assert build.generator('gcc') == 'Ninja'
+    assert build.generator('Visual Studio') is None
+    monkeypatch.setenv('CONAN_CMAKE_GENERATOR', 'Unix Makefiles')
+    assert build.generator('gcc') is None
+
+
+def test_launcher(monkeypatch):
+    monkeypatch.delenv('AUTORECIPES_COMPILER_LAUNCHER', raising=False)
+    monkeypatch.delenv('CMAKE_C_COMPILER_LAUNCHER', raising=False)
+    monkeypatch.setenv('CMAKE_CXX_COMPILER_LAUNCHER', 'distcc')
+    monkeypatch.setattr(
+        build.shutil,
+        'which',
+        lambda name: '/usr/bin/sccache' if name == 'sccache' else None,
+    )
+    assert build.launcher() == '/usr/bin/sccache'
+    assert build.launcher_definitions('/usr/bin/sccache') == {
+        'CMAKE_C_COMPILER_LAUNCHER': '/usr/bin/sccache',
+    }
+    monkeypatch.setenv('AUTORECIPES_COMPILER_LAUNCHER', '')
+    assert build.launcher() is None
+    assert build.launcher_definitions(None) == {}
+
+
+def test_launcher_environment(monkeypatch):
+    monkeypatch.delenv('CCACHE_BASEDIR', raising=False)
+    folders = ('/conan/data/p/source', '/conan/data/p/build/1234')
+    assert build.launcher_environment('/usr/bin/ccache', *folders) == {
+        'CCACHE_BASEDIR': '/conan/data/p',
+    }
+    assert build.launcher_environment('/usr/bin/sccache', *folders) == {}
+    assert build.launcher_environment('/usr/bin/ccache', '/a', '/b') == {}
@@ -0,0 +1,34 @@
+# pylint: disable=missing-docstring
+
+from autorecipes.cache import Cache, Digest
+
+
+def test_cache_round_trip(tmp_path):
+    cache = Cache(tmp_path)
+    assert cache.get('namespace', 'abcdef') is None
+    cache.put('namespace', 'abcdef', {'name': 'project_name'})
+    assert cache.get('namespace', 'abcdef') == {'name': 'project_name'}
+    assert cache.get('other', 'abcdef') is None
+
+
+def test_disabled_cache():
+    cache = Cache(None)
+    cache.put('namespace', 'abcdef', 1)
+    assert cache.get('namespace', 'abcdef') is None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = Cache(tmp_path)
+    path = cache.path('namespace', 'abcdef')
+    path.parent.mkdir(parents=True)
+    path.write_text('{')
+    assert cache.get('namespace', 'abcdef') is None
+
+
+def test_digest_separates_parts(tmp_path):
+    assert Digest('ab', 'c').hexdigest() != Digest('a', 'bc').hexdigest()
+    path = tmp_path / 'CMakeLists.txt'
+    missing = Digest().add_file(path, 'CMakeLists.txt').hexdigest()
+    path.write_text('')
+    empty = Digest().add_file(path, 'CMakeLists.txt').hexdigest()
+    assert missing != empty
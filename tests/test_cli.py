@@ -0,0 +1,51 @@
+# pylint: disable=missing-docstring
+
+import json
+import subprocess as sp
+
+from autorecipes import cli
+
+
+def test_main(tmp_path, capsys, monkeypatch):
+    python = tmp_path / 'python'
+    python.mkdir()
+    (python / 'pyproject.toml').write_text(
+        '[tool.poetry]\n'
+        'name = "pyproj"\n'
+        'version = "1.0.0"\n'
+        'license = "ISC"\n'
+        'authors = ["A <a@example.com>", "B <b@example.com>"]\n'
+    )
+    cmake = tmp_path / 'cmake'
+    cmake.mkdir()
+    (cmake / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'project(cmproj VERSION 2.0.0 LANGUAGES CXX)\n'
+    )
+    sp.run(['git', 'init', '-q', str(cmake)], check=True)
+    sp.run(['git', 'add', 'CMakeLists.txt'], cwd=str(cmake), check=True)
+    (tmp_path / 'empty').mkdir()
+
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(['--jobs', '2', 'python', 'cmake', 'empty']) == 1
+    lines = capsys.readouterr().out.splitlines()
+    results = {r['path']: r for r in map(json.loads, lines)}
+    assert len(results) == 3
+    assert all(r['seconds'] >= 0 for r in results.values())
+
+    python = results['python']
+    assert python['kind'] == 'python'
+    assert python['name'] == 'pyproj'
+    assert python['version'] == '1.0.0'
+    assert python['license'] == 'ISC'
+    assert python['author'] == 'A <a@example.com>, B <b@example.com>'
+    assert python['homepage'] is None
+    assert 'error' not in python
+
+    cmake = results['cmake']
+    assert cmake['kind'] == 'cmake'
+    assert cmake['name'] == 'cmproj'
+    assert cmake['version'] == '2.0.0'
+    assert cmake['exports'] == ['CMakeLists.txt']
+
+    assert 'error' in results['empty']
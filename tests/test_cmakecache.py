@@ -0,0 +1,49 @@
+# pylint: disable=missing-docstring
+
+from autorecipes import cmakecache
+
+CACHE = '''\
+# This is the CMakeCache file.
+
+########################
+# EXTERNAL cache entries
+########################
+
+//Choose the type of build, options are: None Debug Release
+// MinSizeRel ...
+CMAKE_BUILD_TYPE:STRING=
+
+//Value Computed by CMake
+CMAKE_PROJECT_NAME:STATIC=demo
+
+CMAKE_PROJECT_DESCRIPTION:STATIC=A demo; with = and : inside
+"QUOTED:NAME":STRING=value
+UNTYPED=value
+TRAILING:STRING='space '
+'''
+
+
+def test_parse():
+    entries = list(cmakecache.parse(CACHE.splitlines()))
+    assert entries[0] == cmakecache.CacheEntry(
+        name='CMAKE_BUILD_TYPE',
+        type='STRING',
+        value='',
+        help='Choose the type of build, options are: None Debug Release\n'
+        ' MinSizeRel ...',
+    )
+    assert entries[1].help == 'Value Computed by CMake'
+    assert entries[2].help == ''
+
+
+def test_read(tmp_path):
+    path = tmp_path / 'CMakeCache.txt'
+    path.write_text(CACHE)
+    assert cmakecache.read(path) == {
+        'CMAKE_BUILD_TYPE': '',
+        'CMAKE_PROJECT_NAME': 'demo',
+        'CMAKE_PROJECT_DESCRIPTION': 'A demo; with = and : inside',
+        'QUOTED:NAME': 'value',
+        'UNTYPED': 'value',
+        'TRAILING': 'space ',
+    }
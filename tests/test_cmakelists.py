@@ -0,0 +1,211 @@
+# pylint: disable=missing-docstring
+
+import pytest
+
+from autorecipes import cmakelists
+from autorecipes.cmakelists import Argument, Unresolvable
+
+
+def interpret(text):
+    return cmakelists.interpret(cmakelists.lex(text))
+
+
+def test_lex():
+    text = '''
+    # A comment.
+    #[[ A bracket
+        comment. ]]
+    Project(name "quoted \\"value\\"" [=[bracket]=] unquoted\\ value
+      (nested) # A comment between arguments.
+    )
+    '''
+    assert list(cmakelists.lex(text)) == [
+        cmakelists.Command(
+            'project', [
+                Argument('unquoted', 'name'),
+                Argument('quoted', 'quoted \\"value\\"'),
+                Argument('bracket', 'bracket'),
+                Argument('unquoted', 'unquoted\\ value'),
+                Argument('unquoted', '('),
+                Argument('unquoted', 'nested'),
+                Argument('unquoted', ')'),
+            ]
+        )
+    ]
+
+
+def test_evaluate():
+    variables = {'A': 'x;y', 'B': 'A'}
+    arguments = [
+        Argument('unquoted', '${A}'),
+        Argument('quoted', '${A}'),
+        Argument('unquoted', '${${B}};;z'),
+        Argument('unquoted', '${EMPTY}'),
+        Argument('quoted', 'tab\\tquote\\"'),
+    ]
+    assert cmakelists.evaluate(arguments, {**variables, 'EMPTY': ''}) == [
+        'x', 'y', 'x;y', 'x', 'y', 'z', 'tab\tquote"'
+    ]
+    with pytest.raises(Unresolvable):
+        cmakelists.evaluate([Argument('unquoted', '$ENV{HOME}')], variables)
+    with pytest.raises(Unresolvable):
+        cmakelists.evaluate([Argument('unquoted', '${C}')], variables)
+
+
+def test_literal_project():
+    assert interpret(
+        '''
+        cmake_minimum_required(VERSION 3.12)
+        set(version 1.02.3)
+        project(demo
+          VERSION ${version}
+          DESCRIPTION "A demo project"
+          HOMEPAGE_URL https://example.com/
+          LANGUAGES CXX
+        )
+        add_library(demo demo.cpp)
+        set(CMAKE_PROJECT_LICENSE ISC CACHE STRING "")
+        '''
+    ) == {
+        'CMAKE_PROJECT_NAME': 'demo',
+        'CMAKE_PROJECT_VERSION': '1.2.3',
+        'CMAKE_PROJECT_DESCRIPTION': 'A demo project',
+        'CMAKE_PROJECT_HOMEPAGE_URL': 'https://example.com/',
+        'CMAKE_PROJECT_LICENSE': 'ISC',
+    }
+
+
+def test_definitions_are_not_executed():
+    assert interpret(
+        '''
+        function(f)
+          set(version 2.0.0)
+        endfunction()
+        set(version 1.0.0)
+        project(demo VERSION ${version})
+        '''
+    )['CMAKE_PROJECT_VERSION'] == '1.0.0'
+
+
+@pytest.mark.parametrize(
+    'text', [
+        'include(version.cmake)\nproject(demo VERSION ${version})',
+        'set(version 1.0)\ninclude(x)\nproject(demo VERSION ${version})',
+        'if(X)\nset(version 1.0)\nendif()\nproject(demo VERSION ${version})',
+        'if(X)\nproject(demo)\nendif()',
+        'function(f)\nproject(demo)\nendfunction()\nproject(demo)',
+        'project(a)\nproject(b)',
+        'project(demo)\ncupcake_project()',
+        'project(demo)\nstring(APPEND CMAKE_PROJECT_LICENSE x)',
+        'project(demo)\n'
+        'set_property(CACHE CMAKE_PROJECT_LICENSE PROPERTY VALUE MIT)',
+        'project(demo VERSION 1.x)',
+        'add_library(demo demo.cpp)',
+    ]
+)
+def test_unresolvable(text):
+    with pytest.raises(Unresolvable):
+        interpret(text)
+
+
+def test_project_variables(tmp_path):
+    assert cmakelists.project_variables(tmp_path) is None
+    (tmp_path / 'CMakeLists.txt').write_text('project(demo)\n')
+    assert cmakelists.project_variables(tmp_path)['CMAKE_PROJECT_NAME'] == (
+        'demo'
+    )
+
+
+def test_project_variables_elsewhere(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text(
+        'project(demo)\ninclude(cmake/meta.cmake)\n'
+    )
+    (tmp_path / 'cmake').mkdir()
+    meta = tmp_path / 'cmake' / 'meta.cmake'
+    meta.write_text('set(CMAKE_PROJECT_LICENSE ISC CACHE STRING "")\n')
+    assert cmakelists.project_variables(tmp_path) is None
+    meta.write_text('message(STATUS "nothing to see")\n')
+    assert cmakelists.project_variables(tmp_path)['CMAKE_PROJECT_NAME'] == (
+        'demo'
+    )
+
+
+def test_project_variables_not_included(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text('project(demo)\n')
+    (tmp_path / 'vendor').mkdir()
+    (tmp_path / 'vendor' / 'CMakeLists.txt').write_text(
+        'set(CMAKE_PROJECT_LICENSE MIT CACHE STRING "")\n'
+    )
+    assert cmakelists.project_variables(tmp_path)['CMAKE_PROJECT_NAME'] == (
+        'demo'
+    )
+
+
+def test_listfiles(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text(
+        '''
+        project(demo)
+        list(APPEND CMAKE_MODULE_PATH "${CMAKE_CURRENT_SOURCE_DIR}/cmake")
+        include(meta)
+        include(GNUInstallDirs)
+        add_subdirectory(src)
+        '''
+    )
+    (tmp_path / 'cmake').mkdir()
+    (tmp_path / 'cmake' / 'meta.cmake').write_text(
+        'include(${CMAKE_CURRENT_LIST_DIR}/more.cmake)\n'
+    )
+    (tmp_path / 'cmake' / 'more.cmake').write_text('')
+    (tmp_path / 'cmake' / 'unused.cmake').write_text('')
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'CMakeLists.txt').write_text('add_subdirectory(x)\n')
+    assert cmakelists.listfiles(tmp_path) == [
+        tmp_path / 'CMakeLists.txt',
+        tmp_path / 'cmake' / 'meta.cmake',
+        tmp_path / 'src' / 'CMakeLists.txt',
+        tmp_path / 'cmake' / 'more.cmake',
+    ]
+
+
+def test_listfiles_follows_subdirectories(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text('include(cmake/dirs.cmake)\n')
+    (tmp_path / 'cmake').mkdir()
+    (tmp_path / 'cmake' / 'dirs.cmake').write_text('add_subdirectory(src)\n')
+    (tmp_path / 'src' / 'lib').mkdir(parents=True)
+    (tmp_path / 'src' / 'CMakeLists.txt').write_text(
+        'add_subdirectory(lib)\n'
+    )
+    (tmp_path / 'src' / 'lib' / 'CMakeLists.txt').write_text('')
+    assert cmakelists.listfiles(tmp_path) == [
+        tmp_path / 'CMakeLists.txt',
+        tmp_path / 'cmake' / 'dirs.cmake',
+        tmp_path / 'src' / 'CMakeLists.txt',
+        tmp_path / 'src' / 'lib' / 'CMakeLists.txt',
+    ]
+
+
+@pytest.mark.parametrize('command', [
+    'include(${META_DIR}/meta.cmake)',
+    'add_subdirectory(${META_DIR})',
+    'list(APPEND CMAKE_MODULE_PATH ${META_DIR})',
+])
+def test_listfiles_unresolvable(tmp_path, command):
+    (tmp_path / 'CMakeLists.txt').write_text(f'project(demo)\n{command}\n')
+    with pytest.raises(Unresolvable):
+        cmakelists.listfiles(tmp_path)
+
+
+def test_project_variables_unresolvable_include(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text(
+        '''
+        set(META_DIR "${CMAKE_CURRENT_SOURCE_DIR}/cmake")
+        project(demo)
+        include(${META_DIR}/meta.cmake)
+        '''
+    )
+    (tmp_path / 'cmake').mkdir()
+    (tmp_path / 'cmake' / 'meta.cmake').write_text(
+        'set(CMAKE_PROJECT_LICENSE MIT CACHE STRING "")\n'
+    )
+    assert cmakelists.project_variables(tmp_path) is None
+
@@ -0,0 +1,194 @@
+# pylint: disable=missing-docstring
+
+import shutil
+
+import pytest
+
+from autorecipes import cmake
+
+pytestmark = pytest.mark.skipif(
+    shutil.which('cmake') is None or
+    (cmake.cmake_version() or (0,)) < cmake.METADATA_CMAKE_VERSION,
+    reason='needs CMake 3.17',
+)
+
+PROJECT = '''
+cmake_minimum_required(VERSION 3.7)
+file(STRINGS "${CMAKE_CURRENT_SOURCE_DIR}/VERSION" version)
+project(demo VERSION ${version} DESCRIPTION "A demo" LANGUAGES C CXX)
+'''
+
+
+def test_metadata(tmp_path):
+    (tmp_path / 'VERSION').write_text('1.2.3\n')
+    (tmp_path / 'CMakeLists.txt').write_text(
+        PROJECT +
+        # Nothing after ``project()`` runs.
+        'file(WRITE "${CMAKE_SOURCE_DIR}/touched" "")\n'
+        'find_package(missing REQUIRED)\n'
+    )
+    attrs = cmake.configure_metadata(tmp_path)
+    assert attrs['name'] == 'demo'
+    assert attrs['version'] == '1.2.3'
+    assert attrs['description'] == 'A demo'
+    assert attrs['license'] is None
+    assert not (tmp_path / 'touched').exists()
+
+
+def test_metadata_before_project(tmp_path):
+    (tmp_path / 'VERSION').write_text('1.2.3\n')
+    (tmp_path / 'CMakeLists.txt').write_text(
+        'set(CMAKE_PROJECT_LICENSE ISC CACHE STRING "")\n' + PROJECT
+    )
+    assert cmake.configure_metadata(tmp_path)['license'] == 'ISC'
+
+
+def test_metadata_falls_back(tmp_path):
+    (tmp_path / 'VERSION').write_text('1.2.3\n')
+    # We cannot know the license without configuring everything.
+    (tmp_path / 'CMakeLists.txt').write_text(
+        PROJECT + 'set(CMAKE_PROJECT_LICENSE ISC CACHE STRING "")\n'
+    )
+    assert cmake.configure_metadata(tmp_path) is None
+    # Nor anything, when the project needs its dependencies installed first.
+    (tmp_path / 'CMakeLists.txt').write_text(
+        'include("${CMAKE_BINARY_DIR}/conan_paths.cmake")\n' + PROJECT
+    )
+    assert cmake.configure_metadata(tmp_path) is None
+
+
+def test_configure_mode(monkeypatch):
+    monkeypatch.delenv('AUTORECIPES_CONFIGURE', raising=False)
+    assert cmake.configure_mode() == 'metadata'
+    monkeypatch.setenv('AUTORECIPES_CONFIGURE', 'full')
+    assert cmake.configure_mode() == 'full'
+    monkeypatch.setenv('AUTORECIPES_CONFIGURE', 'partial')
+    with pytest.raises(ValueError):
+        cmake.configure_mode()
+
+
+def test_full_reconfigure(tmp_path, monkeypatch):
+    pytest.importorskip('fcntl')
+    from autorecipes import context  # pylint: disable=import-outside-toplevel
+    monkeypatch.setenv('AUTORECIPES_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('AUTORECIPES_CONFIGURE', 'full')
+    source_dir = tmp_path / 'source'
+    (source_dir / 'cmake').mkdir(parents=True)
+    (source_dir / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'project(demo LANGUAGES NONE)\n'
+        'include(cmake/meta.cmake)\n'
+    )
+    meta = source_dir / 'cmake' / 'meta.cmake'
+
+    class Recipe(cmake.CMakeConanFile):
+        pass
+
+    with context.using(source_dir):
+        for value in ('MIT', 'ISC'):
+            meta.write_text(
+                f'set(CMAKE_PROJECT_LICENSE {value} CACHE STRING "")\n'
+            )
+            # The second configuration reuses the tree of the first.
+            attrs = cmake.configure_attributes(Recipe, source_dir)
+            assert attrs['license'] == value
+
+
+def test_metadata_listfiles(tmp_path):
+    from autorecipes import commands  # pylint: disable=import-outside-toplevel
+    from autorecipes.stamps import Stamps  # pylint: disable=import-outside-toplevel
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    (tmp_path / 'common.cmake').write_text('set(version 1.2.3)\n')
+    (source_dir / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'include(${CMAKE_CURRENT_SOURCE_DIR}/../common.cmake)\n'
+        'project(demo VERSION ${version} LANGUAGES NONE)\n'
+    )
+    stamps = Stamps()
+    attrs = commands.run(cmake.configure_metadata_steps(source_dir, stamps))
+    assert attrs['version'] == '1.2.3'
+    # Not the modules that come with CMake, nor our own.
+    assert sorted(stamps.paths) == [
+        tmp_path / 'common.cmake', source_dir / 'CMakeLists.txt'
+    ]
+
+
+def test_configured_listfiles(tmp_path):
+    import subprocess  # pylint: disable=import-outside-toplevel
+    source_dir = tmp_path / 'source'
+    build_dir = tmp_path / 'build'
+    source_dir.mkdir()
+    (tmp_path / 'common.cmake').write_text('')
+    (source_dir / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'project(demo LANGUAGES NONE)\n'
+        'include(GNUInstallDirs)\n'
+        'include(../common.cmake)\n'
+    )
+    assert cmake.configured_listfiles(build_dir) is None
+    query = build_dir / cmake.CMAKE_FILES_QUERY
+    query.parent.mkdir(parents=True)
+    query.touch()
+    subprocess.run(
+        ['cmake', str(source_dir)], cwd=str(build_dir), check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    assert cmake.configured_listfiles(build_dir) == [
+        source_dir / 'CMakeLists.txt', tmp_path / 'common.cmake'
+    ]
+
+
+def test_cached_listfiles(tmp_path, monkeypatch):
+    from autorecipes import commands  # pylint: disable=import-outside-toplevel
+    monkeypatch.setenv('AUTORECIPES_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('AUTORECIPES_CONFIGURE', raising=False)
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    common = tmp_path / 'common.cmake'
+    (source_dir / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'include(${CMAKE_CURRENT_SOURCE_DIR}/../common.cmake)\n'
+        'project(demo VERSION ${version} LANGUAGES NONE)\n'
+    )
+
+    class Recipe:
+        requires = build_requires = generators = None
+
+    descriptor = cmake.CMakeListsTxtAttributes()
+    for version in ('1.0.0', '2.0.0', '2.0.0'):
+        common.write_text(f'set(version {version})\n')
+        # The cache does not hide a change outside the source tree.
+        tracked = commands.run(descriptor.load_steps(Recipe, source_dir))
+        assert tracked.value.version == version
+        assert common in tracked.stamps.paths
+
+
+def test_metadata_control_characters(tmp_path):
+    (tmp_path / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'project(demo DESCRIPTION "a\ttab, a \x01 and an \x1b" LANGUAGES NONE)\n'
+    )
+    attrs = cmake.configure_metadata(tmp_path)
+    assert attrs['description'] == 'a\ttab, a \x01 and an \x1b'
+
+
+def test_json_string(tmp_path):
+    import json  # pylint: disable=import-outside-toplevel
+    import subprocess  # pylint: disable=import-outside-toplevel
+    from pathlib import Path  # pylint: disable=import-outside-toplevel
+    json_cmake = Path(cmake.__file__).parent / 'data' / 'json.cmake'
+    script = tmp_path / 'script.cmake'
+    script.write_text(
+        f'include("{json_cmake.as_posix()}")\n'
+        'set(value "")\n'
+        'foreach(code RANGE 1 127)\n'
+        '  string(ASCII ${code} character)\n'
+        '  string(APPEND value "${character}")\n'
+        'endforeach()\n'
+        'json_string(json "${value}")\n'
+        'file(WRITE "${CMAKE_CURRENT_LIST_DIR}/value.json" "${json}")\n'
+    )
+    subprocess.run(['cmake', '-P', str(script)], check=True)
+    value = json.loads((tmp_path / 'value.json').read_text())
+    assert value == ''.join(chr(code) for code in range(1, 128))
@@ -0,0 +1,67 @@
+# pylint: disable=missing-docstring
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+
+from autorecipes import context
+from autorecipes.python import PythonConanFile
+
+
+def test_default():
+    assert context.source_dir() == Path(os.getcwd()).resolve()
+
+
+def test_default_is_resolved(tmp_path, monkeypatch):
+    (tmp_path / 'real').mkdir()
+    (tmp_path / 'link').symlink_to(tmp_path / 'real')
+    monkeypatch.chdir(tmp_path / 'link')
+    with context.using(tmp_path / 'link') as explicit:
+        assert context.source_dir() == explicit
+    # The same directory is the same project, by default or explicitly.
+    assert context.source_dir() == explicit
+
+
+def test_using(tmp_path):
+    with context.using(tmp_path / 'a') as outer:
+        assert outer == context.source_dir() == (tmp_path / 'a').resolve()
+        with context.using(tmp_path / 'b'):
+            assert context.source_dir() == (tmp_path / 'b').resolve()
+        assert context.source_dir() == outer
+        with context.using(None):
+            assert context.source_dir() == Path(os.getcwd()).resolve()
+    assert context.source_dir() == Path(os.getcwd()).resolve()
+
+
+def test_threads(tmp_path):
+    with context.using(tmp_path):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Threads start in the default context...
+            assert executor.submit(context.source_dir).result() == Path(
+                os.getcwd()
+            ).resolve()
+            # ...unless a function is bound to ours.
+            bound = context.bind(context.source_dir)
+            assert executor.submit(bound).result() == tmp_path.resolve()
+
+
+def test_projects_in_parallel(tmp_path):
+    directories = []
+    for i in range(8):
+        directory = tmp_path / f'project{i}'
+        directory.mkdir()
+        (directory / 'pyproject.toml').write_text(
+            f'[tool.poetry]\nname = "project{i}"\nversion = "0.{i}.0"\n'
+        )
+        directories.append(directory)
+
+    class Recipe(PythonConanFile):
+        pass
+
+    def inspect(directory):
+        with context.using(directory):
+            return Recipe.name, Recipe.version
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(inspect, directories))
+    assert results == [(f'project{i}', f'0.{i}.0') for i in range(8)]
@@ -0,0 +1,222 @@
+# pylint: disable=missing-docstring
+
+import json
+
+from conans.model.build_info import CppInfo
+from conans.model.requires import Requirements
+import pytest
+
+from autorecipes import cpp_info
+
+MANIFEST = {
+    'version': cpp_info.MANIFEST_VERSION,
+    'package': 'demo',
+    'components': {
+        'core': {
+            'type': 'STATIC_LIBRARY',
+            'includedirs': ['include'],
+            'defines': ['QUOTE="x;y"'],
+            'locations': {
+                'DEBUG': 'lib/debug/libcore.a',
+                'RELEASE': 'lib/libcore.a',
+            },
+        },
+        'util': {
+            'type': 'STATIC_LIBRARY',
+            'includedirs': ['include'],
+            'dependencies': [
+                'demo::core',
+                '$<LINK_ONLY:pthread>',
+                'other::lib',
+                '$<INSTALL_PREFIX>/lib/libextra.a',
+                '/opt/lib/libother.a',
+                '$<$<CONFIG:Debug>:debug::lib>',
+            ],
+            'locations': {'': 'lib/libutil.a'},
+        },
+    },
+}
+
+
+class LegacyCppInfo:  # pylint: disable=too-few-public-methods
+    """A ``cpp_info`` from a version of Conan without components."""
+
+
+def test_read_manifest(tmp_path):
+    path = tmp_path / 'cpp_info.json'
+    assert cpp_info.read_manifest(path) is None
+    path.write_text(json.dumps(MANIFEST))
+    assert cpp_info.read_manifest(path) == MANIFEST
+    path.write_text(json.dumps({**MANIFEST, 'version': 0}))
+    assert cpp_info.read_manifest(path) is None
+
+
+def test_fill_by_build_type():
+    info = LegacyCppInfo()
+    cpp_info.fill(info, MANIFEST, 'Debug', '/package')
+    assert info.includedirs == ['include']
+    assert info.defines == ['QUOTE="x;y"']
+    # Libraries come before the libraries that they depend on.
+    assert info.libdirs == ['lib', 'lib/debug']
+    assert info.libs == ['libutil.a', 'libcore.a']
+    # Library files are linked by path, in the package where it is.
+    assert info.system_libs == [
+        'pthread', '/package/lib/libextra.a', '/opt/lib/libother.a'
+    ]
+
+    info = LegacyCppInfo()
+    cpp_info.fill(info, MANIFEST, 'RelWithDebInfo')
+    # Without a matching configuration, we take the first one installed.
+    assert info.libdirs == ['lib', 'lib/debug']
+
+
+def test_index():
+    manifest = {
+        'package': 'demo',
+        'components': {
+            'app': {'dependencies': ['demo::net', 'demo::log']},
+            'log': {'dependencies': ['demo::base', 'fmt::fmt', '-lm']},
+            'net': {
+                'dependencies': [
+                    'demo::base',
+                    'demo::log',
+                    '$<LINK_ONLY:ssl::ssl>',
+                    '-Wl,--as-needed',
+                    'dl',
+                ]
+            },
+            'base': {
+                'dependencies': [
+                    'pthread',
+                    'demo::missing',
+                    '/usr/lib/libz.so',
+                    '$<LINK_ONLY:$<INSTALL_PREFIX>/lib/libbase_extra.a>',
+                    '$<LINK_ONLY:libcrypto.a>',
+                    # We cannot evaluate other generator expressions.
+                    '$<$<CONFIG:Debug>:dbg>',
+                ]
+            },
+        },
+    }
+    index = cpp_info.index(manifest)
+    assert list(index) == ['app', 'net', 'log', 'base']
+    app = index['app']
+    assert app.internal == ['net', 'log', 'base']
+    assert app.external == ['ssl::ssl', 'fmt::fmt', 'demo::missing']
+    assert app.system == ['dl', 'm', 'pthread']
+    assert app.libraries == ['lib/libbase_extra.a']
+    assert app.files == ['/usr/lib/libz.so', 'libcrypto.a']
+    assert app.flags == ['-Wl,--as-needed']
+    assert index['log'].internal == ['base']
+    assert index['base'].internal == []
+
+
+def test_fill_multiple_targets():
+    info = CppInfo('demo', '/package')
+    cpp_info.fill(info, MANIFEST, 'Release', requirements=['other'])
+    # Conan checks what we filled.
+    info._raise_incorrect_components_definition(  # pylint: disable=protected-access
+        'demo', Requirements('other/1.0')
+    )
+    core = info.components['core']
+    assert core.includedirs == ['include']
+    assert core.libdirs == ['lib']
+    assert core.libs == ['libcore.a']
+    util = info.components['util']
+    # Components of the same package go by their bare names,
+    # and only targets of requirements go by theirs.
+    assert util.requires == ['core', 'other::lib']
+    # Without a package folder, library files stay relative to it.
+    assert util.system_libs == [
+        'pthread', 'lib/libextra.a', '/opt/lib/libother.a'
+    ]
+    assert util.libdirs == ['lib']
+    assert util.libs == ['libutil.a']
+    assert util.bindirs == []
+
+
+def test_fill_target_named_after_package():
+    manifest = {
+        'version': cpp_info.MANIFEST_VERSION,
+        'package': 'demo',
+        'components': {
+            'demo': {
+                'type': 'STATIC_LIBRARY',
+                'locations': {'': 'lib/libdemo.a'},
+            },
+        },
+    }
+    info = CppInfo('demo', '/package')
+    cpp_info.fill(info, manifest)
+    # Conan forbids a component with the name of the package.
+    assert not info.components
+    assert info.libs == ['libdemo.a']
+
+
+@pytest.mark.parametrize('target, expected', [
+    ('other::lib', 'other::lib'),
+    ('fmt::fmt', 'fmt::fmt'),
+    ('ZLIB::ZLIB', 'zlib::zlib'),
+    ('Threads::Threads', None),
+    ('pthread', None),
+])
+def test_requirement(target, expected):
+    assert cpp_info.requirement(target, ['zlib', 'fmt', 'other']) == expected
+
+
+def test_fill_many_values():
+    n = 20000
+    manifest = {
+        'version': cpp_info.MANIFEST_VERSION,
+        'package': 'demo',
+        'components': {
+            f'c{i}': {
+                'type': 'STATIC_LIBRARY',
+                # Every target shares half of its values.
+                'includedirs': ['include', f'include/c{i}'],
+                'defines': [f'C{i}', 'SHARED', f'C{i}'],
+                'locations': {'': f'lib/libc{i}.a'},
+            } for i in range(n)
+        },
+    }
+    info = LegacyCppInfo()
+    cpp_info.fill(info, manifest)
+    assert len(info.includedirs) == n + 1
+    assert info.includedirs[:2] == ['include', 'include/c0']
+    assert info.defines[:3] == ['C0', 'SHARED', 'C1']
+    assert len(info.defines) == n + 1
+    assert info.libdirs == ['lib']
+    assert len(info.libs) == n
+
+
+@pytest.mark.parametrize('build_type, libdir', [
+    ('Debug', 'lib/debug'),
+    ('Release', 'lib/release'),
+    # Without a matching configuration, we prefer the configuration-less
+    # location.
+    ('MinSizeRel', 'lib'),
+    (None, 'lib'),
+])
+def test_locations_per_build_type(build_type, libdir):
+    info = CppInfo('demo', '/package')
+    builder = cpp_info.SingleTargetCppInfo(info, 'demo')
+    for config, directory in (
+        ('DEBUG', 'lib/debug'),
+        ('', 'lib'),
+        ('RELEASE', 'lib/release'),
+    ):
+        builder.locate('demo', 'library', config, directory, 'libdemo.a')
+    builder.finish(build_type)
+    assert info.libdirs == [libdir]
+    assert info.libs == ['libdemo.a']
+
+
+def test_builder_hooks_are_abstract():
+
+    class Partial(cpp_info.CppInfoBuilder):
+
+        def add_library(self, target, library):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()  # pylint: disable=abstract-class-instantiated
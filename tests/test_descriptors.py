@@ -1,6 +1,19 @@
 # pylint: disable=missing-docstring,no-self-argument,no-self-use
 
-from autorecipes.descriptors import classproperty, cached_classproperty
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import threading
+import weakref
+
+import pytest
+
+from autorecipes import context
+from autorecipes.descriptors import (
+    ClassCache,
+    cached_classproperty,
+    classproperty,
+    invalidate,
+)
 
 
 def test_cached_classproperty():
@@ -83,3 +96,154 @@ def test_conan_pattern():
         source_dir = 'derived'
 
     assert Derived.name == 'derived/project_name'
+
+
+def test_cached_classproperty_per_class():
+
+    class Base:
+
+        @cached_classproperty
+        def name(cls):
+            return cls.__name__
+
+    class Derived(Base):
+        pass
+
+    # Whichever class asks first, each class gets its own value.
+    assert Derived.name == 'Derived'
+    assert Base.name == 'Base'
+
+
+def test_single_flight():
+    times_called = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    class Base:
+
+        @cached_classproperty
+        def attrs(cls):
+            nonlocal times_called
+            times_called += 1
+            started.set()
+            release.wait()
+            return {'name': 'project_name'}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(lambda: Base.attrs) for _ in range(4)]
+        started.wait()
+        release.set()
+        results = [f.result() for f in futures]
+    assert times_called == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_recursion():
+
+    class Base:
+
+        @cached_classproperty
+        def attrs(cls):
+            return cls.attrs
+
+    with pytest.raises(RecursionError):
+        Base.attrs  # pylint: disable=pointless-statement
+
+
+def test_failure_is_retried():
+    outcomes = [ValueError('first'), 'second']
+
+    class Base:
+
+        @cached_classproperty
+        def attrs(cls):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+    with pytest.raises(ValueError):
+        Base.attrs  # pylint: disable=pointless-statement
+    assert Base.attrs == 'second'
+
+
+def test_invalidate():
+    values = iter(range(10))
+
+    class Base:
+
+        @cached_classproperty
+        def attrs(cls):
+            return next(values)
+
+    class Derived(Base):
+        pass
+
+    assert (Base.attrs, Derived.attrs) == (0, 1)
+    invalidate(Derived)
+    assert (Base.attrs, Derived.attrs) == (0, 2)
+    vars(Base)['attrs'].cache.clear()
+    assert (Base.attrs, Derived.attrs) == (3, 4)
+
+
+def test_weak_classes():
+    cache = ClassCache()
+
+    class Temporary:
+        pass
+
+    assert cache.get(Temporary, lambda: 'value') == 'value'
+    reference = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert reference() is None
+
+
+def test_per_source_dir(tmp_path):
+    cache = ClassCache()
+
+    class Recipe:
+        pass
+
+    def compute():
+        return context.source_dir().name
+
+    with context.using(tmp_path / 'a'):
+        assert cache.get(Recipe, compute) == 'a'
+    with context.using(tmp_path / 'b'):
+        assert cache.get(Recipe, compute) == 'b'
+        assert cache.get(Recipe, lambda: 'other') == 'b'
+    cache.invalidate(Recipe)
+    with context.using(tmp_path / 'a'):
+        assert cache.get(Recipe, lambda: 'again') == 'again'
+
+
+def test_submit_in_context(tmp_path):
+    cache = ClassCache()
+
+    class Recipe:
+        pass
+
+    def compute():
+        return context.source_dir().name
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with context.using(tmp_path / 'a'):
+            cache.submit(Recipe, compute, executor)
+    with context.using(tmp_path / 'a'):
+        assert cache.get(Recipe, lambda: 'other') == 'a'
+
+
+def test_submit_fails(tmp_path):
+    cache = ClassCache()
+
+    class Recipe:
+        pass
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    with context.using(tmp_path):
+        with pytest.raises(RuntimeError):
+            cache.submit(Recipe, lambda: 'never', executor)
+        # The failed submission leaves nothing pending.
+        assert cache.get(Recipe, lambda: 'value') == 'value'
@@ -0,0 +1,136 @@
+# pylint: disable=missing-docstring
+
+import json
+import os
+import shutil
+import subprocess as sp
+
+import pytest
+
+from autorecipes import PythonConanFile, files
+
+
+@pytest.mark.parametrize(
+    'pattern,path,expected',
+    [
+        ('pkg', 'pkg/__init__.py', True),
+        ('pkg', 'pkg.py', False),
+        ('pkg/*.py', 'pkg/a.py', True),
+        ('pkg/*.py', 'pkg/sub/a.py', False),
+        ('pkg/**/*.py', 'pkg/a.py', True),
+        ('pkg/**/*.py', 'pkg/sub/a.py', True),
+        ('LICENSE*', 'LICENSE.txt', True),
+        ('LICENSE*', 'docs/LICENSE', False),
+        ('?.txt', 'a.txt', True),
+    ],
+)
+def test_glob_regex(pattern, path, expected):
+    assert bool(files.glob_regex(pattern).match(path)) == expected
+
+
+def make_tree(root, paths):
+    for path in paths:
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(path.name)
+
+
+def test_scan(tmp_path):
+    make_tree(tmp_path, [
+        'a.txt',
+        'pkg/b.py',
+        'pkg/__pycache__/b.cpython-37.pyc',
+        '.git/HEAD',
+        'venv/lib/c.py',
+    ])
+    assert files.scan(tmp_path) == ['a.txt', 'pkg/b.py', 'venv/lib/c.py']
+    assert files.scan(tmp_path, ['pkg']) == ['a.txt', 'pkg/b.py']
+
+
+def test_update_manifest(tmp_path):
+    make_tree(tmp_path, ['a.txt', 'b.txt'])
+    manifest = tmp_path / 'manifest.json'
+    stamps = files.update_manifest(manifest, tmp_path, ['a.txt'])
+    digest = json.loads(manifest.read_text())['digest']
+    assert digest == files.digest(stamps)
+    # Touching a file does not change the digest.
+    os.utime(tmp_path / 'a.txt', ns=(10**9, 10**9))
+    files.update_manifest(manifest, tmp_path, ['a.txt'])
+    assert json.loads(manifest.read_text())['digest'] == digest
+    # A file with a known time and size is not hashed again.
+    old = stamps['a.txt']
+    stamps = files.update_manifest(manifest, tmp_path, ['a.txt'])
+    assert stamps['a.txt'].mtime_ns == 10**9
+    assert stamps['a.txt'].digest == old.digest
+    files.update_manifest(manifest, tmp_path, ['a.txt', 'b.txt'])
+    assert json.loads(manifest.read_text())['digest'] != digest
+
+
+def test_python_exports(tmp_path, monkeypatch):
+    (tmp_path / 'pyproject.toml').write_text(
+        '[tool.poetry]\n'
+        'name = "my-project"\n'
+        'readme = "README.rst"\n'
+        'include = ["CHANGELOG.md"]\n'
+        'exclude = ["my_project/secret.txt"]\n'
+    )
+    make_tree(tmp_path, [
+        'README.rst',
+        'CHANGELOG.md',
+        'LICENSE',
+        'setup.cfg',
+        'my_project/__init__.py',
+        'my_project/data/table.csv',
+        'my_project/secret.txt',
+        'tests/test_a.py',
+    ])
+    monkeypatch.chdir(tmp_path)
+
+    class Recipe(PythonConanFile):
+        pass
+
+    assert Recipe.exports == [
+        'CHANGELOG.md',
+        'LICENSE',
+        'README.rst',
+        'my_project/__init__.py',
+        'my_project/data/table.csv',
+        'pyproject.toml',
+    ]
+    # Reading the attribute writes nothing.
+    assert not (tmp_path / '.autorecipes').exists()
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='needs Git')
+def test_python_exports_in_git(tmp_path, monkeypatch):
+    (tmp_path / 'pyproject.toml').write_text(
+        '[tool.poetry]\n'
+        'name = "pkg"\n'
+        'include = ["pkg/generated.py"]\n'
+    )
+    (tmp_path / '.gitignore').write_text('pkg/*.log\npkg/generated.py\n')
+    make_tree(tmp_path, [
+        'pkg/__init__.py',
+        'pkg/debug.log',
+        'pkg/scratch.py',
+        'pkg/generated.py',
+    ])
+    sp.run(['git', 'init', '-q'], cwd=str(tmp_path), check=True)
+    sp.run(
+        ['git', 'add', 'pyproject.toml', 'pkg/__init__.py'],
+        cwd=str(tmp_path),
+        check=True,
+    )
+    monkeypatch.chdir(tmp_path)
+
+    class Recipe(PythonConanFile):
+        pass
+
+    # Files that Git does not track are left out of packages,
+    # unless they are included explicitly.
+    assert Recipe.exports == [
+        'pkg/__init__.py',
+        'pkg/generated.py',
+        'pyproject.toml',
+    ]
+
@@ -0,0 +1,45 @@
+# pylint: disable=missing-docstring
+
+import os
+import subprocess as sp
+
+import pytest
+
+from autorecipes import gitindex
+
+
+def git_ls_files(cwd):
+    output = sp.check_output(['git', 'ls-files', '-z'], cwd=str(cwd))
+    return [os.fsdecode(p) for p in output.split(b'\0') if p]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    sp.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    for path in ['top.txt', 'with space.txt', 'sub/a.txt', 'sub/dir/b.txt']:
+        path = tmp_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(path.name)
+    (tmp_path / 'untracked.txt').write_text('')
+    sp.run(['git', 'add', '.', ':!untracked.txt'], cwd=str(tmp_path), check=True)
+    return tmp_path
+
+
+@pytest.mark.parametrize('version', ['2', '3', '4'])
+def test_ls_files(repository, version):
+    sp.run(
+        ['git', 'update-index', '--index-version', version],
+        cwd=str(repository),
+        check=True,
+    )
+    assert gitindex.ls_files(repository) == git_ls_files(repository)
+    assert 'with space.txt' in gitindex.ls_files(repository)
+    assert gitindex.ls_files(repository / 'sub') == ['a.txt', 'dir/b.txt']
+    assert gitindex.ls_files(repository, prefix='sub/dir') == ['sub/dir/b.txt']
+
+
+def test_cache_follows_index(repository):
+    assert 'new.txt' not in gitindex.ls_files(repository)
+    (repository / 'new.txt').write_text('new')
+    sp.run(['git', 'add', 'new.txt'], cwd=str(repository), check=True)
+    assert 'new.txt' in gitindex.ls_files(repository)
@@ -0,0 +1,72 @@
+# pylint: disable=missing-docstring
+
+import json
+from pathlib import Path
+import subprocess as sp
+import sys
+
+import pytest
+
+import autorecipes
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# An import of the package costs well under a millisecond.
+# This budget leaves room for slow machines, not for ``conans``.
+BUDGET_US = 30000
+
+
+def modules_after(code):
+    """Return the modules loaded after running some code."""
+    output = sp.check_output(
+        [
+            sys.executable,
+            '-c',
+            f'{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))',
+        ],
+        cwd=str(ROOT),
+    )
+    return set(json.loads(output.decode().splitlines()[-1]))
+
+
+def test_lazy_package():
+    modules = modules_after('import autorecipes')
+    assert 'autorecipes.cmake' not in modules
+    assert 'autorecipes.python' not in modules
+    assert 'conans' not in modules
+    modules = modules_after('import autorecipes\nautorecipes.PythonConanFile')
+    assert 'autorecipes.python' in modules
+    assert 'autorecipes.cmake' not in modules
+
+
+def test_lazy_cmake():
+    modules = modules_after('import autorecipes\nautorecipes.CMakeConanFile')
+    assert 'autorecipes.cmake' in modules
+    # Needed only to build or package.
+    for name in ('build', 'cpp_info', 'files', 'links', 'probes'):
+        assert f'autorecipes.{name}' not in modules
+
+
+def test_attributes():
+    from autorecipes.cmake import CMakeConanFile
+    assert autorecipes.CMakeConanFile is CMakeConanFile
+    assert 'CMakeConanFile' in dir(autorecipes)
+    with pytest.raises(AttributeError):
+        autorecipes.NoSuchThing  # pylint: disable=pointless-statement
+
+
+def test_import_time():
+    process = sp.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import autorecipes'],
+        cwd=str(ROOT),
+        stderr=sp.PIPE,
+        check=True,
+    )
+    for line in process.stderr.decode().splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == 'autorecipes':
+            assert int(parts[1]) < BUDGET_US, line
+            break
+    else:
+        raise AssertionError('autorecipes was not imported')
@@ -0,0 +1,98 @@
+# pylint: disable=missing-docstring
+
+import os
+import shutil
+import stat
+
+from autorecipes import files, links
+
+
+def make_source(root):
+    (root / 'sub').mkdir(parents=True)
+    (root / 'a.txt').write_text('a')
+    (root / 'sub' / 'b.txt').write_text('b')
+    (root / 'run.sh').write_text('#!/bin/sh\n')
+    (root / 'run.sh').chmod(0o755)
+    os.symlink('a.txt', str(root / 'link.txt'))
+    names = ['a.txt', 'link.txt', 'run.sh', 'sub/b.txt']
+    stamps = files.update_manifest(root / 'manifest.json', root, names)
+    return {name: s.digest for name, s in stamps.items()}
+
+
+def test_place_with_store(tmp_path):
+    source = tmp_path / 'source'
+    digests = make_source(source)
+    store = links.Store(tmp_path / 'store')
+
+    first = tmp_path / 'first'
+    counts = links.place(source, first, digests, store)
+    assert counts['symlink'] == 1
+    assert counts['cached'] == 0
+    assert (first / 'sub' / 'b.txt').read_text() == 'b'
+    assert os.readlink(str(first / 'link.txt')) == 'a.txt'
+    assert os.access(str(first / 'run.sh'), os.X_OK)
+    assert not os.access(str(first / 'a.txt'), os.X_OK)
+
+    second = tmp_path / 'second'
+    counts = links.place(source, second, digests, store)
+    assert counts['cached'] == 3
+    assert counts['hardlink'] == 3
+    assert os.path.samefile(str(first / 'a.txt'), str(second / 'a.txt'))
+
+    # Editing a source does not change what was exported.
+    (source / 'a.txt').write_text('edited')
+    assert (second / 'a.txt').read_text() == 'a'
+
+
+def test_place_writable(tmp_path):
+    source = tmp_path / 'source'
+    digests = make_source(source)
+    store = links.Store(tmp_path / 'store')
+    # Stores used to keep their files read-only.
+    path, _ = store.add(source / 'a.txt', digests['a.txt'])
+    os.chmod(str(path), 0o444)
+
+    destination = tmp_path / 'destination'
+    links.place(source, destination, digests, store)
+    # A recipe may patch what was exported, and Conan remove it.
+    for name in ('a.txt', 'run.sh', 'sub/b.txt'):
+        assert os.stat(str(destination / name)).st_mode & stat.S_IWUSR
+    shutil.rmtree(str(destination))
+
+
+def test_place_without_store(tmp_path):
+    source = tmp_path / 'source'
+    digests = make_source(source)
+    destination = tmp_path / 'destination'
+    counts = links.place(source, destination, digests)
+    assert counts['reflink'] + counts['copy'] == 3
+    assert not os.path.samefile(
+        str(source / 'a.txt'),
+        str(destination / 'a.txt'),
+    )
+
+
+def test_place_unchanged(tmp_path):
+    source = tmp_path / 'source'
+    digests = make_source(source)
+    for store in (None, links.Store(tmp_path / 'store')):
+        destination = tmp_path / ('copied' if store is None else 'linked')
+        links.place(source, destination, digests, store)
+        before = os.stat(str(destination / 'a.txt')).st_ino
+        counts = links.place(source, destination, digests, store)
+        assert counts == {'unchanged': 4}
+        assert os.stat(str(destination / 'a.txt')).st_ino == before
+
+        # A target with other content is replaced.
+        (destination / 'sub' / 'b.txt').unlink()
+        (destination / 'sub' / 'b.txt').write_text('stale')
+        counts = links.place(source, destination, digests, store)
+        assert counts['unchanged'] == 3
+        assert (destination / 'sub' / 'b.txt').read_text() == 'b'
+
+    # So is a target with another mode.
+    # (A linked target shares its mode with the store.)
+    os.chmod(str(tmp_path / 'copied' / 'run.sh'), 0o644)
+    counts = links.place(source, tmp_path / 'copied', digests)
+    assert counts['unchanged'] == 3
+    assert os.access(str(tmp_path / 'copied' / 'run.sh'), os.X_OK)
@@ -0,0 +1,91 @@
+# pylint: disable=missing-docstring
+
+import json
+import subprocess as sp
+import typing as t
+
+from conans.model.build_info import CppInfo
+from conans.model.requires import Requirements
+import pytest
+
+from autorecipes import commands, cpp_info
+from autorecipes.cmake import MANIFEST_PATH, CMakeConanFile
+from autorecipes.stdlib import Object
+
+MANIFEST = {
+    'version': cpp_info.MANIFEST_VERSION,
+    'package': 'demo',
+    'components': {
+        'demo': {
+            'type': 'STATIC_LIBRARY',
+            'includedirs': ['include'],
+            'locations': {
+                'DEBUG': 'lib/debug/libdemo.a',
+                'RELEASE': 'lib/libdemo.a',
+            },
+        },
+    },
+}
+
+
+class Recipe(CMakeConanFile):
+    name = 'demo'
+    # Conan gives these to an instance that it constructs.
+    package_folder: t.Any = None
+    settings: t.Any = None
+
+
+@pytest.fixture
+def recipe(tmp_path):
+    instance = Recipe.__new__(Recipe)
+    instance.package_folder = str(tmp_path)
+    instance.settings = Object(build_type='Debug')
+    instance.cpp_info = CppInfo('demo', str(tmp_path))
+    instance.requires = Requirements()
+    instance.__dict__['cmake'] = Object(install=lambda: None)
+    return instance
+
+
+@pytest.fixture
+def introspections(monkeypatch):
+    """Stand in for the ``cmake`` that introspects a package."""
+    calls = []
+
+    def execute(command):
+        calls.append(command)
+        with open(f'{command.cwd}/cpp_info.json', 'w') as f:
+            json.dump(MANIFEST, f)
+        return sp.CompletedProcess(command.args, 0)
+
+    monkeypatch.setattr(commands, 'execute', execute)
+    return calls
+
+
+def test_package_writes_manifest(tmp_path, recipe, introspections):
+    recipe.package()
+    assert len(introspections) == 1
+    assert f'-DCMAKE_PREFIX_PATH={tmp_path}' in introspections[0].args
+    assert cpp_info.read_manifest(tmp_path / MANIFEST_PATH) == MANIFEST
+
+
+def test_package_info_reads_manifest(tmp_path, recipe, introspections):
+    path = tmp_path / MANIFEST_PATH
+    path.parent.mkdir()
+    path.write_text(json.dumps(MANIFEST))
+    recipe.package_info()
+    assert introspections == []
+    assert recipe.cpp_info.libs == ['libdemo.a']
+    assert recipe.cpp_info.libdirs == ['lib/debug']
+
+
+@pytest.mark.parametrize('text', [None, json.dumps({**MANIFEST, 'version': 0})])
+def test_package_info_introspects(tmp_path, recipe, introspections, text):
+    # The package was built by an older version of the recipe.
+    if text is not None:
+        path = tmp_path / MANIFEST_PATH
+        path.parent.mkdir()
+        path.write_text(text)
+    recipe.package_info()
+    assert len(introspections) == 1
+    assert recipe.cpp_info.libs == ['libdemo.a']
+    assert recipe.cpp_info.libdirs == ['lib/debug']
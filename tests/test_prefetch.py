@@ -0,0 +1,87 @@
+# pylint: disable=missing-docstring,no-self-argument,no-self-use
+
+import threading
+
+from autorecipes import prefetch
+from autorecipes.descriptors import cached_classproperty
+
+
+def make_base(calls):
+
+    class Base(prefetch.Prefetching):
+
+        @cached_classproperty
+        def attrs(cls):
+            calls.append(threading.current_thread().name)
+            return {'name': cls.__name__}
+
+    return Base
+
+
+def test_prefetch_on_definition():
+    calls = []
+    started = threading.Event()
+
+    class Recipe(make_base(calls), prefetch=True):
+
+        @cached_classproperty
+        def slow(cls):
+            started.wait()
+            return 'slow'
+
+    # ``attrs`` does not wait for ``slow``.
+    assert Recipe.attrs == {'name': 'Recipe'}
+    assert len(calls) == 1 and calls[0].startswith('autorecipes')
+    started.set()
+    assert Recipe.slow == 'slow'
+    assert Recipe.attrs == {'name': 'Recipe'}
+    assert len(calls) == 1
+
+
+def test_prefetch_off(monkeypatch):
+    monkeypatch.delenv(prefetch.ENVIRONMENT_VARIABLE, raising=False)
+    calls = []
+
+    class Recipe(make_base(calls)):
+        pass
+
+    assert calls == []
+    assert Recipe.attrs == {'name': 'Recipe'}
+    assert calls == [threading.current_thread().name]
+
+
+def test_prefetch_environment(monkeypatch):
+    monkeypatch.setenv(prefetch.ENVIRONMENT_VARIABLE, '1')
+    calls = []
+    base = make_base(calls)
+    # The generic base is not prefetched.
+    assert calls == []
+
+    class Recipe(base):
+        pass
+
+    assert Recipe.attrs == {'name': 'Recipe'}
+    assert calls[0].startswith('autorecipes')
+
+
+def test_prefetch_many_waiting_classes():
+    # More classes than workers wait for a source that is queued
+    # behind all of them.
+    recipes = []
+    release = threading.Event()
+
+    class Base(prefetch.Prefetching):
+
+        @cached_classproperty
+        def first(cls):
+            release.wait()
+            return recipes[-1].second + 1
+
+        @cached_classproperty
+        def second(cls):
+            return 1
+
+    for i in range(2 * prefetch.MAX_WORKERS):
+        recipes.append(type(f'Recipe{i}', (Base,), {}, prefetch=True))
+    release.set()
+    assert [recipe.first for recipe in recipes] == [2] * len(recipes)
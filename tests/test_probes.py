@@ -0,0 +1,82 @@
+# pylint: disable=missing-docstring
+
+import shutil
+import subprocess as sp
+
+import pytest
+
+from autorecipes import cmakecache, probes
+from autorecipes.cmakecache import CacheEntry
+
+CACHE = '''
+//Major version of cmake used to create the current loaded cache
+CMAKE_CACHE_MAJOR_VERSION:INTERNAL=3
+//Minor version of cmake used to create the current loaded cache
+CMAKE_CACHE_MINOR_VERSION:INTERNAL=25
+//Patch version of cmake used to create the current loaded cache
+CMAKE_CACHE_PATCH_VERSION:INTERNAL=1
+//Have include stdlib.h
+HAVE_STDLIB_H:INTERNAL=1
+//Have include nonexist.h
+HAVE_NONEXIST_H:INTERNAL=
+//CHECK_TYPE_SIZE: sizeof(long)
+SIZEOF_LONG:INTERNAL=8
+//Test HAVE_TRIVIAL
+HAVE_TRIVIAL:INTERNAL=1
+//Have include stdio.h
+HAVE_STDIO_H:BOOL=ON
+//ADVANCED property for variable: CMAKE_AR
+CMAKE_AR-ADVANCED:INTERNAL=1
+'''
+
+
+def test_harvest():
+    entries = list(cmakecache.parse(CACHE.splitlines()))
+    assert probes.cmake_version(entries) == '3.25.1'
+    assert [e.name for e in probes.harvest(entries)] == [
+        'HAVE_STDLIB_H',
+        'HAVE_NONEXIST_H',
+        'SIZEOF_LONG',
+        'HAVE_TRIVIAL',
+    ]
+
+
+def test_render():
+    entry = CacheEntry('HAVE_X', 'INTERNAL', 'a]]b', 'Test ]=]')
+    text = probes.render([entry], '3.25.1')
+    assert 'set(HAVE_X [=[a]]b]=] CACHE INTERNAL [[Test ]=]]])' in text
+    assert text.startswith('# Generated')
+
+
+@pytest.mark.skipif(shutil.which('cmake') is None, reason='needs CMake')
+def test_seed(tmp_path):
+    source = tmp_path / 'source'
+    source.mkdir()
+    (source / 'CMakeLists.txt').write_text(
+        'cmake_minimum_required(VERSION 3.7)\n'
+        'project(probes LANGUAGES C)\n'
+        'include(CheckIncludeFile)\n'
+        'check_include_file(stdlib.h HAVE_STDLIB_H)\n'
+    )
+
+    def configure(build, *args):
+        process = sp.run(
+            ['cmake', *args, '-S', str(source), '-B', str(build)],
+            stdout=sp.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        return process.stdout
+
+    assert 'Looking for stdlib.h' in configure(tmp_path / 'first')
+    with open(tmp_path / 'first' / 'CMakeCache.txt') as f:
+        entries = list(cmakecache.parse(f))
+    seed = tmp_path / 'seed.cmake'
+    probes.save(
+        seed,
+        probes.render(probes.harvest(entries), probes.cmake_version(entries)),
+    )
+    output = configure(tmp_path / 'second', '-C', str(seed))
+    assert 'Looking for stdlib.h' not in output
+    second = cmakecache.read(tmp_path / 'second' / 'CMakeCache.txt')
+    assert second['HAVE_STDLIB_H'] == '1'
@@ -0,0 +1,84 @@
+# pylint: disable=missing-docstring
+
+from pathlib import Path
+
+import pytest
+
+from autorecipes import pyproject
+
+DOCUMENT = '''
+[build-system]
+requires = ["poetry>=0.12"]
+
+[tool.black]
+line-length = 80
+
+[tool.poetry]
+name = "project"   # a comment
+version = "1.0.0"
+packages = [
+    { include = "project" },
+]
+include = [
+[
+"nested"
+],
+"[not a header]",
+]
+
+[tool.poetry.dependencies]
+python = "^3.6"
+
+[[tool.poetry.source]]
+name = "private"
+
+[tool.other]
+name = "other"
+'''
+
+
+def test_sections():
+    sections = pyproject.poetry_sections(DOCUMENT)
+    assert 'tool.black' not in sections
+    assert 'tool.other' not in sections
+    assert pyproject.parse_poetry(DOCUMENT) == (
+        pyproject._loads(DOCUMENT)['tool']['poetry']  # pylint: disable=protected-access
+    )
+
+
+def test_own_pyproject():
+    text = (Path(__file__).parent.parent / 'pyproject.toml').read_text()
+    assert pyproject.poetry_sections(text) is not None
+    assert pyproject.parse_poetry(text)['name'] == 'autorecipes'
+
+
+@pytest.mark.parametrize(
+    'document',
+    [
+        '[tool.poetry]\ndescription = """\n[tool.other]\n"""\n',
+        '[tool]\npoetry.name = "x"\n[tool.poetry.dependencies]\n',
+        'tool.poetry.name = "x"\n[tool.poetry.dependencies]\n',
+        '[tool."poetry"]\nname = "x"\n',
+        '[build-system]\n',
+    ],
+)
+def test_unsplittable(document):
+    assert pyproject.poetry_sections(document) is None
+
+
+def test_dotted_keys():
+    document = 'tool.poetry.name = "x"\n[tool.poetry.dependencies]\npython = "*"\n'
+    assert pyproject.parse_poetry(document) == {
+        'name': 'x',
+        'dependencies': {'python': '*'},
+    }
+
+
+def test_load(tmp_path):
+    path = tmp_path / 'pyproject.toml'
+    path.write_text('[tool.poetry]\nname = "before"\n')
+    tracked = pyproject.load(tmp_path)
+    assert tracked.value == {'name': 'before'}
+    assert pyproject.load(tmp_path) is tracked
+    path.write_text('[tool.poetry]\nname = "after!"\n')
+    assert pyproject.load(tmp_path).value == {'name': 'after!'}
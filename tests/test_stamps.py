@@ -0,0 +1,63 @@
+# pylint: disable=missing-docstring
+
+import os
+
+from autorecipes import PythonConanFile, stamps
+
+
+def set_mtime(path, seconds):
+    os.utime(path, ns=(seconds * 10**9, seconds * 10**9))
+
+
+def test_changed(tmp_path):
+    path = tmp_path / 'CMakeLists.txt'
+    path.write_text('project(a)')
+    set_mtime(path, 1000)
+    absent = tmp_path / 'conanfile.txt'
+    s = stamps.Stamps(path, absent)
+    assert not s.changed()
+    # Touched, but not changed.
+    set_mtime(path, 2000)
+    assert not s.changed()
+    # Changed, with the same size and an old time: like Git, we miss it.
+    path.write_text('project(b)')
+    set_mtime(path, 2000)
+    assert not s.changed()
+    set_mtime(path, 3000)
+    assert s.changed()
+
+
+def test_added_and_removed(tmp_path):
+    path = tmp_path / 'conanfile.txt'
+    s = stamps.Stamps(path)
+    path.write_text('')
+    assert s.changed()
+    s = stamps.Stamps(path)
+    path.unlink()
+    assert s.changed()
+
+
+def test_racy(tmp_path):
+    path = tmp_path / 'pyproject.toml'
+    path.write_text('a')
+    s = stamps.Stamps(path)
+    # Modified within the same tick as the stamp.
+    mtime = path.stat().st_mtime_ns
+    path.write_text('b')
+    os.utime(path, ns=(mtime, mtime))
+    assert s.changed()
+
+
+def test_python_attributes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.poetry]\nname = "before"\n')
+
+    class Recipe(PythonConanFile):
+        pass
+
+    assert Recipe.name == 'before'
+    attrs = Recipe.attrs
+    assert Recipe.attrs is attrs
+    pyproject.write_text('[tool.poetry]\nname = "after"\n')
+    assert Recipe.name == 'after'
@@ -0,0 +1,51 @@
+# pylint: disable=missing-docstring
+
+from autorecipes.stdlib import OrderedSet, closures, toposort
+
+
+def test_ordered_set():
+    s = OrderedSet(['b', 'a', 'b'])
+    assert list(s) == ['b', 'a']
+    s.update(['c', 'a', 'd'])
+    assert list(s) == ['b', 'a', 'c', 'd']
+    s.discard('a')
+    s.discard('z')
+    assert list(s) == ['b', 'c', 'd']
+    assert 'c' in s and 'a' not in s
+    assert len(s) == 3
+    assert s == {'b', 'c', 'd'}
+
+
+def test_toposort():
+    graph = {'a': ['c', 'b'], 'b': ['c'], 'c': [], 'd': ['a']}
+    order = toposort(graph)
+    assert order == ['d', 'a', 'b', 'c']
+
+
+def test_closures():
+    graph = {'a': ['b'], 'b': ['c', 'd'], 'c': ['d'], 'd': [], 'e': []}
+    assert closures(graph) == {
+        'a': ['b', 'c', 'd'],
+        'b': ['c', 'd'],
+        'c': ['d'],
+        'd': [],
+        'e': [],
+    }
+
+
+def test_closures_with_cycle():
+    graph = {'a': ['b'], 'b': ['c'], 'c': ['b', 'd'], 'd': []}
+    result = closures(graph)
+    # The order within a cycle is arbitrary, but it precedes what follows.
+    assert set(result['a'][:2]) == {'b', 'c'}
+    assert result['a'][2] == 'd'
+    assert set(result['b']) == {'b', 'c', 'd'}
+    assert set(result['c']) == {'b', 'c', 'd'}
+
+
+def test_closures_deep():
+    n = 2000
+    graph = {i: [i + 1] for i in range(n)}
+    graph[n] = []
+    result = closures(graph)
+    assert result[0] == list(range(1, n + 1))
@@ -0,0 +1,98 @@
+# pylint: disable=missing-docstring
+
+from pathlib import Path
+
+import pytest
+
+from autorecipes import step1
+
+CONANINFO = '''
+[settings]
+    arch=x86_64
+    build_type=Debug
+    compiler=gcc
+    compiler.version=12
+    os=Linux
+
+[requires]
+    zlib/1.Y.Z
+
+[full_requires]
+    zlib/1.2.13:6af9cc7cb931c5ad942174fd7838eb655717c709
+    fmt/9.1.0@user/channel#abc123:0ab9fcf606068d4347207cc29edd400ceccbc944
+'''
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'cache'
+    monkeypatch.setenv('AUTORECIPES_CACHE_DIR', str(directory))
+    return directory
+
+
+def sources(tmp_path: Path) -> Path:
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir(exist_ok=True)
+    (source_dir / 'CMakeLists.txt').write_text('project(example)\n')
+    return source_dir
+
+
+def test_configuration(tmp_path):
+    assert step1.configuration(tmp_path) is None
+    (tmp_path / 'conaninfo.txt').write_text(CONANINFO)
+    settings, requires = step1.configuration(tmp_path)
+    assert settings == {
+        'arch': 'x86_64',
+        'compiler': 'gcc',
+        'compiler.version': '12',
+        'os': 'Linux',
+    }
+    assert requires == {'zlib/1.2.13', 'fmt/9.1.0'}
+
+
+def test_record_find(tmp_path, cache_dir):
+    pytest.importorskip('fcntl')
+    source_dir = sources(tmp_path)
+    key = step1.sources_key(source_dir, [source_dir / 'CMakeLists.txt'])
+    assert step1.find(key) is None
+    with step1.acquire(source_dir) as directory:
+        assert Path(directory).parent == cache_dir / 'configure'
+        step1.record(directory, key)
+    assert step1.find(key) == Path(directory)
+
+    # The next configuration of the same sources reuses the tree,
+    # and forgets what it recorded until it records again.
+    with step1.acquire(source_dir) as again:
+        assert again == directory
+        assert step1.find(key) is None
+
+
+def test_key_changes(tmp_path, monkeypatch):
+    source_dir = sources(tmp_path)
+    inputs = [source_dir / 'CMakeLists.txt']
+    key = step1.sources_key(source_dir, inputs)
+    monkeypatch.setenv('CXX', 'clang++')
+    assert step1.sources_key(source_dir, inputs) != key
+    monkeypatch.delenv('CXX')
+    (source_dir / 'CMakeLists.txt').write_text('project(other)\n')
+    assert step1.sources_key(source_dir, inputs) != key
+
+
+def test_busy(tmp_path, cache_dir):
+    pytest.importorskip('fcntl')
+    source_dir = sources(tmp_path)
+    with step1.acquire(source_dir) as first:
+        with step1.acquire(source_dir) as second:
+            assert second != first
+            assert not str(second).startswith(str(cache_dir))
+            # A temporary directory is not recorded.
+            step1.record(second, 'ab' * 32)
+            assert step1.find('ab' * 32) is None
+
+
+def test_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv('AUTORECIPES_CACHE_DIR', '')
+    source_dir = sources(tmp_path)
+    with step1.acquire(source_dir) as directory:
+        assert Path(directory).is_dir()
+    assert not Path(directory).exists()
@@ -0,0 +1,31 @@
+# pylint: disable=missing-docstring
+
+import json
+import sys
+
+from autorecipes import trace
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.delenv(trace.ENVIRONMENT_VARIABLE, raising=False)
+    with trace.span('outer') as args:
+        args['ignored'] = True
+    assert all(e['name'] != 'outer' for e in trace._events)  # pylint: disable=protected-access
+
+
+def test_spans(monkeypatch, tmp_path):
+    path = tmp_path / 'trace-{pid}.json'
+    monkeypatch.setenv(trace.ENVIRONMENT_VARIABLE, str(path))
+    with trace.span('outer', cls='Recipe') as args:
+        trace.run([sys.executable, '-c', 'pass'])
+        args['result'] = ('a', 1)
+    trace.write()
+    [written] = list(tmp_path.iterdir())
+    events = json.loads(written.read_text())['traceEvents']
+    outer = next(e for e in events if e['name'] == 'outer')
+    inner = next(e for e in events if e['name'] == sys.executable)
+    assert outer['args'] == {'cls': 'Recipe', 'result': ['a', 1]}
+    assert inner['cat'] == 'subprocess'
+    assert inner['args']['returncode'] == 0
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']